@@ -0,0 +1,304 @@
+import argparse
+import operator
+import timeit
+from functools import partial
+from itertools import islice
+import random
+import numpy as np
+from sorting import BaseSort
+from counting_sort import CountingSort
+from merge_sort import MergeSort
+from quick_sort import QuickSort
+from radix_sort import RadixSort
+
+
+class AutoSort(BaseSort):
+    """
+    A class used to select and apply the fastest sorting algorithm for the input based on a linear scan of it
+
+    Attributes
+    ----------
+    decision : str
+        name of the algorithm chosen for the most recently sorted array (None before the first sort)
+    stats : dict
+        statistics of the most recently sorted array (or its keys) that the decision was based on:
+            n: number of elements
+            type: name of the type shared by all elements ('int', 'float', 'str', ...), or None if they differ
+            min, max: smallest and largest element, or None if the elements are not numbers or strings
+            runs: number of ascending runs
+            sample_size, sampled_distinct: size of a strided sample of the elements and its number of distinct values
+
+    Methods
+    -------
+    sort(arr, in_place=False, key=None, reverse=False)
+        Sorts an array using the algorithm that fits the input best
+
+    scan(arr)
+        Collects the statistics of an array that the choice of algorithm is based on
+
+    __kind(arr)
+        Classifies the array by the algorithms that accept it
+
+    __choose(stats, kind)
+        Chooses the algorithm from the statistics of the input
+
+    __ndarray_stats(a, stats)
+        Collects the statistics of a numpy array with vectorized operations
+
+    """
+    # the algorithm is chosen from the elements themselves, which must not be wrapped when instrumented
+    COMPARISON_SORT = False
+
+    # arrays whose ascending runs are at least this long on average are sorted by the run-adaptive merge sort
+    MIN_AVERAGE_RUN = 32
+
+    # integers are counting sorted if their range is at most this factor times the number of elements
+    COUNTING_RANGE_FACTOR = 4
+
+    # integers of at most this many bits are radix sorted, larger integers need too many passes to beat introsort
+    RADIX_MAX_BITS = 40
+
+    # kinds of numpy dtypes whose elements can be sorted through a memoryview, other arrays are sorted as lists
+    BUFFER_KINDS = 'biuf'
+
+    # number of elements sampled to estimate the number of distinct elements
+    SAMPLE_SIZE = 1024
+
+    # arrays whose sample has at most 1/FEW_UNIQUE_RATIO distinct elements are sorted by three-way QuickSort
+    FEW_UNIQUE_RATIO = 16
+
+
+    def __init__(self):
+        self.decision = None
+        self.stats = None
+        self.__introsort = QuickSort('introsort')
+        self.__three_way = QuickSort('three_way')
+        self.__adaptive_merge_sort = MergeSort('adaptive')
+        self.__counting_sort = CountingSort()
+        self.__radix_sort = RadixSort()
+        self.__numpy_counting_sort = CountingSort('numpy')
+        self.__numpy_radix_sort = RadixSort(backend='numpy')
+        self.__numpy_float_radix_sort = RadixSort(dtype='float', backend='numpy')
+
+
+    def __repr__(self):
+        return "Auto Sort"
+
+
+    def sort(self, arr, in_place=False, key=None, reverse=False):
+        """
+        Sorts an array using the algorithm that fits the input best. The input is scanned once for its size, element
+        type, range, presortedness and number of distinct elements, and dispatched to the algorithm that was
+        measured to be fastest for such input. With a key function, the keys are computed once and scanned instead,
+        and the chosen algorithm sorts the element indices by looking up their keys. Numpy arrays of strings, objects
+        or dates cannot be sorted through a memoryview, so their elements are sorted as a list and copied back
+
+        Parameters:
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) to be sorted
+            in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
+
+        Returns:
+            list or buffer: the sorted array, of the same type as arr, or a memoryview if arr is bytes
+        """
+        if isinstance(arr, np.ndarray) and arr.dtype.kind not in self.BUFFER_KINDS:
+            items = self.sort(arr.ravel().tolist(), in_place=True, key=key, reverse=reverse)
+            result = arr if in_place else arr.copy()
+            result.flat[:] = items
+            return result
+
+        if key is None:
+            self.stats = self.scan(arr)
+            algo = self.__choose(self.stats, self.__kind(arr))
+            self.decision = repr(algo)
+            return algo.sort(arr, in_place, reverse=reverse)
+
+        result, work_arr = self._work_array(arr, in_place)
+        keys = [key(x) for x in work_arr]
+        self.stats = self.scan(keys)
+        algo = self.__choose(self.stats, 'list')
+        self.decision = repr(algo)
+
+        order = algo.sort(list(range(len(keys))), in_place=True, key=keys.__getitem__, reverse=reverse)
+        items = [work_arr[i] for i in order]
+        if isinstance(work_arr, list):
+            work_arr[:] = items
+        else:
+            for i, x in enumerate(items):
+                work_arr[i] = x
+        return result
+
+
+    def scan(self, arr) -> dict:
+        """
+        Collects the statistics of an array that the choice of algorithm is based on in a single linear pass over the
+        elements for each statistic, which are all performed by built-in functions (or numpy for numpy arrays)
+
+        Parameters:
+            arr (list or buffer): the array to scan
+
+        Returns:
+            dict: the statistics described for the stats attribute
+        """
+        n = len(arr)
+        stats = {'n': n, 'type': None, 'min': None, 'max': None, 'runs': None, 'sample_size': 0,
+                 'sampled_distinct': None}
+        if n == 0:
+            return stats
+
+        # typed buffers are scanned as flat numpy arrays without copying
+        if isinstance(arr, np.ndarray):
+            arr = arr.ravel()
+        elif not isinstance(arr, list):
+            try:
+                arr = np.asarray(memoryview(arr)).ravel()
+            except TypeError:
+                arr = list(arr)
+        if isinstance(arr, np.ndarray):
+            return self.__ndarray_stats(arr, stats)
+
+        types = set(map(type, arr))
+        if len(types) == 1:
+            stats['type'] = types.pop().__name__
+        if stats['type'] in ('int', 'float', 'str', 'bytes'):
+            stats['min'] = min(arr)
+            stats['max'] = max(arr)
+
+        # every descent starts a new ascending run
+        stats['runs'] = 1 + sum(map(operator.lt, islice(arr, 1, None), arr))
+
+        # a strided sample is cheap and deterministic, and unhashable elements are not sampled
+        sample = arr[::max(1, n // self.SAMPLE_SIZE)]
+        stats['sample_size'] = len(sample)
+        try:
+            stats['sampled_distinct'] = len(set(sample))
+        except TypeError:
+            pass
+        return stats
+
+
+    def __ndarray_stats(self, a: np.ndarray, stats: dict) -> dict:
+        """
+        Collects the statistics of a numpy array with vectorized operations
+
+        Parameters:
+            a (ndarray): one-dimensional array to scan
+            stats (dict): statistics to fill in
+
+        Returns:
+            dict: the statistics
+        """
+        kind = a.dtype.kind
+        stats['type'] = 'int' if kind in 'iu' else 'float' if kind == 'f' else a.dtype.name
+        if kind in 'iuf':
+            stats['min'] = a.min().item()
+            stats['max'] = a.max().item()
+
+        stats['runs'] = 1 + int(np.count_nonzero(a[1:] < a[:-1]))
+        sample = a[::max(1, a.size // self.SAMPLE_SIZE)]
+        stats['sample_size'] = sample.size
+        stats['sampled_distinct'] = np.unique(sample).size
+        return stats
+
+
+    def __kind(self, arr) -> str:
+        """
+        Classifies the array by the algorithms that accept it
+
+        Parameters:
+            arr (list or buffer): the array to be sorted
+
+        Returns:
+            str: 'list', 'ndarray' (one-dimensional) or 'buffer'
+        """
+        if isinstance(arr, list):
+            return 'list'
+        if isinstance(arr, np.ndarray) and arr.ndim == 1:
+            return 'ndarray'
+        return 'buffer'
+
+
+    def __choose(self, stats: dict, kind: str) -> BaseSort:
+        """
+        Chooses the algorithm from the statistics of the input. The rules reflect measurements of the algorithms in
+        this directory on CPython with 1e5 list elements and 1e6 numpy elements:
+            numpy arrays of numbers are sorted by the numpy backends, counting sort for integers of a small range
+                and radix sort otherwise
+            lists with long ascending runs are sorted by the run-adaptive merge sort in close to linear time
+            lists of integers are counting sorted if their range is small, and radix sorted if their keys are short
+            input with few distinct elements is sorted by three-way QuickSort
+            everything else, including floats and strings, is sorted by introsort, as the comparisons of these
+                types are performed in C and beat the Python loops of the float radix sort, bucket sort and string
+                radix sort
+
+        Parameters:
+            stats (dict): statistics of the input
+            kind (str): 'list', 'ndarray' or 'buffer'
+
+        Returns:
+            BaseSort: the chosen algorithm
+        """
+        n = stats['n']
+        if n < 2:
+            return self.__introsort
+
+        small_range = stats['type'] == 'int' and stats['max']-stats['min'] < self.COUNTING_RANGE_FACTOR * n
+        if kind == 'ndarray':
+            if stats['type'] == 'int':
+                return self.__numpy_counting_sort if small_range else self.__numpy_radix_sort
+            if stats['type'] == 'float':
+                return self.__numpy_float_radix_sort
+
+        if kind == 'list':
+            if stats['runs'] * self.MIN_AVERAGE_RUN <= n:
+                return self.__adaptive_merge_sort
+            if stats['type'] == 'int':
+                if small_range:
+                    return self.__counting_sort
+                bits = max(stats['min'].bit_length(), stats['max'].bit_length()) + (stats['min'] < 0)
+                if bits <= self.RADIX_MAX_BITS:
+                    return self.__radix_sort
+
+        if stats['sampled_distinct'] is not None and \
+                stats['sampled_distinct'] * self.FEW_UNIQUE_RATIO <= stats['sample_size']:
+            return self.__three_way
+        return self.__introsort
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Adaptive sorting algorithm dispatcher')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    args = parser.parse_args()
+
+    n = args.data[0]
+    seed = args.data[1]
+    t = args.t
+
+    # shuffle data randomly with seed
+    sorted_data = list(range(n))
+    random.seed(seed)
+    random_data = random.sample(sorted_data, n)
+    sorting_algo = AutoSort()
+
+    # verify that list is sorted correctly
+    if not sorting_algo.sort(random_data) == sorted_data:
+        print('Error sorting array using <{}>'.format(sorting_algo))
+        exit(1)
+    print('Chosen algorithm: {}'.format(sorting_algo.decision))
+    print('Input statistics: {}'.format(sorting_algo.stats))
+
+    # measure execution time
+    if args.t:
+        times = timeit.Timer(partial(sorting_algo.sort, random_data)).repeat(t[1], t[0])
+
+        # average time taken
+        time_taken = min(times) / t[0]
+
+        print('Timing analysis')
+        print('Sorting method: {}'.format(sorting_algo))
+        print('Data length: {}'.format(n))
+        print('Executions: {}'.format(t[0]))
+        print('Average time: {}s'.format(time_taken))
@@ -0,0 +1,326 @@
+import argparse
+import gc
+import glob
+import importlib
+import inspect
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from functools import partial
+import numpy as np
+from sorting import BaseSort
+from bucket_sort import BucketSort
+
+
+# modules in this directory that do not contain sorting algorithms
+EXCLUDED_MODULES = {'bench', 'verification', 'sorting'}
+
+# algorithms with quadratic running time are only benchmarked up to a size limit
+QUADRATIC_ALGORITHMS = {'BubbleSort', 'InsertionSort'}
+
+# algorithms that require floating point data in the range [0,1)
+UNIT_FLOAT_ALGORITHMS = {'BucketSort[python]', 'BucketSort[numpy]'}
+
+# algorithms that require strings, which are benchmarked on the integers formatted as strings of equal length
+STRING_ALGORITHMS = {'StringRadixSort'}
+
+# algorithms whose recursion depth grows linearly on presorted or duplicate-heavy input, which exceeds the recursion
+# limit of the interpreter, so they are only benchmarked on random data
+RANDOM_ONLY_ALGORITHMS = {'QuickSort[lomuto]'}
+
+
+def random_data(n: int, seed: int) -> list:
+    # randomly shuffled integers 0..n-1
+    rng = random.Random(seed)
+    return rng.sample(range(n), n)
+
+
+def sorted_data(n: int, seed: int) -> list:
+    # integers 0..n-1 in ascending order
+    return list(range(n))
+
+
+def reversed_data(n: int, seed: int) -> list:
+    # integers 0..n-1 in descending order
+    return list(range(n-1, -1, -1))
+
+
+def few_unique_data(n: int, seed: int) -> list:
+    # random integers drawn from a small set of distinct values
+    rng = random.Random(seed)
+    return [rng.randrange(10) for _ in range(n)]
+
+
+def organ_pipe_data(n: int, seed: int) -> list:
+    # ascending first half followed by a descending second half
+    middle = n // 2
+    return list(range(middle)) + list(range(n-middle-1, -1, -1))
+
+
+def zipf_data(n: int, seed: int) -> list:
+    # heavily skewed integers following a Zipf distribution, clipped to 0..n-1
+    rng = np.random.RandomState(seed)
+    return np.minimum(rng.zipf(1.5, n) - 1, max(n-1, 0)).tolist()
+
+
+DISTRIBUTIONS = {
+    'random': random_data,
+    'sorted': sorted_data,
+    'reversed': reversed_data,
+    'few_unique': few_unique_data,
+    'organ_pipe': organ_pipe_data,
+    'zipf': zipf_data,
+}
+
+
+def discover_algorithms() -> dict:
+    """
+    Finds every BaseSort subclass defined in the sorting modules of this directory, plus BucketSort. Classes with
+    several modes or backends are instantiated once per variant
+
+    Returns:
+        dict: algorithm instances keyed by class name
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+    algorithms = {'BaseSort': BaseSort()}
+    algorithms.update(variants('BucketSort', BucketSort))
+    for path in sorted(glob.glob(os.path.join(directory, '*.py'))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        if module_name in EXCLUDED_MODULES:
+            continue
+
+        module = importlib.import_module(module_name)
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            # only consider classes defined in the module itself to avoid duplicates from imports
+            if cls.__module__ == module_name and issubclass(cls, BaseSort):
+                algorithms.update(variants(name, cls))
+    return algorithms
+
+
+def variants(name: str, cls) -> dict:
+    """
+    Instantiates an algorithm once per mode (MODES attribute) or backend (BACKENDS attribute) it supports
+
+    Parameters:
+        name (str): name of the algorithm
+        cls (type): class of the algorithm
+
+    Returns:
+        dict: algorithm instances keyed by name and variant
+    """
+    if hasattr(cls, 'MODES'):
+        return {'{}[{}]'.format(name, mode): cls(mode) for mode in cls.MODES}
+    if hasattr(cls, 'BACKENDS'):
+        return {'{}[{}]'.format(name, backend): cls(backend=backend) for backend in cls.BACKENDS}
+    return {name: cls()}
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """
+    Computes the q'th percentile of a sorted list using linear interpolation between closest ranks
+
+    Parameters:
+        sorted_values (list): sorted list of values
+        q (float): percentile in the range [0,100]
+
+    Returns:
+        float: the q'th percentile
+    """
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values)-1) * q / 100
+    lower = int(pos)
+    upper = min(lower+1, len(sorted_values)-1)
+    return sorted_values[lower] + (sorted_values[upper]-sorted_values[lower]) * (pos-lower)
+
+
+def benchmark(algo, data: list, repeat: int, warmup: int) -> dict:
+    """
+    Measures the execution time and peak memory of sorting the data with an algorithm
+
+    Parameters:
+        algo (BaseSort): the sorting algorithm
+        data (list): the data to sort, which is never modified
+        repeat (int): number of timed executions
+        warmup (int): number of untimed executions before timing
+
+    Returns:
+        dict: min, p50 and p95 execution time in seconds and peak memory in bytes
+    """
+    # verify the result once, which doubles as the first warmup execution
+    if algo.sort(data.copy()) != sorted(data):
+        raise AssertionError('incorrectly sorted output')
+    for _ in range(warmup-1):
+        algo.sort(data.copy())
+
+    # timeit disables the garbage collector while timing, so collect up front to start from a clean heap
+    gc.collect()
+    timer = timeit.Timer(partial(algo.sort, data))
+    times = sorted(timer.repeat(repeat, 1))
+
+    # memory is traced in a separate execution as tracing skews the timing. Algorithms that sort in place sort a copy
+    # made before tracing, so the peak is the auxiliary memory of the algorithm rather than the copy of the output
+    if 'in_place' in inspect.signature(algo.sort).parameters:
+        method = partial(algo.sort, data.copy(), in_place=True)
+    else:
+        method = partial(algo.sort, data)
+    gc.collect()
+    tracemalloc.start()
+    method()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'min': times[0],
+        'p50': percentile(times, 50),
+        'p95': percentile(times, 95),
+        'peak_memory': peak_memory,
+    }
+
+
+def run(algorithms: dict, sizes: list, distributions: list, repeat: int, warmup: int, seed: int,
+        quadratic_limit: int) -> list:
+    """
+    Benchmarks every algorithm on every combination of input size and distribution it supports. A run that exceeds
+    the memory or recursion limits is recorded as an error, while incorrectly sorted output or any other exception
+    is raised
+
+    Parameters:
+        algorithms (dict): algorithm instances keyed by name
+        sizes (list): input sizes
+        distributions (list): names of input distributions
+        repeat (int): number of timed executions per measurement
+        warmup (int): number of untimed executions per measurement
+        seed (int): seed for the random data
+        quadratic_limit (int): largest input size benchmarked for quadratic algorithms
+
+    Returns:
+        list: one result record per measurement
+    """
+    results = []
+    for name, algo in algorithms.items():
+        for dist in distributions:
+            for n in sizes:
+                if name in QUADRATIC_ALGORITHMS and n > quadratic_limit:
+                    continue
+                if name in RANDOM_ONLY_ALGORITHMS and dist != 'random':
+                    continue
+
+                data = DISTRIBUTIONS[dist](n, seed)
+                if name in UNIT_FLOAT_ALGORITHMS:
+                    data = [x / n for x in data]
+                elif name in STRING_ALGORITHMS:
+                    width = len(str(n))
+                    data = ['{:0{}d}'.format(x, width) for x in data]
+
+                record = {'algorithm': name, 'distribution': dist, 'n': n}
+                try:
+                    record.update(benchmark(algo, data, repeat, warmup))
+                except (RecursionError, MemoryError) as e:
+                    record['error'] = '{}: {}'.format(type(e).__name__, e)
+                results.append(record)
+                print_record(record)
+    return results
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    Compares benchmark results against a baseline and finds measurements that have regressed
+
+    Parameters:
+        results (list): current result records
+        baseline (list): baseline result records
+        tolerance (float): allowed relative slowdown of the median time before it counts as a regression
+
+    Returns:
+        list: regressions as (algorithm, distribution, n, baseline p50, current p50) tuples
+    """
+    reference = {(r['algorithm'], r['distribution'], r['n']): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = reference.get((r['algorithm'], r['distribution'], r['n']))
+        if base is None or 'p50' not in base:
+            continue
+
+        # an algorithm that used to work but now fails is also a regression
+        if 'p50' not in r:
+            regressions.append((r['algorithm'], r['distribution'], r['n'], base['p50'], None))
+        elif r['p50'] > base['p50'] * (1+tolerance):
+            regressions.append((r['algorithm'], r['distribution'], r['n'], base['p50'], r['p50']))
+    return regressions
+
+
+def print_record(record: dict):
+    if 'error' in record:
+        print('{:<24} {:<12} {:>9}  {}'.format(record['algorithm'], record['distribution'], record['n'], record['error']))
+    else:
+        print('{:<24} {:<12} {:>9}  min {:.6f}s  p50 {:.6f}s  p95 {:.6f}s  peak {} B'.format(
+            record['algorithm'], record['distribution'], record['n'],
+            record['min'], record['p50'], record['p95'], record['peak_memory']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark of all sorting algorithms')
+
+    parser.add_argument('-sizes', help='input sizes', nargs='+', type=int, default=[1000, 10000])
+    parser.add_argument('-dists', help='input distributions', nargs='+', choices=list(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    parser.add_argument('-algos', help='names of the algorithms to benchmark (default: all)', nargs='+', required=False)
+    parser.add_argument('-repeat', help='number of timed executions per measurement', type=int, default=10)
+    parser.add_argument('-warmup', help='number of untimed executions per measurement', type=int, default=2)
+    parser.add_argument('-seed', help='seed for generating random data', type=int, default=42)
+    parser.add_argument('-quadratic_limit', help='largest input size for quadratic algorithms', type=int, default=2000)
+    parser.add_argument('-o', help='path of the JSON output file', default='bench_results.json')
+    parser.add_argument('-baseline', help='path of a baseline JSON file to compare against', required=False)
+    parser.add_argument('-tolerance', help='allowed relative slowdown before reporting a regression', type=float, default=0.1)
+    args = parser.parse_args()
+
+    algorithms = discover_algorithms()
+    if args.algos:
+        unknown = set(args.algos) - set(algorithms)
+        if unknown:
+            parser.error('unknown algorithms: {}'.format(', '.join(sorted(unknown))))
+        algorithms = {name: algorithms[name] for name in args.algos}
+
+    results = run(algorithms, args.sizes, args.dists, args.repeat, max(args.warmup, 1), args.seed, args.quadratic_limit)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    with open(args.o, 'w') as f:
+        json.dump(report, f, indent=2)
+    print('Results written to {}'.format(args.o))
+
+    # compare against baseline and fail if any measurement regressed
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print('Regressions compared to {}:'.format(args.baseline))
+            for algo, dist, n, base, current in regressions:
+                current = 'failed' if current is None else '{:.6f}s'.format(current)
+                print('\t{} {} n={}: {:.6f}s -> {}'.format(algo, dist, n, base, current))
+            exit(1)
+        print('No regressions compared to {}'.format(args.baseline))
+
+    # measurements that exceeded the memory or recursion limits fail the run
+    errors = [r for r in results if 'error' in r]
+    if errors:
+        print('{} measurements failed'.format(len(errors)))
+        exit(1)
@@ -15,7 +15,7 @@ class BubbleSort(BaseSort):
 
     Methods
     -------
-    sort(arr, in_place=False)
+    sort(arr, in_place=False, key=None, reverse=False)
         Sorts an array using the bubble sort algorithm by iteratively comparing each element with its adjacent element
         swapping the two if the sort condition is satisfied.
     """
@@ -23,7 +23,7 @@ class BubbleSort(BaseSort):
         return 'Bubble Sort'
 
 
-    def sort(self, arr: list, in_place=False) -> list:
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
         """
         Sorts an array using the bubble sort algorithm by iteratively comparing each element with its adjacent element
         swapping the two if the sort condition is satisfied.
@@ -31,10 +31,15 @@ class BubbleSort(BaseSort):
         Parameters:
             arr (list): list to be sorted
             in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
 
         Returns:
             list: the sorted list
         """ 
+        if key is not None or reverse:
+            return self._keyed_sort(arr, in_place, key, reverse)
+
         n = len(arr)
 
         if in_place:
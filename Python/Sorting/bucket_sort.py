@@ -1,4 +1,5 @@
 from insertion_sort import InsertionSort
+from quick_sort import QuickSort
 from itertools import chain
 from functools import partial
 import argparse
@@ -12,47 +13,152 @@ class BucketSort():
 
     Attributes
     ----------
-    -
+    backend : str
+        implementation to use, either 'python' (default) or 'numpy', which distributes the elements into buckets with
+        vectorized index arrays and accepts and returns ndarrays
 
     Methods
     -------
     sort(arr)
         Sorts an array using the bucket sort algorithm
+
+    __numpy_sort(arr)
+        Vectorized bucket sort implementation using numpy
+
+    __numpy_sort_small_buckets(work_arr, bucket_idx, counts)
+        Vectorized sorting of all buckets of at most INSERTION_CUTOFF elements at once
     """
+    BACKENDS = ('python', 'numpy')
+
+    # buckets of this size or smaller are insertion sorted, larger buckets of clustered values are sorted by introsort
+    INSERTION_CUTOFF = 32
+
+
+    def __init__(self, backend: str = 'python'):
+        if backend not in self.BACKENDS:
+            raise ValueError('unknown bucket sort backend: {}'.format(backend))
+        self.backend = backend
+
+
     def __repr__(self):
-        return 'Bucket sort'
+        if self.backend == 'python':
+            return 'Bucket sort'
+        return 'Bucket sort ({})'.format(self.backend)
 
 
     def sort(self, arr: list) -> list:
         """
-        Sorts an array using the bucket sort algorithm
+        Sorts an array using the bucket sort algorithm. Uniformly distributed values leave few elements in every
+        bucket, which are insertion sorted, while the large buckets of clustered values (e.g. values just below 1)
+        are sorted by introsort, so the sort never takes quadratic time
 
         Parameters:
-            arr (list): list to be sorted
+            arr (list): floats in the range [0,1] to be sorted
 
         Returns:
             list: the sorted list
         """ 
+        if self.backend == 'numpy':
+            return self.__numpy_sort(arr)
+
         n = len(arr)
 
         buckets = []
         for i in range(n):
             buckets.append([])
 
+        # a value of 1 belongs in the last bucket
         for x in arr:
-            index = int(n*x)
+            index = min(int(n*x), n-1)
             buckets[index].append(x)
 
         ins_sort = InsertionSort()
+        intro_sort = QuickSort('introsort')
         for i in range(n):
-            buckets[i] = ins_sort.sort(buckets[i])
+            if len(buckets[i]) <= self.INSERTION_CUTOFF:
+                buckets[i] = ins_sort.sort(buckets[i])
+            else:
+                buckets[i] = intro_sort.sort(buckets[i])
         return list(chain.from_iterable(buckets))
 
 
+    def __numpy_sort(self, arr):
+        """
+        Vectorized bucket sort implementation. The bucket index of every element is computed at once, the size of
+        every bucket is counted with np.bincount and the offsets of the buckets are their cumulative sizes. The
+        elements are moved to their buckets through the permutation of a stable sort of the bucket indices, which is
+        found 16 bits at a time, as numpy's stable sort of 16-bit integers is a radix sort. Every bucket is then only
+        sorted between its own offsets: all small buckets at once by __numpy_sort_small_buckets, and the large
+        buckets of clustered values one at a time
+
+        Parameters:
+            arr (list or ndarray): floats in the range [0,1] to be sorted
+
+        Returns:
+            list or ndarray: the sorted elements, as an ndarray if arr is an ndarray and as a list otherwise
+        """
+        a = np.asarray(arr, dtype=np.float64)
+        n = a.size
+        if n == 0:
+            return a.copy() if isinstance(arr, np.ndarray) else []
+
+        # a value of 1 belongs in the last bucket
+        bucket_idx = np.minimum((a * n).astype(np.intp), n-1)
+        order = np.argsort((bucket_idx & 0xFFFF).astype(np.uint16), kind='stable')
+        shift = 16
+        while (n-1) >> shift:
+            digits = (bucket_idx[order] >> shift & 0xFFFF).astype(np.uint16)
+            order = order[np.argsort(digits, kind='stable')]
+            shift += 16
+        work_arr = a[order]
+        bucket_idx = bucket_idx[order]
+
+        counts = np.bincount(bucket_idx, minlength=n)
+        ends = np.cumsum(counts)
+        self.__numpy_sort_small_buckets(work_arr, bucket_idx, counts)
+        for bucket in np.flatnonzero(counts > self.INSERTION_CUTOFF):
+            work_arr[ends[bucket]-counts[bucket]:ends[bucket]].sort()
+
+        if isinstance(arr, np.ndarray):
+            return work_arr
+        return work_arr.tolist()
+
+
+    def __numpy_sort_small_buckets(self, work_arr: np.ndarray, bucket_idx: np.ndarray, counts: np.ndarray):
+        """
+        Vectorized sorting of all buckets of at most INSERTION_CUTOFF elements at once by odd-even transposition
+        sort. Every pass compares and swaps the neighbouring elements at even (or odd) positions that belong to the
+        same small bucket, and a bucket of k elements is sorted after k passes, so the passes stop once the largest
+        small bucket is sorted or no elements were swapped
+
+        Parameters:
+            work_arr (ndarray): the elements ordered by their buckets, sorted in place
+            bucket_idx (ndarray): the bucket index of every element
+            counts (ndarray): the size of every bucket
+
+        Returns:
+            None
+        """
+        small = counts <= self.INSERTION_CUTOFF
+        passes = int(counts[small].max(initial=0))
+        same_bucket = (bucket_idx[:-1] == bucket_idx[1:]) & small[bucket_idx[:-1]]
+        pairs = [np.flatnonzero(same_bucket[parity::2]) * 2 + parity for parity in (0, 1)]
+
+        for p in range(passes):
+            i = pairs[p % 2]
+            swap = i[work_arr[i+1] < work_arr[i]]
+            if swap.size:
+                work_arr[swap], work_arr[swap+1] = work_arr[swap+1], work_arr[swap].copy()
+            elif p > 0 and not last_swapped:
+                break
+            last_swapped = swap.size > 0
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Bucket sorting algorithm')
     parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
     parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-backend', help='implementation to use', choices=BucketSort.BACKENDS, default='python')
     args = parser.parse_args()
     
     n = args.data[0]
@@ -63,7 +169,7 @@ if __name__ == '__main__':
     np.random.seed(seed)
     random_data = np.random.rand(1,n).tolist()[0]
     sorted_data = sorted(random_data)
-    sorting_algo = BucketSort()
+    sorting_algo = BucketSort(args.backend)
 
     # verify that list is sorted correctly
     if not sorting_algo.sort(random_data) == sorted_data:
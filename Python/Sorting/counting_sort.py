@@ -5,6 +5,7 @@ from functools import partial
 import random
 from collections import defaultdict
 from itertools import accumulate
+import numpy as np
 from sorting import BaseSort
 
 
@@ -14,55 +15,276 @@ class CountingSort(BaseSort):
 
     Attributes
     ----------
-    -
+    backend : str
+        implementation to use, either 'python' (default) or 'numpy', which counts with np.bincount and accepts and
+        returns ndarrays. Sorting with a key function always uses the python implementation, as the keys are computed
+        by calling a Python function on every element
+    max_range : int
+        largest range of elements (or keys) that a counting array is allocated for, or None (default) for no limit.
+        Every sort and argsort of a larger range raises ValueError instead of exhausting the memory
 
     Methods
     -------
-    sort(arr, in_place=False)
+    sort(arr, in_place=False, key=None, reverse=False)
         Sorts an array using the counting sort algorithm
 
+    argsort(arr, reverse=False)
+        Finds the stable permutation of indices that sorts an array using the counting sort algorithm
+
+    _argsort(values)
+        Finds the stable permutation of indices that sorts a list by counting sorting the indices
+
+    __counting_sort(arr)
+        Sorts a list of integers by counting the occurrences of each element
+
+    __keyed_sort(arr, keys, reverse)
+        Stable counting sort of the elements by their precomputed integer keys
+
+    __numpy_sort(arr)
+        Vectorized counting sort implementation using numpy
+
+    __numpy_argsort(arr, reverse)
+        Vectorized stable permutation of a counting sort using numpy
+
+    __check_range(min_elmt, max_elmt)
+        Verifies that the range of the elements is within max_range
+
     """
+    BACKENDS = ('python', 'numpy')
+    COMPARISON_SORT = False
+
+
+    def __init__(self, backend: str = 'python', max_range: int = None):
+        if backend not in self.BACKENDS:
+            raise ValueError('unknown counting sort backend: {}'.format(backend))
+        self.backend = backend
+        self.max_range = max_range
+
+
     def __repr__(self):
-        return "Counting Sort"
+        if self.backend == 'python':
+            return "Counting Sort"
+        return "Counting Sort ({})".format(self.backend)
 
 
-    def sort(self, arr: list) -> list:
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
         """
-        Sorts an array using the counting sort algorithm
+        Sorts an array using the counting sort algorithm. With a key function, the elements are counted and placed by
+        their integer keys, so the sort stays linear in the number of elements and the range of the keys
 
         Parameters:
             arr (list): list to be sorted
+            in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the integer sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
 
         Returns:
             list: the sorted list
         """ 
+        if key is not None:
+            work_arr = self.__keyed_sort(arr, [key(x) for x in arr], reverse)
+        elif self.backend == 'numpy':
+            work_arr = self.__numpy_sort(arr)
+            if reverse:
+                work_arr = work_arr[::-1]
+        else:
+            work_arr = self.__counting_sort(arr)
+            if reverse:
+                work_arr.reverse()
+
+        if in_place:
+            arr[:] = work_arr
+            return arr
+        return work_arr
+
+
+    def argsort(self, arr, reverse=False):
+        """
+        Finds the stable permutation of indices that sorts an array of integers using the counting sort algorithm
+
+        Parameters:
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) of integers
+            reverse (bool): whether the permutation should sort the array in descending order
+
+        Returns:
+            array or ndarray: the permutation, as an ndarray of np.intp if arr is an ndarray and as an array('l')
+                otherwise
+        """
+        if self.backend == 'numpy':
+            return self._index_array(self.__numpy_argsort(arr, reverse), arr)
+        return super().argsort(arr, reverse)
+
+
+    def _argsort(self, values: list) -> list:
+        """
+        Finds the stable permutation of indices that sorts a list of integers in ascending order by counting sorting
+        the indices with the values as their keys
+
+        Parameters:
+            values (list): integers to find the permutation of
+
+        Returns:
+            list: the permutation
+        """
+        return self.__keyed_sort(range(len(values)), values, False)
+
+
+    def __counting_sort(self, arr: list) -> list:
+        """
+        Sorts a list of integers by counting the occurrences of each element in the range of the elements
+
+        Parameters:
+            arr (list): integers to be sorted
+
+        Returns:
+            list: the sorted list
+        """
         n = len(arr)
-        work_arr = [None]*n
+        if n == 0:
+            return []
+
+        work_arr = self._buffer(arr, n)
         minElmt = min(arr)
         maxElmt = max(arr)
+        self.__check_range(minElmt, maxElmt)
 
         # initialize counting array to have room for the entire range of elements
         count_arr = [0]*(maxElmt-minElmt+1)
 
         # count occurrences of each element in array
         for x in arr:
-            count_arr[x+minElmt] += 1
+            count_arr[x-minElmt] += 1
 
         # do an accumulative sun of the element occurences in the counting array
         count_arr = list(accumulate(count_arr))
 
         # iterate elements in array and place in sorted array based on occurences in counting array
         for x in arr:
-            work_arr[count_arr[x+minElmt]-1] = x
-            count_arr[x+minElmt] -= 1
+            work_arr[count_arr[x-minElmt]-1] = x
+            count_arr[x-minElmt] -= 1
         return work_arr
 
 
+    def __keyed_sort(self, arr: list, keys: list, reverse: bool) -> list:
+        """
+        Stable counting sort of the elements by their precomputed integer keys. For a descending sort the keys are
+        counted from the largest key, so elements with equal keys still keep their relative order
+
+        Parameters:
+            arr (list): elements to be sorted
+            keys (list): integer key of each element
+            reverse (bool): whether the elements should be sorted in descending order
+
+        Returns:
+            list: the sorted elements
+        """
+        n = len(arr)
+        if n == 0:
+            return []
+
+        min_key = min(keys)
+        max_key = max(keys)
+        self.__check_range(min_key, max_key)
+        if reverse:
+            slots = [max_key-k for k in keys]
+        else:
+            slots = [k-min_key for k in keys]
+
+        count_arr = [0]*(max_key-min_key+1)
+        for slot in slots:
+            count_arr[slot] += 1
+        count_arr = list(accumulate(count_arr))
+
+        # iterate elements in reverse, so elements with equal keys keep their relative order
+        work_arr = self._buffer(arr, n)
+        for i in range(n-1, -1, -1):
+            slot = slots[i]
+            count_arr[slot] -= 1
+            work_arr[count_arr[slot]] = arr[i]
+        return work_arr
+
+
+    def __numpy_sort(self, arr):
+        """
+        Vectorized counting sort implementation. The occurrences of each element are counted with np.bincount, and
+        the sorted array is built by repeating every element of the range by its number of occurrences
+
+        Parameters:
+            arr (list or ndarray): integers to be sorted
+
+        Returns:
+            list or ndarray: the sorted elements, as an ndarray if arr is an ndarray and as a list otherwise
+        """
+        a = np.asarray(arr)
+        if a.size == 0:
+            return a.copy() if isinstance(arr, np.ndarray) else []
+        if a.dtype.kind not in 'iu':
+            raise TypeError('{} only sorts integers'.format(self))
+
+        min_elmt = a.min()
+        self.__check_range(int(min_elmt), int(a.max()))
+        count_arr = np.bincount((a - min_elmt).astype(np.intp))
+        work_arr = np.repeat(np.arange(min_elmt, min_elmt + len(count_arr), dtype=a.dtype), count_arr)
+
+        if isinstance(arr, np.ndarray):
+            return work_arr
+        return work_arr.tolist()
+
+
+    def __numpy_argsort(self, arr, reverse: bool):
+        """
+        Vectorized stable permutation of a counting sort. The elements are mapped to their offsets from the smallest
+        (or for a descending order, from the largest) element, and the offsets are sorted by numpy's stable argsort,
+        which is a counting sort for offsets of at most 16 bits
+
+        Parameters:
+            arr (list or ndarray): integers to find the permutation of
+            reverse (bool): whether the permutation should sort the array in descending order
+
+        Returns:
+            ndarray: the permutation
+        """
+        a = np.asarray(arr).ravel()
+        if a.size == 0:
+            return np.empty(0, dtype=np.intp)
+        if a.dtype.kind not in 'iu':
+            raise TypeError('{} only sorts integers'.format(self))
+
+        # the offsets are computed modulo 2**64, which is exact as the range of the elements fits in 64 bits
+        min_elmt = int(a.min())
+        max_elmt = int(a.max())
+        self.__check_range(min_elmt, max_elmt)
+        u = a.astype(np.uint64)
+        if reverse:
+            offsets = np.uint64(max_elmt % 2**64) - u
+        else:
+            offsets = u - np.uint64(min_elmt % 2**64)
+        offset_type = np.uint8 if max_elmt-min_elmt < 2**8 else np.uint16 if max_elmt-min_elmt < 2**16 else np.uint64
+        return np.argsort(offsets.astype(offset_type), kind='stable')
+
+
+    def __check_range(self, min_elmt: int, max_elmt: int):
+        """
+        Verifies that the range of the elements is within max_range, if a limit is set
+
+        Parameters:
+            min_elmt (int): smallest element
+            max_elmt (int): largest element
+
+        Returns:
+            None
+        """
+        if self.max_range is not None and max_elmt - min_elmt >= self.max_range:
+            raise ValueError('{} cannot count a range of {} elements (max_range {})'.format(self, max_elmt-min_elmt+1,
+                                                                                            self.max_range))
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Counting sorting algorithm')
 
     parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
     parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-backend', help='implementation to use', choices=CountingSort.BACKENDS, default='python')
     args = parser.parse_args()
     
     n = args.data[0]
@@ -73,7 +295,7 @@ if __name__ == '__main__':
     sorted_data = list(range(n))
     random.seed(seed)
     random_data = random.sample(sorted_data, n)
-    sorting_algo = CountingSort()
+    sorting_algo = CountingSort(args.backend)
 
     # verify that list is sorted correctly
     if not sorting_algo.sort(random_data) == sorted_data:
@@ -0,0 +1,189 @@
+import argparse
+import os
+import timeit
+from functools import partial
+import random
+from sorting import BaseSort
+from insertion_sort import InsertionSort
+
+
+class DualPivotQuickSort(BaseSort):
+    """
+    A class used to encapsulate the dual-pivot QuickSort algorithm (Yaroslavskiy's partitioning scheme)
+
+    Attributes
+    ----------
+    -
+
+    Methods
+    -------
+    sort(arr, in_place=False, key=None, reverse=False)
+        Sorts an array using the dual-pivot QuickSort algorithm
+
+    __dual_pivot_sort(arr, low, high)
+        Iterative implementation of the dual-pivot QuickSort algorithm
+
+    __partition(arr, low, high)
+        Partitions the input subarray into three segments around two pivots and returns the indices of the correctly
+        placed pivots
+
+    """
+    # partitions of this size or smaller are insertion sorted
+    INSERTION_CUTOFF = 16
+
+
+    def __init__(self):
+        self.__insertion_sort = InsertionSort()
+
+
+    def __repr__(self):
+        return "Dual-Pivot QuickSort"
+
+
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
+        """
+        Sorts an array using the dual-pivot QuickSort algorithm
+
+        Parameters:
+            arr (list): list to be sorted
+            in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
+
+        Returns:
+            list: the sorted list
+        """
+        if key is not None or reverse:
+            return self._keyed_sort(arr, in_place, key, reverse)
+
+        if in_place:
+            work_arr = arr
+        else:
+            work_arr = arr.copy()
+
+        self.__dual_pivot_sort(work_arr, 0, len(work_arr)-1)
+
+        return work_arr
+
+
+    def __dual_pivot_sort(self, arr: list, low: int, high: int):
+        """
+        Iterative implementation of the dual-pivot QuickSort algorithm. Every partitioning pass splits the subarray
+        into three segments, which are pushed on an explicit stack with the smallest segment on top
+
+        Parameters:
+            arr (list): list to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+
+        Returns:
+            None
+        """
+        stack = self._stack(arr, [(low, high)])
+        while stack:
+            low, high = stack.pop()
+
+            # small subarrays are insertion sorted
+            if high-low+1 <= self.INSERTION_CUTOFF:
+                self.__insertion_sort.sort_range(arr, low, high)
+                continue
+
+            lp, rp = self.__partition(arr, low, high)
+
+            # the middle segment only needs sorting if the pivots differ, otherwise all its elements equal the pivots
+            segments = [(low, lp-1), (rp+1, high)]
+            if arr[lp] < arr[rp]:
+                segments.append((lp+1, rp-1))
+
+            # push the largest segment first, so the smallest segment is sorted first
+            segments.sort(key=lambda s: s[0]-s[1])
+            stack.extend(segments)
+
+
+    def __partition(self, arr: list, low: int, high: int) -> tuple:
+        """
+        Partitions the input subarray into three segments around two pivots p <= q: elements smaller than p, elements
+        between p and q, and elements larger than q. The pivots are the elements at the tertiles of the subarray
+
+        Parameters:
+            arr (list): list to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+
+        Returns:
+            tuple: indices of the correctly placed left and right pivots
+        """
+        # move the tertile elements to the ends of the subarray and order them so arr[low] <= arr[high]
+        third = (high-low+1) // 3
+        arr[low], arr[low+third] = arr[low+third], arr[low]
+        arr[high], arr[high-third] = arr[high-third], arr[high]
+        if arr[high] < arr[low]:
+            arr[low], arr[high] = arr[high], arr[low]
+        p = arr[low]
+        q = arr[high]
+
+        lt = low+1              # arr[low+1:lt] is smaller than p
+        gt = high-1             # arr[gt+1:high] is larger than q
+        k = lt                  # arr[lt:k] is between p and q, arr[k:gt+1] is yet to be examined
+
+        while k <= gt:
+            x = arr[k]
+            if x < p:
+                arr[k], arr[lt] = arr[lt], x
+                lt += 1
+            elif q < x:
+                # skip elements on the right that already belong to the right segment
+                while q < arr[gt] and k < gt:
+                    gt -= 1
+                arr[k], arr[gt] = arr[gt], x
+                gt -= 1
+
+                # the element swapped in from the right may belong to the left segment
+                x = arr[k]
+                if x < p:
+                    arr[k], arr[lt] = arr[lt], x
+                    lt += 1
+            k += 1
+
+        # place the pivots at the boundaries between the segments
+        lt -= 1
+        gt += 1
+        arr[low], arr[lt] = arr[lt], arr[low]
+        arr[high], arr[gt] = arr[gt], arr[high]
+        return lt, gt
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Dual-pivot QuickSort algorithm')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    args = parser.parse_args()
+
+    n = args.data[0]
+    seed = args.data[1]
+    t = args.t
+
+    # shuffle data randomly with seed
+    sorted_data = list(range(n))
+    random.seed(seed)
+    random_data = random.sample(sorted_data, n)
+    sorting_algo = DualPivotQuickSort()
+
+    # verify that list is sorted correctly
+    if not sorting_algo.sort(random_data) == sorted_data:
+        print('Error sorting array using <{}>'.format(sorting_algo))
+        exit(1)
+
+    # measure execution time
+    if args.t:
+        times = timeit.Timer(partial(sorting_algo.sort, random_data)).repeat(t[1], t[0])
+
+        # average time taken
+        time_taken = min(times) / t[0]
+
+        print('Timing analysis')
+        print('Sorting method: {}'.format(sorting_algo))
+        print('Data length: {}'.format(n))
+        print('Executions: {}'.format(t[0]))
+        print('Average time: {}s'.format(time_taken))
@@ -0,0 +1,268 @@
+import argparse
+import io
+import mmap
+import os
+import random
+import shutil
+import tempfile
+import timeit
+from functools import partial
+from sorting import BaseSort
+from quick_sort import QuickSort
+from k_way_merge import merge_sorted
+
+
+class ExternalSort():
+    """
+    A class used to encapsulate the External Merge Sort algorithm for files that do not fit in memory
+
+    Attributes
+    ----------
+    algo : BaseSort
+        algorithm used to sort each chunk in memory (defaults to introsort)
+    memory_limit : int
+        number of bytes of input that are read and sorted in memory at a time
+    fan_in : int
+        maximum number of sorted runs that are merged at once
+    record_size : int
+        size in bytes of fixed-width binary records, or None for newline-delimited records
+    tmp_dir : str
+        directory in which the sorted runs are stored (defaults to the system temporary directory)
+
+    Methods
+    -------
+    sort_file(input_path, output_path)
+        Sorts the records of a file using the external merge sort algorithm
+
+    __create_runs(input_path, run_dir)
+        Splits the input file into chunks that fit in memory, sorts each chunk and writes it to a run file
+
+    __read_chunks(input_path)
+        Reads the records of the input file in chunks of at most memory_limit bytes
+
+    __read_run(path)
+        Streams the records of a run file
+
+    __write_run(records, run_dir)
+        Writes a sorted chunk of records to a new run file
+
+    __merge(run_paths, output)
+        Streams a k-way loser tree merge of sorted run files into an output file
+
+    """
+    def __init__(self, algo: BaseSort = None, memory_limit: int = 64*2**20, fan_in: int = 16, record_size: int = None,
+                 tmp_dir: str = None):
+        if fan_in < 2:
+            raise ValueError('fan_in must be at least 2')
+        self.algo = algo or QuickSort('introsort')
+        self.memory_limit = memory_limit
+        self.fan_in = fan_in
+        self.record_size = record_size
+        self.tmp_dir = tmp_dir
+
+        # the memory budget is shared between the read buffers of the merged runs and the write buffer of the output
+        self.buffer_size = max(io.DEFAULT_BUFFER_SIZE, memory_limit // (fan_in+1))
+
+
+    def __repr__(self):
+        return 'External Merge Sort ({})'.format(self.algo)
+
+
+    def sort_file(self, input_path: str, output_path: str):
+        """
+        Sorts the records of a file using the external merge sort algorithm. Newline-delimited records are sorted as
+        lines of bytes, and fixed-width binary records are sorted as byte strings, i.e. by their big-endian value
+
+        Parameters:
+            input_path (str): path of the file to be sorted
+            output_path (str): path of the sorted output file
+
+        Returns:
+            None
+        """
+        run_dir = tempfile.mkdtemp(prefix='external_sort_', dir=self.tmp_dir)
+        try:
+            runs = self.__create_runs(input_path, run_dir)
+
+            # merge fan_in runs at a time into longer runs until all remaining runs can be merged at once
+            while len(runs) > self.fan_in:
+                merged_runs = []
+                for i in range(0, len(runs), self.fan_in):
+                    group = runs[i:i+self.fan_in]
+                    fd, path = tempfile.mkstemp(suffix='.run', dir=run_dir)
+                    with open(fd, 'wb', buffering=self.buffer_size) as output:
+                        self.__merge(group, output)
+                    for run in group:
+                        os.remove(run)
+                    merged_runs.append(path)
+                runs = merged_runs
+
+            with open(output_path, 'wb', buffering=self.buffer_size) as output:
+                self.__merge(runs, output)
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+
+    def __create_runs(self, input_path: str, run_dir: str) -> list:
+        """
+        Splits the input file into chunks that fit in memory, sorts each chunk and writes it to a run file
+
+        Parameters:
+            input_path (str): path of the file to be sorted
+            run_dir (str): directory in which the run files are created
+
+        Returns:
+            list: paths of the run files
+        """
+        runs = []
+        for records in self.__read_chunks(input_path):
+            records = self.algo.sort(records, in_place=True)
+            runs.append(self.__write_run(records, run_dir))
+        return runs
+
+
+    def __read_chunks(self, input_path: str):
+        """
+        Reads the records of the input file in chunks of at most memory_limit bytes (or a single record if larger).
+        Fixed-width records are sliced from a memory map of the file, while newline-delimited records are read through
+        a buffered reader
+
+        Parameters:
+            input_path (str): path of the file to be sorted
+
+        Returns:
+            generator: lists of records
+        """
+        if self.record_size:
+            size = os.path.getsize(input_path)
+            if size % self.record_size:
+                raise ValueError('file size {} is not a multiple of the record size {}'.format(size, self.record_size))
+            if size == 0:
+                return
+
+            chunk_size = max(1, self.memory_limit // self.record_size) * self.record_size
+            with open(input_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for start in range(0, size, chunk_size):
+                    stop = min(start+chunk_size, size)
+                    yield [mm[i:i+self.record_size] for i in range(start, stop, self.record_size)]
+        else:
+            with open(input_path, 'rb', buffering=self.buffer_size) as f:
+                while True:
+                    records = f.readlines(self.memory_limit)
+                    if not records:
+                        break
+
+                    # the last line of the file may lack a line terminator
+                    if not records[-1].endswith(b'\n'):
+                        records[-1] += b'\n'
+                    yield records
+
+
+    def __read_run(self, path: str):
+        """
+        Streams the records of a run file through a buffered reader
+
+        Parameters:
+            path (str): path of the run file
+
+        Returns:
+            generator: the records of the run file
+        """
+        with open(path, 'rb', buffering=self.buffer_size) as f:
+            if self.record_size:
+                yield from iter(partial(f.read, self.record_size), b'')
+            else:
+                yield from f
+
+
+    def __write_run(self, records: list, run_dir: str) -> str:
+        """
+        Writes a sorted chunk of records to a new run file
+
+        Parameters:
+            records (list): sorted records
+            run_dir (str): directory in which the run file is created
+
+        Returns:
+            str: path of the run file
+        """
+        fd, path = tempfile.mkstemp(suffix='.run', dir=run_dir)
+        with open(fd, 'wb', buffering=self.buffer_size) as f:
+            f.writelines(records)
+        return path
+
+
+    def __merge(self, run_paths: list, output):
+        """
+        Streams a k-way merge of sorted run files into an output file using a loser tree holding the smallest unmerged
+        record of every run, which resolves ties by run order
+
+        Parameters:
+            run_paths (list): paths of the sorted run files
+            output (file): binary file the merged records are written to
+
+        Returns:
+            None
+        """
+        output.writelines(merge_sorted([self.__read_run(path) for path in run_paths]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='External merge sorting algorithm')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-i', help='path of the file to be sorted (random data is generated if omitted)', required=False)
+    parser.add_argument('-o', help='path of the sorted output file', required=False)
+    parser.add_argument('-mem', help='memory limit in bytes', type=int, default=64*2**20)
+    parser.add_argument('-fan_in', help='maximum number of runs merged at once', type=int, default=16)
+    parser.add_argument('-record_size', help='size of fixed-width binary records (default: newline-delimited)', type=int)
+    args = parser.parse_args()
+
+    if not args.i and not args.data:
+        parser.error('either -i or -data is required')
+    if args.i and not args.o:
+        parser.error('-o is required when sorting a file given by -i')
+
+    sorting_algo = ExternalSort(memory_limit=args.mem, fan_in=args.fan_in, record_size=args.record_size)
+    work_dir = tempfile.mkdtemp(prefix='external_sort_cli_')
+    input_path = args.i
+    output_path = args.o or os.path.join(work_dir, 'sorted')
+
+    try:
+        if not input_path:
+            n = args.data[0]
+            seed = args.data[1]
+
+            # write randomly shuffled integers as fixed-width lines, so their byte order equals their numeric order
+            sorted_data = ['{:012d}\n'.format(x).encode() for x in range(n)]
+            random.seed(seed)
+            random_data = random.sample(sorted_data, n)
+            input_path = os.path.join(work_dir, 'input')
+            with open(input_path, 'wb') as f:
+                f.writelines(random_data)
+
+            # verify that file is sorted correctly
+            sorting_algo.sort_file(input_path, output_path)
+            with open(output_path, 'rb') as f:
+                if not f.readlines() == sorted_data:
+                    print('Error sorting file using <{}>'.format(sorting_algo))
+                    exit(1)
+        else:
+            sorting_algo.sort_file(input_path, output_path)
+
+        # measure execution time
+        if args.t:
+            t = args.t
+            times = timeit.Timer(partial(sorting_algo.sort_file, input_path, output_path)).repeat(t[1], t[0])
+
+            # average time taken
+            time_taken = min(times) / t[0]
+
+            print('Timing analysis')
+            print('Sorting method: {}'.format(sorting_algo))
+            print('File size: {} bytes'.format(os.path.getsize(input_path)))
+            print('Executions: {}'.format(t[0]))
+            print('Average time: {}s'.format(time_taken))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -2,6 +2,7 @@ import argparse
 import os
 import timeit
 from functools import partial
+from itertools import islice
 import random
 from sorting import BaseSort
 
@@ -16,12 +17,27 @@ class HeapSort(BaseSort):
 
     Methods
     -------
-    sort(arr, in_place=False)
+    sort(arr, in_place=False, key=None, reverse=False)
         Sorts an array using the heap sort algorithm
 
+    nsmallest(iterable, k, key=None)
+        Finds the k smallest elements of an iterable using a bounded max heap
+
+    nlargest(iterable, k, key=None)
+        Finds the k largest elements of an iterable using a bounded min heap
+
+    sort_iter(iterable, key=None, reverse=False)
+        Lazily sorts the elements of an iterable, yielding them one at a time
+
+    __decorate(iterable, key, step)
+        Decorates every element of an iterable with its sort key and its position
+
     __max_heapify(arr)
         Builds a max heap from the input array using root_idx as the root element and tree depth determined by size n
 
+    __min_heapify(arr, n, root_idx)
+        Restores the min heap property of the subtree rooted at root_idx
+
     __parent_index
         Find parent index of index i for array representation of max heap
 
@@ -36,22 +52,24 @@ class HeapSort(BaseSort):
         return "Heap Sort"
 
 
-    def sort(self, arr: list, in_place=False) -> list:
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
         """
         Sorts an array using the heap sort algorithm
 
         Parameters:
-            arr (list): list to be sorted
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) to be sorted
             in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
 
         Returns:
-            list: the sorted list
+            list or buffer: the sorted array, of the same type as arr, or a memoryview if arr is bytes
         """ 
-        n = len(arr)
-        if in_place:
-            work_arr = arr
-        else:
-            work_arr = arr.copy()
+        if key is not None or reverse:
+            return self._keyed_sort(arr, in_place, key, reverse)
+
+        result, work_arr = self._work_array(arr, in_place)
+        n = len(work_arr)
 
         # build the max heap structure from the data
         for i in range(n-1,-1,-1):
@@ -62,9 +80,127 @@ class HeapSort(BaseSort):
             work_arr[i], work_arr[0] = work_arr[0], work_arr[i]     # swap first and last elements
             self.__max_heapify(work_arr, i, 0)                      # re-heapify the array, but without including the extracted last element
 
-        return work_arr
+        return result
     
 
+    def nsmallest(self, iterable, k: int, key=None) -> list:
+        """
+        Finds the k smallest elements of an iterable in a single pass in O(n log k) time and O(k) memory. The k
+        smallest elements seen so far are kept in a bounded max heap, whose root is replaced by every element that is
+        smaller than it, so the iterable is never materialized
+
+        Parameters:
+            iterable (iterable): elements to search, e.g. a list or a generator streaming the elements
+            k (int): number of elements to find
+            key (callable): function computing the sort key of each element, which is called once per element
+
+        Returns:
+            list: the k smallest elements in ascending order, with equal elements in their order in the iterable
+        """
+        if k <= 0:
+            return []
+
+        decorated = self.__decorate(iterable, key, 1)
+        heap = list(islice(decorated, k))
+        for i in range(len(heap)//2-1, -1, -1):
+            self.__max_heapify(heap, len(heap), i)
+
+        for item in decorated:
+            if item < heap[0]:
+                heap[0] = item
+                self.__max_heapify(heap, k, 0)
+
+        return [x for _, _, x in self.sort(heap, in_place=True)]
+
+
+    def nlargest(self, iterable, k: int, key=None) -> list:
+        """
+        Finds the k largest elements of an iterable in a single pass in O(n log k) time and O(k) memory. The k
+        largest elements seen so far are kept in a bounded min heap, whose root is replaced by every element that is
+        larger than it, so the iterable is never materialized
+
+        Parameters:
+            iterable (iterable): elements to search, e.g. a list or a generator streaming the elements
+            k (int): number of elements to find
+            key (callable): function computing the sort key of each element, which is called once per element
+
+        Returns:
+            list: the k largest elements in descending order, with equal elements in their order in the iterable
+        """
+        if k <= 0:
+            return []
+
+        decorated = self.__decorate(iterable, key, -1)
+        heap = list(islice(decorated, k))
+        for i in range(len(heap)//2-1, -1, -1):
+            self.__min_heapify(heap, len(heap), i)
+
+        for item in decorated:
+            if heap[0] < item:
+                heap[0] = item
+                self.__min_heapify(heap, k, 0)
+
+        heap = self.sort(heap, in_place=True)
+        heap.reverse()
+        return [x for _, _, x in heap]
+
+
+    def sort_iter(self, iterable, key=None, reverse=False):
+        """
+        Lazily sorts the elements of an iterable, yielding them one at a time in sorted order. The elements are
+        collected and heapified in O(n) time when the first element is requested, after which every element is popped
+        from the heap in O(log n) time, so the first elements are available long before the entire input is sorted,
+        and stopping early skips the remaining work
+
+        Parameters:
+            iterable (iterable): elements to be sorted
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the elements should be yielded in descending order
+
+        Returns:
+            generator: the elements in sorted order, with elements of equal keys in their order in the iterable if
+                key is given
+        """
+        # elements are only decorated with their keys and positions if there is a key function, so equal keys keep
+        # their order, as comparing the bare elements is considerably faster
+        if key is None:
+            heap = list(iterable)
+        else:
+            heap = list(self.__decorate(iterable, key, -1 if reverse else 1))
+
+        # a min heap yields the smallest element first, while a max heap yields the largest
+        heapify = self.__max_heapify if reverse else self.__min_heapify
+        n = len(heap)
+        for i in range(n//2-1, -1, -1):
+            heapify(heap, n, i)
+
+        # pop the root and replace it by the last element of the heap
+        while n > 0:
+            yield heap[0] if key is None else heap[0][2]
+            n -= 1
+            heap[0] = heap[n]
+            heap.pop()
+            heapify(heap, n, 0)
+
+
+    def __decorate(self, iterable, key, step: int):
+        """
+        Decorates every element of an iterable with its sort key and its position, so the key is computed once per
+        element and elements are never compared directly. The positions are negated for step -1, which orders
+        elements with equal keys by descending position
+
+        Parameters:
+            iterable (iterable): elements to decorate
+            key (callable): function computing the sort key of each element, or None to use the elements as keys
+            step (int): 1 or -1
+
+        Returns:
+            generator: (key, position, element) tuples
+        """
+        for i, x in enumerate(iterable):
+            yield (x if key is None else key(x), step*i, x)
+
+
     def __max_heapify(self, arr: list, n: int, root_idx: int) -> list:
         """
         Builds a max heap from the input array using root_idx as the root element and tree depth determined by size n
@@ -97,6 +233,33 @@ class HeapSort(BaseSort):
             self.__max_heapify(arr, n, max_idx)
 
     
+    def __min_heapify(self, arr: list, n: int, root_idx: int):
+        """
+        Restores the min heap property of the subtree rooted at root_idx, given that both of its subtrees are min heaps
+
+        Parameters:
+            arr (list): array representation of the heap
+            n (int): length of array to build heap from
+            root_idx: index of the root element in the array
+
+        Returns:
+            None
+        """
+        min_idx = root_idx
+        l = self.__left_child_index(root_idx)
+        r = self.__right_child_index(root_idx)
+
+        if l < n and arr[l] < arr[min_idx]:
+            min_idx = l
+        if r < n and arr[r] < arr[min_idx]:
+            min_idx = r
+
+        # if the min value changed, then it is swapped with the root and its new subtree must be heapified
+        if min_idx != root_idx:
+            arr[min_idx], arr[root_idx] = arr[root_idx], arr[min_idx]
+            self.__min_heapify(arr, n, min_idx)
+
+    
     def __parent_index(self, i: int) -> int:
         """
         Find parent index of index i for array representation of max heap
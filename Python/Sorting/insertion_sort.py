@@ -18,30 +18,35 @@ class InsertionSort(BaseSort):
 
     Methods
     -------
-    sort(arr, in_place=False)
+    sort(arr, in_place=False, key=None, reverse=False)
         Sorts an array using the insertion sort algorithm
 
+    sort_range(arr, low, high)
+        Sorts the subarray arr[low:high+1] in place using the insertion sort algorithm
+
     """
     def __repr__(self):
         return "Insertion Sort"
 
 
-    def sort(self, arr: list, in_place=False) -> list:
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
         """
         Sorts an array using the insertion sort algorithm
 
         Parameters:
-            arr (list): list to be sorted
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) to be sorted
             in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
 
         Returns:
-            list: the sorted list
+            list or buffer: the sorted array, of the same type as arr, or a memoryview if arr is bytes
         """ 
-        n = len(arr)
-        if in_place:
-            work_arr = arr
-        else:
-            work_arr = arr.copy()
+        if key is not None or reverse:
+            return self._keyed_sort(arr, in_place, key, reverse)
+
+        result, work_arr = self._work_array(arr, in_place)
+        n = len(work_arr)
         
         # iterate through all elements and sort along the way (elements [0:i-1] will be sorted at any given time)
         for i in range(1,n):
@@ -52,7 +57,31 @@ class InsertionSort(BaseSort):
                     work_arr[j], work_arr[j-1] = work_arr[j-1], work_arr[j]
                 else:
                     break
-        return work_arr
+        return result
+
+
+    def sort_range(self, arr: list, low: int, high: int):
+        """
+        Sorts the subarray arr[low:high+1] in place using the insertion sort algorithm. Elements are shifted rather
+        than swapped, which makes it suitable for finishing off small partitions in other sorting algorithms
+
+        Parameters:
+            arr (list): list containing the subarray to be sorted
+            low (int): start index of the subarray
+            high (int): end index of the subarray
+
+        Returns:
+            None
+        """
+        for i in range(low+1, high+1):
+            x = arr[i]
+            j = i-1
+
+            # shift larger elements one position to the right until the correct position of x is found
+            while j >= low and x < arr[j]:
+                arr[j+1] = arr[j]
+                j -= 1
+            arr[j+1] = x
 
 
 if __name__ == '__main__':
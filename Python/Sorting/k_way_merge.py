@@ -0,0 +1,307 @@
+import argparse
+import heapq
+import timeit
+from bisect import bisect_left, bisect_right
+from itertools import chain
+import random
+
+
+class LoserTree():
+    """
+    A class used to encapsulate a k-way merge of sorted sequences with a tournament tree of losers, where every
+    internal node holds the source that lost the match played at the node and the root holds the overall winner
+
+    Attributes
+    ----------
+    -
+
+    Methods
+    -------
+    merge(iterables, key=None)
+        Lazily merges sorted iterables into a single sorted stream
+
+    __merge_iterators(iterators, key)
+        Merges sorted iterators, consuming a single element at a time from each
+
+    __merge_sequences(sequences, key)
+        Merges sorted lists or tuples, yielding runs of elements from the same source in bulk
+
+    __build(keys, live)
+        Plays the initial tournament between the first element of every source
+
+    __runner_up(tree, keys, live, winner)
+        Finds the source whose element would be merged if the winner was removed
+
+    """
+    # a source of a list merge is galloped once it has won this many elements in a row
+    MIN_GALLOP = 7
+
+
+    def __repr__(self):
+        return "Loser Tree Merge"
+
+
+    def merge(self, iterables, key=None):
+        """
+        Lazily merges sorted iterables into a single sorted stream. The sources are the leaves of a loser tree, so
+        after an element is merged, only the matches on the path from its source to the root are replayed, which
+        costs about log2(k) comparisons per element for k sources. The merge is stable: elements with equal keys are
+        merged in the order of their sources. Iterators and generators are consumed one element at a time, while
+        lists and tuples are merged by a bulk path that copies long runs from the same source at once
+
+        Parameters:
+            iterables (iterable): sorted iterables (lists, tuples, iterators or generators)
+            key (callable): function computing the sort key of each element, which is called once per element
+
+        Returns:
+            generator: the elements of all iterables in sorted order
+        """
+        sources = list(iterables)
+        if all(isinstance(source, (list, tuple)) for source in sources):
+            return self.__merge_sequences(sources, key)
+        return self.__merge_iterators([iter(source) for source in sources], key)
+
+
+    def __merge_iterators(self, iterators: list, key):
+        """
+        Merges sorted iterators, consuming a single element at a time from each. When all but one iterator are
+        exhausted, the rest of the last iterator is yielded without comparisons
+
+        Parameters:
+            iterators (list): sorted iterators
+            key (callable): function computing the sort key of each element
+
+        Returns:
+            generator: the elements of all iterators in sorted order
+        """
+        k = len(iterators)
+        exhausted = object()
+        items = [next(it, exhausted) for it in iterators]
+        live = [item is not exhausted for item in items]
+        keys = items if key is None else [key(item) if alive else None for item, alive in zip(items, live)]
+        tree = self.__build(keys, live)
+        remaining = sum(live)
+
+        while remaining > 1:
+            s = tree[0]
+            yield items[s]
+
+            item = next(iterators[s], exhausted)
+            if item is exhausted:
+                live[s] = False
+                remaining -= 1
+            else:
+                items[s] = item
+                if key is not None:
+                    keys[s] = key(item)
+
+            # replay the matches on the path from the leaf of the source to the root
+            key_s = keys[s]
+            alive = live[s]
+            node = (k+s) >> 1
+            while node:
+                t = tree[node]
+                if live[t] and (not alive or (not key_s < keys[t] if t < s else keys[t] < key_s)):
+                    tree[node] = s
+                    s = t
+                    key_s = keys[t]
+                    alive = True
+                node >>= 1
+            tree[0] = s
+
+        if remaining:
+            s = tree[0]
+            yield items[s]
+            yield from iterators[s]
+
+
+    def __merge_sequences(self, sequences: list, key):
+        """
+        Merges sorted lists or tuples. When a source wins MIN_GALLOP elements in a row, the runner-up is found among
+        the losers on the path of the winner, and every element of the winner that is merged before the runner-up is
+        found by binary search and yielded as a single slice, which merges shards of little overlap in a few
+        comparisons per run instead of per element
+
+        Parameters:
+            sequences (list): sorted lists or tuples
+            key (callable): function computing the sort key of each element
+
+        Returns:
+            generator: the elements of all sequences in sorted order
+        """
+        k = len(sequences)
+        pos = [0]*k
+        live = [len(seq) > 0 for seq in sequences]
+        keys = [(seq[0] if key is None else key(seq[0])) if alive else None for seq, alive in zip(sequences, live)]
+        tree = self.__build(keys, live)
+        remaining = sum(live)
+        streak_source, streak = -1, 0
+
+        while remaining > 1:
+            s = tree[0]
+            seq = sequences[s]
+            p = pos[s]
+            if s == streak_source:
+                streak += 1
+            else:
+                streak_source, streak = s, 1
+
+            if streak < self.MIN_GALLOP:
+                yield seq[p]
+                p += 1
+            else:
+                # the elements before the runner-up, with ties resolved by source order
+                r = self.__runner_up(tree, keys, live, s)
+                bisect = bisect_right if s < r else bisect_left
+                end = bisect(seq, keys[r], p+1, len(seq), key=key)
+                yield from seq[p:end]
+                if end - p < self.MIN_GALLOP:
+                    streak = 0
+                p = end
+
+            pos[s] = p
+            if p < len(seq):
+                keys[s] = seq[p] if key is None else key(seq[p])
+            else:
+                live[s] = False
+                remaining -= 1
+
+            # replay the matches on the path from the leaf of the source to the root
+            key_s = keys[s]
+            alive = live[s]
+            node = (k+s) >> 1
+            while node:
+                t = tree[node]
+                if live[t] and (not alive or (not key_s < keys[t] if t < s else keys[t] < key_s)):
+                    tree[node] = s
+                    s = t
+                    key_s = keys[t]
+                    alive = True
+                node >>= 1
+            tree[0] = s
+
+        if remaining:
+            s = tree[0]
+            yield from sequences[s][pos[s]:]
+
+
+    def __build(self, keys: list, live: list) -> list:
+        """
+        Plays the initial tournament between the first element of every source. The k sources are the leaves k to
+        2k-1 of an implicit binary tree, whose internal nodes 1 to k-1 store the loser of their match, and the winner
+        of the tournament is stored at index 0
+
+        Parameters:
+            keys (list): key of the current element of every source
+            live (list): whether every source has a current element
+
+        Returns:
+            list: the loser tree
+        """
+        k = len(keys)
+        tree = [0]*max(k, 1)
+        winners = [0]*k + list(range(k))
+        for node in range(k-1, 0, -1):
+            a = winners[2*node]
+            b = winners[2*node+1]
+
+            # equal keys are won by the source of the smaller index
+            if live[b] and (not live[a] or (not keys[a] < keys[b] if b < a else keys[b] < keys[a])):
+                a, b = b, a
+            winners[node] = a
+            tree[node] = b
+        if k > 1:
+            tree[0] = winners[1]
+        return tree
+
+
+    def __runner_up(self, tree: list, keys: list, live: list, winner: int) -> int:
+        """
+        Finds the source whose element would be merged if the winner was removed, which is the best of the sources
+        that lost to the winner on its path to the root
+
+        Parameters:
+            tree (list): the loser tree
+            keys (list): key of the current element of every source
+            live (list): whether every source has a current element
+            winner (int): the source at the root
+
+        Returns:
+            int: the runner-up source
+        """
+        best = -1
+        node = (len(keys)+winner) >> 1
+        while node:
+            t = tree[node]
+            if live[t] and (best < 0 or (not keys[best] < keys[t] if t < best else keys[t] < keys[best])):
+                best = t
+            node >>= 1
+        return best
+
+
+_loser_tree = LoserTree()
+
+
+def merge_sorted(iterables, key=None):
+    """
+    Lazily merges sorted iterables into a single sorted stream with a loser tree, in about log2(k) comparisons per
+    element for k iterables. The merge is stable, and lists and tuples are merged in bulk where they do not overlap
+
+    Parameters:
+        iterables (iterable): sorted iterables (lists, tuples, iterators or generators)
+        key (callable): function computing the sort key of each element
+
+    Returns:
+        generator: the elements of all iterables in sorted order
+    """
+    return _loser_tree.merge(iterables, key)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-way merge of sorted sequences with a loser tree')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-k', help='number of sorted shards', type=int, default=100)
+    args = parser.parse_args()
+
+    n = args.data[0]
+    seed = args.data[1]
+    t = args.t
+    k = args.k
+
+    # k sorted shards of randomly distributed elements, and k sorted shards of consecutive ranges of elements
+    random.seed(seed)
+    random_data = random.sample(range(n), n)
+    shards = [sorted(random_data[i::k]) for i in range(k)]
+    partitions = [list(range(i*n // k, (i+1)*n // k)) for i in range(k)]
+    sorted_data = list(range(n))
+
+    # verify that the shards are merged correctly
+    if not list(merge_sorted(shards)) == sorted_data or not list(merge_sorted(iter(s) for s in shards)) == sorted_data \
+            or not list(merge_sorted(partitions[::-1])) == sorted_data:
+        print('Error merging shards using <{}>'.format(_loser_tree))
+        exit(1)
+
+    # measure execution time
+    if args.t:
+        methods = {
+            'merge_sorted (lists)': lambda: list(merge_sorted(shards)),
+            'merge_sorted (iterators)': lambda: list(merge_sorted(iter(s) for s in shards)),
+            'merge_sorted (partitions)': lambda: list(merge_sorted(partitions[::-1])),
+            'heapq.merge': lambda: list(heapq.merge(*shards)),
+            'heapq.merge (partitions)': lambda: list(heapq.merge(*partitions[::-1])),
+            'sorted(chain)': lambda: sorted(chain.from_iterable(shards)),
+        }
+
+        print('Timing analysis')
+        print('Merging method: {}'.format(_loser_tree))
+        print('Data length: {}'.format(n))
+        print('Shards: {}'.format(k))
+        print('Executions: {}'.format(t[0]))
+        for name, method in methods.items():
+            times = timeit.Timer(method).repeat(t[1], t[0])
+
+            # average time taken
+            time_taken = min(times) / t[0]
+            print('Average time ({}): {}s'.format(name, time_taken))
@@ -3,7 +3,10 @@ import os
 import timeit
 from functools import partial
 import random
+from bisect import bisect_left, bisect_right
+from math import isqrt
 from sorting import BaseSort
+from insertion_sort import InsertionSort
 
 
 class MergeSort(BaseSort):
@@ -12,43 +15,217 @@ class MergeSort(BaseSort):
 
     Attributes
     ----------
-    -
+    mode : str
+        the merge sort variant to use:
+            'top_down': recursive merge sort that splits the array down to single elements (default)
+            'bottom_up': iterative merge sort that insertion sorts small runs and merges them in passes of doubling
+                width, alternating between the array and a single auxiliary buffer
+            'adaptive': natural merge sort (TimSort-style) that detects existing ascending and strictly descending
+                runs, extends short runs with binary insertion sort, keeps a stack of run lengths balanced and
+                gallops through merges when one run keeps winning, so nearly sorted input is sorted in close to O(n)
+            'block': bottom-up merge sort that merges the runs in place with a buffer of sqrt(n) elements (block
+                merge sort), so it is stable and runs in O(n log n) time with O(sqrt(n)) auxiliary memory
 
     Methods
     -------
-    sort(arr, in_place=False)
+    sort(arr, in_place=False, key=None, reverse=False)
         Sorts an array using the merge sort algorithm
 
+    _argsort(values)
+        Finds the stable permutation of indices that sorts a list by a bottom-up merge sort of the indices
+
+    __merge_indices(values, src, dst, low, mid, high)
+        Merges two runs of indices sorted by their values
+
     __recursive_sort(arr)
         Recursively splits the array into smaller segments until each segment is a single element, which are then
         merged while sorting the merging elements until the entire array is merged and sorted
 
     __merge(a,b)
         Merges two lists while sorting the elements in the lists
+
+    __bottom_up_sort(arr)
+        Sorts the array in place by merging runs of doubling width using a single auxiliary buffer
+
+    __merge_into(src, dst, low, mid, high)
+        Merges the sorted runs src[low:mid] and src[mid:high] into dst[low:high]
+
+    __adaptive_sort(arr)
+        Sorts the array in place by finding natural runs and merging them while maintaining the run stack invariants
+
+    __count_run(arr, low, high)
+        Finds the length of the run starting at arr[low], reversing it if it is strictly descending
+
+    __merge_collapse(arr, runs)
+        Merges runs on top of the run stack until the run stack invariants are restored
+
+    __merge_at(arr, runs, i)
+        Merges the i'th and i+1'th runs on the run stack
+
+    __merge_low(arr, base_a, len_a, base_b, len_b)
+        Galloping merge of two adjacent runs, where the left run is the shorter one
+
+    __merge_high(arr, base_a, len_a, base_b, len_b)
+        Galloping merge of two adjacent runs, where the right run is the shorter one
+
+    __gallop(key, arr, low, high, right, from_end)
+        Finds the insertion point of key in the sorted arr[low:high] by exponential search from either end
+
+    __block_sort(arr)
+        Sorts the array in place by merging runs of doubling width in place with a buffer of sqrt(n) elements
+
+    __block_merge(arr, low, mid, high, buf)
+        Merges the adjacent sorted runs arr[low:mid] and arr[mid:high] in place using the buffer
+
+    __merge_blocks(arr, low, mid, high, buf)
+        Merges two adjacent runs of whole blocks in place by ordering the blocks and merging neighbouring blocks
+
+    __merge_fragment(arr, low, mid, high, buf, left_first)
+        Merges a run of at most a buffer of elements with the run after it, stopping when either run is used up
+
+    __merge_fragment_high(arr, low, mid, high, buf)
+        Merges a run with the run of at most a buffer of elements after it, from the end
     """
+    MODES = ('top_down', 'bottom_up', 'adaptive', 'block')
+
+    # length of the runs that are insertion sorted before merging in bottom-up mode
+    RUN_LENGTH = 32
+
+    # number of consecutive wins of one run during a merge before switching to galloping in adaptive mode
+    MIN_GALLOP = 7
+
+
+    def __init__(self, mode: str = 'top_down'):
+        if mode not in self.MODES:
+            raise ValueError('unknown merge sort mode: {}'.format(mode))
+        self.mode = mode
+        self.__insertion_sort = InsertionSort()
+
+
     def __repr__(self):
-        return "Merge Sort"
+        if self.mode == 'top_down':
+            return "Merge Sort"
+        return "Merge Sort ({})".format(self.mode)
 
 
-    def sort(self, arr: list, in_place=False) -> list:
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
         """
-        Sorts an array using the merge sort algorithm
+        Sorts an array using the merge sort algorithm. Typed buffers are sorted bottom-up unless in block mode, as the
+        other modes rely on slices of the array being copies
 
         Parameters:
-            arr (list): list to be sorted
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) to be sorted
             in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
 
         Returns:
-            list: the sorted list
+            list or buffer: the sorted array, of the same type as arr, or a memoryview if arr is bytes
         """ 
+        if key is not None or reverse:
+            return self._keyed_sort(arr, in_place, key, reverse)
+
+        result, work_arr = self._work_array(arr, in_place)
+
+        if self.mode == 'block':
+            self.__block_sort(work_arr)
+            return result
+        if self.mode == 'bottom_up' or not isinstance(work_arr, list):
+            self.__bottom_up_sort(work_arr)
+            return result
+        if self.mode == 'adaptive':
+            return self.__adaptive_sort(work_arr)
+
+        sorted_arr = self.__recursive_sort(work_arr)
         if in_place:
-            work_arr = arr
-        else:
-            work_arr = arr.copy()
-        
-        return self.__recursive_sort(work_arr)
+            work_arr[:] = sorted_arr
+            return work_arr
+        return sorted_arr
     
 
+    def _argsort(self, values: list) -> list:
+        """
+        Finds the stable permutation of indices that sorts a list in ascending order by a bottom-up merge sort of the
+        indices, which compares the values the indices refer to. Runs of RUN_LENGTH indices are insertion sorted,
+        and the runs are merged in passes of doubling width between the index list and a single auxiliary list
+
+        Parameters:
+            values (list): the list to find the permutation of
+
+        Returns:
+            list: the permutation
+        """
+        n = len(values)
+        src = list(range(n))
+
+        # insertion sort the runs, shifting the indices of larger values up
+        for low in range(0, n, self.RUN_LENGTH):
+            for i in range(low+1, min(low+self.RUN_LENGTH, n)):
+                idx = src[i]
+                x = values[idx]
+                j = i
+                while j > low and x < values[src[j-1]]:
+                    src[j] = src[j-1]
+                    j -= 1
+                src[j] = idx
+
+        dst = [0]*n
+        width = self.RUN_LENGTH
+        while width < n:
+            for low in range(0, n, 2*width):
+                mid = min(low+width, n)
+                high = min(low+2*width, n)
+                self.__merge_indices(values, src, dst, low, mid, high)
+            src, dst = dst, src
+            width *= 2
+        return src
+
+
+    def __merge_indices(self, values: list, src: list, dst: list, low: int, mid: int, high: int):
+        """
+        Merges the runs of indices src[low:mid] and src[mid:high], which are sorted by their values, into
+        dst[low:high]. Indices of equal values are taken from the left run first, which keeps the merge stable
+
+        Parameters:
+            values (list): the values the indices refer to
+            src (list): list containing the sorted runs of indices
+            dst (list): list the merged run of indices is written to
+            low (int): start index of the left run
+            mid (int): start index of the right run
+            high (int): end index (exclusive) of the right run
+
+        Returns:
+            None
+        """
+        # runs that are already in order (including a missing right run) are copied directly
+        if mid >= high or not values[src[mid]] < values[src[mid-1]]:
+            dst[low:high] = src[low:high]
+            return
+
+        i = low
+        j = mid
+        k = low
+        a = values[src[i]]
+        b = values[src[j]]
+        while True:
+            if b < a:
+                dst[k] = src[j]
+                j += 1
+                k += 1
+                if j == high:
+                    dst[k:high] = src[i:mid]
+                    return
+                b = values[src[j]]
+            else:
+                dst[k] = src[i]
+                i += 1
+                k += 1
+                if i == mid:
+                    dst[k:high] = src[j:high]
+                    return
+                a = values[src[i]]
+
+
     def __recursive_sort(self, arr: list) -> list:   
         """
         Recursively splits the array into smaller segments until each segment is a single element, which are then
@@ -62,8 +239,8 @@ class MergeSort(BaseSort):
         """    
         n = len(arr)
 
-        # if array is a single element there is no sorting to do
-        if n == 1:
+        # if array is a single element (or empty) there is no sorting to do
+        if n <= 1:
             return arr
         # otherwise it must be sorted
         else:
@@ -92,7 +269,7 @@ class MergeSort(BaseSort):
         j = 0               # index for b
         k = 0               # index for merged array
         n = len(a)+len(b)
-        arr = [None]*n
+        arr = self._buffer(a, n)
 
         # lists are compared iteratively and the smallest element at each comparison is added to the array
         while i < len(a) and j<len(b):
@@ -113,11 +290,633 @@ class MergeSort(BaseSort):
         return arr
 
 
+    def __bottom_up_sort(self, arr: list) -> list:
+        """
+        Sorts the array in place by insertion sorting runs of RUN_LENGTH elements and merging neighbouring runs in
+        passes of doubling width. Every pass merges from a source into a destination list, after which the roles are
+        swapped, so a single auxiliary buffer is allocated for the entire sort. For a typed buffer the auxiliary buffer
+        is a buffer of the same element type
+
+        Parameters:
+            arr (list or memoryview): the array to be sorted
+
+        Returns:
+            list: the sorted array
+        """
+        n = len(arr)
+
+        # insertion sort is faster than merging for short runs
+        for low in range(0, n, self.RUN_LENGTH):
+            self.__insertion_sort.sort_range(arr, low, min(low+self.RUN_LENGTH, n)-1)
+
+        src = arr
+        dst = self._buffer(arr, n)
+        width = self.RUN_LENGTH
+        while width < n:
+            for low in range(0, n, 2*width):
+                mid = min(low+width, n)
+                high = min(low+2*width, n)
+                self.__merge_into(src, dst, low, mid, high)
+
+            # the merged runs are the source of the next pass
+            src, dst = dst, src
+            width *= 2
+
+        # after an odd number of passes the sorted elements are in the auxiliary buffer
+        if src is not arr:
+            arr[:] = src
+        return arr
+
+
+    def __merge_into(self, src: list, dst: list, low: int, mid: int, high: int):
+        """
+        Merges the sorted runs src[low:mid] and src[mid:high] into dst[low:high]
+
+        Parameters:
+            src (list): list containing the sorted runs
+            dst (list): list the merged run is written to
+            low (int): start index of the left run
+            mid (int): start index of the right run
+            high (int): end index (exclusive) of the right run
+
+        Returns:
+            None
+        """
+        # runs that are already in order (including a missing right run) are copied directly
+        if mid >= high or src[mid-1] <= src[mid]:
+            dst[low:high] = src[low:high]
+            return
+
+        i = low             # index for left run
+        j = mid             # index for right run
+        k = low             # index for merged run
+
+        # runs are compared iteratively and the smallest element at each comparison is written to the merged run
+        while i < mid and j < high:
+            if src[i] <= src[j]:
+                dst[k] = src[i]
+                i += 1
+            else:
+                dst[k] = src[j]
+                j += 1
+            k += 1
+
+        # remaining elements from either run are copied to the merged run
+        if i < mid:
+            dst[k:high] = src[i:mid]
+        else:
+            dst[k:high] = src[j:high]
+
+    def __adaptive_sort(self, arr: list) -> list:
+        """
+        Sorts the array in place by finding natural runs, extending runs shorter than the minimum run length with
+        binary insertion sort, and pushing the runs on a stack whose lengths are kept balanced by merging
+
+        Parameters:
+            arr (list): the array to be sorted
+
+        Returns:
+            list: the sorted array
+        """
+        n = len(arr)
+        if n < 2:
+            return arr
+
+        # the minimum run length is chosen in [32,64] such that n/min_run is close to, but not above, a power of 2
+        min_run = n
+        r = 0
+        while min_run >= 64:
+            r |= min_run & 1
+            min_run >>= 1
+        min_run += r
+
+        self.__min_gallop = self.MIN_GALLOP
+        runs = self._stack(arr, [])     # stack of (start index, length) of pending runs
+        low = 0
+        while low < n:
+            run_len = self.__count_run(arr, low, n)
+
+            # extend short runs to the minimum run length using binary insertion sort
+            if run_len < min_run:
+                forced_len = min(min_run, n-low)
+                for i in range(low+run_len, low+forced_len):
+                    x = arr[i]
+                    pos = bisect_right(arr, x, low, i)
+                    arr[pos+1:i+1] = arr[pos:i]
+                    arr[pos] = x
+                run_len = forced_len
+
+            runs.append((low, run_len))
+            self.__merge_collapse(arr, runs)
+            low += run_len
+
+        # merge all remaining runs, always merging the shorter neighbour of the second topmost run
+        while len(runs) > 1:
+            k = len(runs)-2
+            if k > 0 and runs[k-1][1] < runs[k+1][1]:
+                k -= 1
+            self.__merge_at(arr, runs, k)
+        return arr
+
+
+    def __count_run(self, arr: list, low: int, high: int) -> int:
+        """
+        Finds the length of the run starting at arr[low], which is either non-descending or strictly descending. A
+        strictly descending run is reversed in place, which keeps the sort stable
+
+        Parameters:
+            arr (list): the array to be sorted
+            low (int): start index of the run
+            high (int): end index (exclusive) of the array
+
+        Returns:
+            int: length of the run
+        """
+        run_high = low+1
+        if run_high == high:
+            return 1
+
+        if arr[run_high] < arr[low]:
+            while run_high < high and arr[run_high] < arr[run_high-1]:
+                run_high += 1
+            arr[low:run_high] = arr[low:run_high][::-1]
+        else:
+            while run_high < high and not arr[run_high] < arr[run_high-1]:
+                run_high += 1
+        return run_high-low
+
+
+    def __merge_collapse(self, arr: list, runs: list):
+        """
+        Merges runs on top of the run stack until the invariants len(X) > len(Y) + len(Z) and len(Y) > len(Z) hold
+        for every three consecutive runs X, Y, Z, which keeps the merges balanced and the stack O(log n) deep
+
+        Parameters:
+            arr (list): the array to be sorted
+            runs (list): stack of (start index, length) of pending runs
+
+        Returns:
+            None
+        """
+        while len(runs) > 1:
+            k = len(runs)-2
+            if (k > 0 and runs[k-1][1] <= runs[k][1]+runs[k+1][1]) or \
+                    (k > 1 and runs[k-2][1] <= runs[k-1][1]+runs[k][1]):
+                # merge the middle run with its shorter neighbour
+                if runs[k-1][1] < runs[k+1][1]:
+                    k -= 1
+            elif runs[k][1] > runs[k+1][1]:
+                break
+            self.__merge_at(arr, runs, k)
+
+
+    def __merge_at(self, arr: list, runs: list, i: int):
+        """
+        Merges the i'th and i+1'th runs on the run stack. Elements at the start of the left run and at the end of the
+        right run that are already in their final position are skipped before merging
+
+        Parameters:
+            arr (list): the array to be sorted
+            runs (list): stack of (start index, length) of pending runs
+            i (int): index of the left run on the stack
+
+        Returns:
+            None
+        """
+        base_a, len_a = runs[i]
+        base_b, len_b = runs[i+1]
+        runs[i] = (base_a, len_a+len_b)
+        del runs[i+1]
+
+        # elements of the left run not larger than the first element of the right run are already in place
+        k = self.__gallop(arr[base_b], arr, base_a, base_b, True, False)
+        len_a -= k-base_a
+        base_a = k
+        if len_a == 0:
+            return
+
+        # elements of the right run not smaller than the last element of the left run are already in place
+        len_b = self.__gallop(arr[base_b-1], arr, base_b, base_b+len_b, False, True) - base_b
+        if len_b == 0:
+            return
+
+        # only the shorter run is copied to a temporary list
+        if len_a <= len_b:
+            self.__merge_low(arr, base_a, len_a, base_b, len_b)
+        else:
+            self.__merge_high(arr, base_a, len_a, base_b, len_b)
+
+
+    def __merge_low(self, arr: list, base_a: int, len_a: int, base_b: int, len_b: int):
+        """
+        Merges two adjacent runs from left to right, where the left run is the shorter one and is copied to a
+        temporary list. When one run wins MIN_GALLOP comparisons in a row, the merge switches to galloping, copying
+        entire stretches of a run found by exponential search
+
+        Parameters:
+            arr (list): the array to be sorted
+            base_a (int): start index of the left run
+            len_a (int): length of the left run
+            base_b (int): start index of the right run
+            len_b (int): length of the right run
+
+        Returns:
+            None
+        """
+        tmp = arr[base_a:base_a+len_a]
+        i = 0                   # index for left run (in tmp)
+        j = base_b              # index for right run
+        k = base_a              # index for merged run
+        end_b = base_b+len_b
+        min_gallop = self.__min_gallop
+
+        while i < len_a and j < end_b:
+            # one element at a time until one run wins min_gallop times in a row
+            count_a = count_b = 0
+            while i < len_a and j < end_b:
+                if arr[j] < tmp[i]:
+                    arr[k] = arr[j]
+                    j += 1
+                    count_b += 1
+                    count_a = 0
+                else:
+                    arr[k] = tmp[i]
+                    i += 1
+                    count_a += 1
+                    count_b = 0
+                k += 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            else:
+                break
+
+            # gallop as long as the copied stretches are long, lowering the threshold for galloping again
+            min_gallop += 1
+            while i < len_a and j < end_b:
+                min_gallop -= min_gallop > 1
+
+                p = self.__gallop(arr[j], tmp, i, len_a, True, False)
+                count_a = p-i
+                arr[k:k+count_a] = tmp[i:p]
+                k += count_a
+                i = p
+                if i == len_a:
+                    break
+
+                q = self.__gallop(tmp[i], arr, j, end_b, False, False)
+                count_b = q-j
+                arr[k:k+count_b] = arr[j:q]
+                k += count_b
+                j = q
+                if j == end_b:
+                    break
+
+                if count_a < self.MIN_GALLOP and count_b < self.MIN_GALLOP:
+                    break
+            min_gallop += 1
+
+        # the remainder of the right run is already in place
+        arr[k:k+len_a-i] = tmp[i:]
+        self.__min_gallop = max(min_gallop, 1)
+
+
+    def __merge_high(self, arr: list, base_a: int, len_a: int, base_b: int, len_b: int):
+        """
+        Merges two adjacent runs from right to left, where the right run is the shorter one and is copied to a
+        temporary list. Galloping works as in __merge_low, but from the end of the runs
+
+        Parameters:
+            arr (list): the array to be sorted
+            base_a (int): start index of the left run
+            len_a (int): length of the left run
+            base_b (int): start index of the right run
+            len_b (int): length of the right run
+
+        Returns:
+            None
+        """
+        tmp = arr[base_b:base_b+len_b]
+        i = base_b-1            # index for left run
+        j = len_b-1             # index for right run (in tmp)
+        k = base_b+len_b-1      # index for merged run
+        min_gallop = self.__min_gallop
+
+        while i >= base_a and j >= 0:
+            # one element at a time until one run wins min_gallop times in a row
+            count_a = count_b = 0
+            while i >= base_a and j >= 0:
+                if tmp[j] < arr[i]:
+                    arr[k] = arr[i]
+                    i -= 1
+                    count_a += 1
+                    count_b = 0
+                else:
+                    arr[k] = tmp[j]
+                    j -= 1
+                    count_b += 1
+                    count_a = 0
+                k -= 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            else:
+                break
+
+            # gallop as long as the copied stretches are long, lowering the threshold for galloping again
+            min_gallop += 1
+            while i >= base_a and j >= 0:
+                min_gallop -= min_gallop > 1
+
+                p = self.__gallop(tmp[j], arr, base_a, i+1, True, True)
+                count_a = i+1-p
+                arr[k-count_a+1:k+1] = arr[p:i+1]
+                k -= count_a
+                i = p-1
+                if i < base_a:
+                    break
+
+                q = self.__gallop(arr[i], tmp, 0, j+1, False, True)
+                count_b = j+1-q
+                arr[k-count_b+1:k+1] = tmp[q:j+1]
+                k -= count_b
+                j = q-1
+                if j < 0:
+                    break
+
+                if count_a < self.MIN_GALLOP and count_b < self.MIN_GALLOP:
+                    break
+            min_gallop += 1
+
+        # the remainder of the left run is already in place
+        arr[k-j:k+1] = tmp[:j+1]
+        self.__min_gallop = max(min_gallop, 1)
+
+
+    def __gallop(self, key, arr: list, low: int, high: int, right: bool, from_end: bool) -> int:
+        """
+        Finds the insertion point of key in the sorted arr[low:high]. The elements at offsets 1, 2, 4, 8, ... from
+        one end are probed until the insertion point is bracketed, which is then found by binary search. This costs
+        O(log d) comparisons when the insertion point is d elements from the probed end
+
+        Parameters:
+            key: the element to find the insertion point of
+            arr (list): list containing the sorted subarray
+            low (int): start index of the subarray
+            high (int): end index (exclusive) of the subarray
+            right (bool): whether the insertion point is after (True) or before (False) elements equal to key
+            from_end (bool): whether to probe from the end (True) or start (False) of the subarray
+
+        Returns:
+            int: index of the insertion point
+        """
+        bisect = bisect_right if right else bisect_left
+        ofs = 1
+        if from_end:
+            prev = high
+            while ofs <= high-low:
+                idx = high-ofs
+                # the insertion point is after idx
+                if (not key < arr[idx]) if right else (arr[idx] < key):
+                    return bisect(arr, key, idx+1, prev)
+                prev = idx
+                ofs *= 2
+            return bisect(arr, key, low, prev)
+
+        prev = low
+        while ofs <= high-low:
+            idx = low+ofs-1
+            # the insertion point is at or before idx
+            if (key < arr[idx]) if right else (not arr[idx] < key):
+                return bisect(arr, key, prev, idx)
+            prev = idx+1
+            ofs *= 2
+        return bisect(arr, key, prev, high)
+
+
+    def __block_sort(self, arr: list) -> list:
+        """
+        Sorts the array in place by insertion sorting runs of RUN_LENGTH elements and merging neighbouring runs in
+        passes of doubling width, where every merge is performed in place by __block_merge. The only auxiliary memory
+        is a buffer of sqrt(n) elements, of the same element type for a typed buffer, and the bookkeeping of the at
+        most sqrt(n) blocks of a merge
+
+        Parameters:
+            arr (list or memoryview): the array to be sorted
+
+        Returns:
+            list: the sorted array
+        """
+        n = len(arr)
+        if n < 2:
+            return arr
+
+        for low in range(0, n, self.RUN_LENGTH):
+            self.__insertion_sort.sort_range(arr, low, min(low+self.RUN_LENGTH, n)-1)
+
+        block_size = isqrt(n)
+        buf = self._buffer(arr, block_size)
+
+        width = self.RUN_LENGTH
+        while width < n:
+            for low in range(0, n-width, 2*width):
+                mid = low+width
+                high = min(low+2*width, n)
+
+                # runs that are already in order are skipped
+                if arr[mid] < arr[mid-1]:
+                    self.__block_merge(arr, low, mid, high, buf)
+            width *= 2
+        return arr
+
+
+    def __block_merge(self, arr: list, low: int, mid: int, high: int, buf: list):
+        """
+        Merges the adjacent sorted runs arr[low:mid] and arr[mid:high] in place using the buffer. A run that fits in
+        the buffer is merged through it directly. Otherwise the runs are cut into whole blocks of the buffer size,
+        except for the first elements of the left run and the last elements of the right run, the blocks are merged
+        by __merge_blocks, and the remaining elements are merged with the result through the buffer
+
+        Parameters:
+            arr (list or memoryview): array containing the runs
+            low (int): start index of the left run
+            mid (int): start index of the right run
+            high (int): end index (exclusive) of the right run
+            buf (list or memoryview): the buffer
+
+        Returns:
+            None
+        """
+        block_size = len(buf)
+        if mid-low <= block_size:
+            self.__merge_fragment(arr, low, mid, high, buf, True)
+            return
+        if high-mid <= block_size:
+            self.__merge_fragment_high(arr, low, mid, high, buf)
+            return
+
+        blocks_low = low + (mid-low) % block_size
+        blocks_high = mid + (high-mid) // block_size * block_size
+        self.__merge_blocks(arr, blocks_low, mid, blocks_high, buf)
+        if low < blocks_low:
+            self.__merge_fragment(arr, low, blocks_low, blocks_high, buf, True)
+        if blocks_high < high:
+            self.__merge_fragment_high(arr, low, blocks_high, high, buf)
+
+
+    def __merge_blocks(self, arr: list, low: int, mid: int, high: int, buf: list):
+        """
+        Merges two adjacent runs of whole blocks of the buffer size in place. The blocks are put in the order of their
+        first elements, with blocks of the left run first on ties, by moving them along the cycles of the permutation
+        through the buffer. The ordered blocks are then merged from left to right: the fragment of a block that is
+        left over from the previous merge is merged with the next block if that block comes from the other run, and
+        is otherwise already in its final position, as no later block can hold a smaller element
+
+        Parameters:
+            arr (list or memoryview): array containing the runs
+            low (int): start index of the left run
+            mid (int): start index of the right run
+            high (int): end index (exclusive) of the right run
+            buf (list or memoryview): the buffer, whose size is the block size
+
+        Returns:
+            None
+        """
+        block_size = len(buf)
+
+        # merge the start indices of the blocks by the first element of every block
+        order = []
+        i = low
+        j = mid
+        while i < mid and j < high:
+            if arr[j] < arr[i]:
+                order.append(j)
+                j += block_size
+            else:
+                order.append(i)
+                i += block_size
+        order.extend(range(i, mid, block_size))
+        order.extend(range(j, high, block_size))
+        from_left = [start < mid for start in order]
+
+        # move the blocks to their positions along the cycles of the permutation
+        n_blocks = len(order)
+        placed = [False]*n_blocks
+        for p in range(n_blocks):
+            if placed[p] or order[p] == low + p*block_size:
+                continue
+            start = low + p*block_size
+            buf[:] = arr[start:start+block_size]
+            q = p
+            while True:
+                placed[q] = True
+                src = (order[q]-low) // block_size
+                dst_start = low + q*block_size
+                if src == p:
+                    arr[dst_start:dst_start+block_size] = buf
+                    break
+                arr[dst_start:dst_start+block_size] = arr[order[q]:order[q]+block_size]
+                q = src
+
+        # merge the leftover fragment of the previous merge with every block from the other run
+        frag_low = frag_high = low
+        frag_from_left = True
+        for p in range(n_blocks):
+            start = low + p*block_size
+            if frag_low == frag_high or from_left[p] == frag_from_left:
+                frag_low, frag_high, frag_from_left = start, start+block_size, from_left[p]
+            else:
+                frag_low, frag_from_left = self.__merge_fragment(arr, frag_low, start, start+block_size, buf,
+                                                                 frag_from_left)
+                frag_high = start+block_size
+
+
+    def __merge_fragment(self, arr: list, low: int, mid: int, high: int, buf: list, left_first: bool) -> tuple:
+        """
+        Merges the run arr[low:mid] of at most a buffer of elements with the run arr[mid:high] after it by moving the
+        first run to the buffer and merging forward, until either run is used up. The rest of the other run is then at
+        the end of arr[low:high]
+
+        Parameters:
+            arr (list or memoryview): array containing the runs
+            low (int): start index of the first run
+            mid (int): start index of the second run
+            high (int): end index (exclusive) of the second run
+            buf (list or memoryview): the buffer
+            left_first (bool): whether the first run comes from the left run, so it wins ties
+
+        Returns:
+            tuple: the start index of the rest of the run that was not used up, and whether it is the first run
+        """
+        n_frag = mid-low
+        buf[:n_frag] = arr[low:mid]
+        i = 0               # index for first run in buffer
+        j = mid             # index for second run
+        k = low             # index for merged run
+
+        if left_first:
+            while i < n_frag and j < high:
+                if arr[j] < buf[i]:
+                    arr[k] = arr[j]
+                    j += 1
+                else:
+                    arr[k] = buf[i]
+                    i += 1
+                k += 1
+        else:
+            while i < n_frag and j < high:
+                if buf[i] < arr[j]:
+                    arr[k] = buf[i]
+                    i += 1
+                else:
+                    arr[k] = arr[j]
+                    j += 1
+                k += 1
+
+        # the second run was used up, so the rest of the first run is moved back from the buffer
+        if i < n_frag:
+            arr[k:high] = buf[i:n_frag]
+            return k, left_first
+        return j, not left_first
+
+
+    def __merge_fragment_high(self, arr: list, low: int, mid: int, high: int, buf: list):
+        """
+        Merges the run arr[low:mid] with the run arr[mid:high] of at most a buffer of elements after it by moving the
+        second run to the buffer and merging backward from the end
+
+        Parameters:
+            arr (list or memoryview): array containing the runs
+            low (int): start index of the first run
+            mid (int): start index of the second run
+            high (int): end index (exclusive) of the second run
+            buf (list or memoryview): the buffer
+
+        Returns:
+            None
+        """
+        n_frag = high-mid
+        buf[:n_frag] = arr[mid:high]
+        i = n_frag-1        # index for second run in buffer
+        j = mid-1           # index for first run
+        k = high-1          # index for merged run
+
+        # elements of the first run only go after larger elements of the second run, which keeps the merge stable
+        while i >= 0 and j >= low:
+            if buf[i] < arr[j]:
+                arr[k] = arr[j]
+                j -= 1
+            else:
+                arr[k] = buf[i]
+                i -= 1
+            k -= 1
+        arr[k-i:k+1] = buf[:i+1]
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Merge sorting algorithm')
 
     parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
     parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-mode', help='merge sort variant', choices=MergeSort.MODES, default='top_down')
     args = parser.parse_args()
     
     n = args.data[0]
@@ -128,7 +927,7 @@ if __name__ == '__main__':
     sorted_data = list(range(n))
     random.seed(seed)
     random_data = random.sample(sorted_data, n)
-    sorting_algo = MergeSort()
+    sorting_algo = MergeSort(args.mode)
 
     # verify that list is sorted correctly
     if not sorting_algo.sort(random_data) == sorted_data:
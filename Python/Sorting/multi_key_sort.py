@@ -0,0 +1,180 @@
+import argparse
+import timeit
+from functools import partial
+import random
+import numpy as np
+from sorting import BaseSort
+from counting_sort import CountingSort
+from merge_sort import MergeSort
+from radix_sort import RadixSort
+
+
+class MultiKeySort():
+    """
+    A class used to encapsulate a columnar multi-key (lexicographic) sort, which orders the rows of a table stored as
+    parallel column arrays by several columns
+
+    Attributes
+    ----------
+    comparison_sort : BaseSort
+        stable algorithm sorting the columns that are not integers (default MergeSort)
+
+    Methods
+    -------
+    lexsort(columns, reverse=None)
+        Finds the permutation that sorts the rows of a table by its columns
+
+    __column_sort(values)
+        Chooses the stable algorithm that sorts a column
+
+    __directions(reverse, n_columns)
+        Finds the direction of every column
+
+    """
+    # integer columns are counting sorted if their range is at most this factor times the number of rows
+    COUNTING_RANGE_FACTOR = 4
+
+
+    def __init__(self, comparison_sort: BaseSort = None):
+        self.comparison_sort = comparison_sort or MergeSort()
+        self.__counting_sort = CountingSort()
+        self.__radix_sort = RadixSort()
+        self.__numpy_counting_sort = CountingSort('numpy')
+        self.__numpy_radix_sort = RadixSort(backend='numpy')
+        self.__numpy_float_radix_sort = RadixSort(dtype='float', backend='numpy')
+
+
+    def __repr__(self):
+        return "Multi-Key Sort"
+
+
+    def lexsort(self, columns: list, reverse=None):
+        """
+        Finds the permutation that sorts the rows of a table by its columns, where the first column is the primary
+        key, ties are broken by the second column and so on. The columns are sorted as successive stable passes
+        (LSD order), starting from the last column: every pass gathers the column in the current order of the rows
+        and reorders the rows by the stable permutation of the gathered column. Integer columns are sorted by counting
+        sort or radix sort, float ndarray columns by radix sort and other columns by the comparison sort, so no tuple
+        is built per row. Descending columns are sorted by stable descending permutations, so rows with equal keys
+        keep their order
+
+        Parameters:
+            columns (list): parallel column arrays (lists or ndarrays) of equal length
+            reverse (bool or list): whether every column, or each column, is sorted in descending order
+
+        Returns:
+            array or ndarray: the permutation of the rows, as an ndarray of np.intp if any column is an ndarray and
+                as an array('l') otherwise
+        """
+        if not columns:
+            raise ValueError('at least one column is required')
+        n = len(columns[0])
+        if any(len(column) != n for column in columns):
+            raise ValueError('all columns must have the same length')
+        directions = self.__directions(reverse, len(columns))
+
+        perm = None
+        for column, descending in zip(reversed(columns), reversed(directions)):
+            # the first pass sorts the column itself
+            if perm is None:
+                values = column
+            elif isinstance(column, np.ndarray):
+                values = column[perm]
+            else:
+                values = [column[i] for i in perm.tolist()]
+
+            algo, values = self.__column_sort(values)
+            order = np.asarray(algo.argsort(values, reverse=descending), dtype=np.intp)
+            perm = order if perm is None else perm[order]
+
+        return BaseSort._index_array(perm, next((c for c in columns if isinstance(c, np.ndarray)), columns[0]))
+
+
+    def __column_sort(self, values) -> BaseSort:
+        """
+        Chooses the stable algorithm that sorts a column: counting sort for integers of a small range, radix sort for
+        other integers and for float ndarrays, and the comparison sort for everything else. Float radix sort orders
+        negative zero before zero, so negative zeros are mapped to zero, which compares equal to them
+
+        Parameters:
+            values (list or ndarray): the column
+
+        Returns:
+            tuple: the algorithm and the values it sorts
+        """
+        if isinstance(values, np.ndarray) and values.size:
+            if values.dtype.kind == 'f':
+                return self.__numpy_float_radix_sort, values + 0.0
+            if values.dtype.kind in 'iu':
+                small_range = int(values.max()) - int(values.min()) < self.COUNTING_RANGE_FACTOR * values.size
+                return self.__numpy_counting_sort if small_range else self.__numpy_radix_sort, values
+            return self.comparison_sort, values
+
+        if len(values) == 0 or not all(type(x) is int for x in values):
+            return self.comparison_sort, values
+        small_range = max(values) - min(values) < self.COUNTING_RANGE_FACTOR * len(values)
+        return self.__counting_sort if small_range else self.__radix_sort, values
+
+
+    def __directions(self, reverse, n_columns: int) -> list:
+        """
+        Finds the direction of every column
+
+        Parameters:
+            reverse (bool or list): whether every column, or each column, is sorted in descending order
+            n_columns (int): number of columns
+
+        Returns:
+            list: whether each column is sorted in descending order
+        """
+        if reverse is None or isinstance(reverse, bool):
+            return [bool(reverse)] * n_columns
+        if len(reverse) != n_columns:
+            raise ValueError('expected a direction for each of the {} columns'.format(n_columns))
+        return [bool(descending) for descending in reverse]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Columnar multi-key sorting algorithm')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    args = parser.parse_args()
+
+    n = args.data[0]
+    seed = args.data[1]
+    t = args.t
+
+    # a table of (tenant_id, day, score) rows, sorted by tenant_id, day and descending score
+    random.seed(seed)
+    tenant_ids = [random.randrange(100) for _ in range(n)]
+    days = [random.randrange(19000, 20000) for _ in range(n)]
+    scores = [random.random() for _ in range(n)]
+    columns = [tenant_ids, days, scores]
+    reverse = [False, False, True]
+    sorting_algo = MultiKeySort()
+
+    # verify that the rows are sorted correctly
+    def tuple_sort():
+        return sorted(range(n), key=lambda i: (tenant_ids[i], days[i], -scores[i]))
+    if not list(sorting_algo.lexsort(columns, reverse)) == tuple_sort():
+        print('Error sorting table using <{}>'.format(sorting_algo))
+        exit(1)
+
+    # measure execution time
+    if args.t:
+        methods = {
+            'lexsort': partial(sorting_algo.lexsort, columns, reverse),
+            'tuple keys': tuple_sort,
+        }
+
+        print('Timing analysis')
+        print('Sorting method: {}'.format(sorting_algo))
+        print('Data length: {}'.format(n))
+        print('Executions: {}'.format(t[0]))
+        for name, method in methods.items():
+            times = timeit.Timer(method).repeat(t[1], t[0])
+
+            # average time taken
+            time_taken = min(times) / t[0]
+            print('Average time ({}): {}s'.format(name, time_taken))
@@ -1,10 +1,13 @@
 import argparse
+import math
 import os
 import timeit
 from functools import partial
 import random
 from itertools import accumulate
 from sorting import BaseSort
+from heap_sort import HeapSort
+from insertion_sort import InsertionSort
 
 
 class QuickSort(BaseSort):
@@ -13,39 +16,188 @@ class QuickSort(BaseSort):
 
     Attributes
     ----------
-    -
+    mode : str
+        the QuickSort variant to use:
+            'lomuto': recursive QuickSort using the last element as pivot (default)
+            'introsort': iterative introsort with median-of-three/ninther pivots, insertion sort of small partitions
+                and a heap sort fallback when the partitioning depth exceeds 2*log2(n)
+            'three_way': introsort using three-way (Dutch national flag) partitioning, which groups all elements
+                equal to the pivot and never partitions them again, so duplicate-heavy input is sorted in time
+                proportional to the number of distinct keys
 
     Methods
     -------
-    sort(arr, in_place=False)
+    sort(arr, in_place=False, key=None, reverse=False)
         Sorts an array using the QuickSort algorithm
 
+    select(arr, k)
+        Finds the k'th smallest element of an array using the introselect algorithm
+
+    nth_element(arr, k, in_place=False)
+        Rearranges an array such that the element at index k is the element that would be there if it was sorted
+
+    partial_sort(arr, k, in_place=False)
+        Rearranges an array such that its first k elements are the k smallest elements in ascending order
+
+    _argsort(values)
+        Finds a permutation of indices that sorts a list by an introsort of the indices
+
+    __quick_sort(arr, low, high)
+        Recursive implementation of the QuickSort algorithm
+
+    __partition(arr, low, high)
+        Partitions the input subarray and returns the index of the correctly placed partition
+
+    __introsort(arr, low, high)
+        Iterative introsort implementation of the QuickSort algorithm with guaranteed O(n log n) time and O(log n)
+        stack space
+
+    __argsort_introsort(values, perm)
+        Iterative introsort of a permutation of indices by the values they refer to
+
+    __introselect(arr, low, high, k, max_depth)
+        Iterative introselect implementation with guaranteed O(n) time
+
+    __median_of_medians(arr, low, high)
+        Finds an approximate median of the input subarray that guarantees a balanced partition
+
+    __select_pivot(arr, low, high)
+        Moves the median-of-three or ninther pivot of the input subarray to its first position
+
+    __hoare_partition(arr, low, high)
+        Partitions the input subarray around its first element and returns the index of the correctly placed pivot
+
+    __three_way_partition(arr, low, high)
+        Partitions the input subarray into elements smaller than, equal to and larger than its first element and
+        returns the bounds of the equal segment
 
     """
+    MODES = ('lomuto', 'introsort', 'three_way')
+
+    # partitions of this size or smaller are insertion sorted by introsort
+    INSERTION_CUTOFF = 16
+
+    # partitions larger than this use the ninther rather than the median-of-three as pivot
+    NINTHER_THRESHOLD = 40
+
+
+    def __init__(self, mode: str = 'lomuto'):
+        if mode not in self.MODES:
+            raise ValueError('unknown QuickSort mode: {}'.format(mode))
+        self.mode = mode
+        self.__insertion_sort = InsertionSort()
+        self.__heap_sort = HeapSort()
+
+
     def __repr__(self):
-        return "QuickSort"
+        if self.mode == 'lomuto':
+            return "QuickSort"
+        return "QuickSort ({})".format(self.mode)
 
 
-    def sort(self, arr: list, in_place=False) -> list:
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
         """
         Sorts an array using the QuickSort algorithm
 
         Parameters:
-            arr (list): list to be sorted
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) to be sorted
             in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
 
         Returns:
-            list: the sorted list
+            list or buffer: the sorted array, of the same type as arr, or a memoryview if arr is bytes
         """ 
-        if in_place:
-            work_arr = arr
+        if key is not None or reverse:
+            return self._keyed_sort(arr, in_place, key, reverse)
+
+        result, work_arr = self._work_array(arr, in_place)
+
+        if self.mode in ('introsort', 'three_way'):
+            self.__introsort(work_arr, 0, len(work_arr)-1)
         else:
-            work_arr = arr.copy()
+            # start the recursive QuickSort algorithm
+            self.__quick_sort(work_arr,0,len(work_arr)-1)
+
+        return result
+
+
+    def select(self, arr, k: int):
+        """
+        Finds the k'th smallest element (counting from 0) of an array in O(n) time using the introselect algorithm,
+        without modifying the array
+
+        Parameters:
+            arr (list or buffer): the array to search
+            k (int): rank of the element to find
+
+        Returns:
+            the k'th smallest element
+        """
+        return self.nth_element(arr, k)[k]
+
+
+    def nth_element(self, arr, k: int, in_place=False):
+        """
+        Rearranges an array such that the element at index k is the element that would be there if the array was
+        sorted, with no larger elements before it and no smaller elements after it. The array is partitioned as in
+        introsort, but only the side containing index k is partitioned further, so the work shrinks geometrically
 
-        # start the recursive QuickSort algorithm
-        self.__quick_sort(work_arr,0,len(work_arr)-1)
+        Parameters:
+            arr (list or buffer): the array to rearrange
+            k (int): index of the element to place correctly
+            in_place (bool): whether the array should be rearranged in place
 
-        return work_arr
+        Returns:
+            list or buffer: the rearranged array, of the same type as arr, or a memoryview if arr is bytes
+        """
+        result, work_arr = self._work_array(arr, in_place)
+        if not 0 <= k < len(work_arr):
+            raise IndexError('k is out of range for an array of length {}'.format(len(work_arr)))
+
+        self.__introselect(work_arr, 0, len(work_arr)-1, k, 2 * int(math.log2(len(work_arr))))
+        return result
+
+
+    def partial_sort(self, arr, k: int, in_place=False):
+        """
+        Rearranges an array such that its first k elements are the k smallest elements in ascending order, while the
+        order of the remaining elements is unspecified. The k smallest elements are selected by introselect and then
+        sorted by introsort, which takes O(n + k log k) time
+
+        Parameters:
+            arr (list or buffer): the array to rearrange
+            k (int): number of smallest elements to sort
+            in_place (bool): whether the array should be rearranged in place
+
+        Returns:
+            list or buffer: the rearranged array, of the same type as arr, or a memoryview if arr is bytes
+        """
+        result, work_arr = self._work_array(arr, in_place)
+        k = min(k, len(work_arr))
+        if k <= 0:
+            return result
+
+        # arr[:k] holds the k smallest elements once the element at index k-1 is placed correctly
+        self.__introselect(work_arr, 0, len(work_arr)-1, k-1, 2 * int(math.log2(len(work_arr))))
+        self.__introsort(work_arr, 0, k-2)
+        return result
+
+
+    def _argsort(self, values: list) -> list:
+        """
+        Finds a permutation of indices that sorts a list in ascending order by an introsort of the indices, which
+        compares the values the indices refer to. The permutation is not stable
+
+        Parameters:
+            values (list): the list to find the permutation of
+
+        Returns:
+            list: the permutation
+        """
+        perm = list(range(len(values)))
+        self.__argsort_introsort(values, perm)
+        return perm
 
 
     def __quick_sort(self, arr: list, low: int, high: int):
@@ -102,11 +254,315 @@ class QuickSort(BaseSort):
         return i+1
 
 
+    def __introsort(self, arr: list, low: int, high: int):
+        """
+        Iterative introsort implementation of the QuickSort algorithm. The smaller side of every partition is sorted
+        first while the larger side is deferred on an explicit stack, bounding the stack to O(log n) entries. Small
+        partitions are insertion sorted and partitions that exceed the depth limit of 2*log2(n) are heap sorted, which
+        guarantees O(n log n) time. In three-way mode the elements equal to the pivot are excluded from both sides
+
+        Parameters:
+            arr (list): list to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+
+        Returns:
+            None
+        """
+        if high <= low:
+            return
+
+        max_depth = 2 * int(math.log2(high-low+1))
+        stack = self._stack(arr, [(low, high, 0)])
+        while stack:
+            low, high, depth = stack.pop()
+
+            while high-low+1 > self.INSERTION_CUTOFF:
+                # partitioning degenerated, so the remainder of the subarray is heap sorted
+                if depth > max_depth:
+                    arr[low:high+1] = self.__heap_sort.sort(arr[low:high+1], in_place=True)
+                    break
+                depth += 1
+
+                # arr[lt:gt+1] holds the correctly placed pivot element(s)
+                self.__select_pivot(arr, low, high)
+                if self.mode == 'three_way':
+                    lt, gt = self.__three_way_partition(arr, low, high)
+                else:
+                    lt = gt = self.__hoare_partition(arr, low, high)
+
+                # defer the larger side and continue partitioning the smaller side
+                if lt-low < high-gt:
+                    stack.append((gt+1, high, depth))
+                    high = lt-1
+                else:
+                    stack.append((low, lt-1, depth))
+                    low = gt+1
+            else:
+                self.__insertion_sort.sort_range(arr, low, high)
+
+
+    def __argsort_introsort(self, values: list, perm: list):
+        """
+        Iterative introsort of a permutation of indices by the values they refer to. Every partition is split three
+        ways around the median-of-three value, the smaller side is sorted first while the larger side is deferred on
+        an explicit stack, small partitions are insertion sorted, and partitions that exceed the depth limit of
+        2*log2(n) are heap sorted by their values
+
+        Parameters:
+            values (list): the values the indices refer to
+            perm (list): permutation of indices to be sorted
+
+        Returns:
+            None
+        """
+        if len(perm) < 2:
+            return
+
+        max_depth = 2 * int(math.log2(len(perm)))
+        stack = [(0, len(perm)-1, 0)]
+        while stack:
+            low, high, depth = stack.pop()
+
+            while high-low+1 > self.INSERTION_CUTOFF:
+                # partitioning degenerated, so the remainder of the partition is heap sorted
+                if depth > max_depth:
+                    perm[low:high+1] = self.__heap_sort.sort(perm[low:high+1], key=values.__getitem__)
+                    break
+                depth += 1
+
+                a = values[perm[low]]
+                b = values[perm[(low+high)//2]]
+                c = values[perm[high]]
+                if a < b:
+                    pivot = b if b < c else c if a < c else a
+                else:
+                    pivot = a if a < c else c if b < c else b
+
+                # perm[lt:gt+1] refers to the values equal to the pivot
+                lt = low
+                i = low
+                gt = high
+                while i <= gt:
+                    x = values[perm[i]]
+                    if x < pivot:
+                        perm[lt], perm[i] = perm[i], perm[lt]
+                        lt += 1
+                        i += 1
+                    elif pivot < x:
+                        perm[i], perm[gt] = perm[gt], perm[i]
+                        gt -= 1
+                    else:
+                        i += 1
+
+                # defer the larger side and continue partitioning the smaller side
+                if lt-low < high-gt:
+                    stack.append((gt+1, high, depth))
+                    high = lt-1
+                else:
+                    stack.append((low, lt-1, depth))
+                    low = gt+1
+            else:
+                # insertion sort the partition, shifting the indices of larger values up
+                for i in range(low+1, high+1):
+                    idx = perm[i]
+                    x = values[idx]
+                    j = i
+                    while j > low and x < values[perm[j-1]]:
+                        perm[j] = perm[j-1]
+                        j -= 1
+                    perm[j] = idx
+
+
+    def __introselect(self, arr: list, low: int, high: int, k: int, max_depth: int):
+        """
+        Iterative introselect implementation, which places the element at index k correctly by three-way partitioning
+        the subarray and continuing with the side that contains index k until it is small enough to be insertion
+        sorted. When the partitioning depth exceeds max_depth, the pivots are selected by the median of medians, which
+        guarantees O(n) time
+
+        Parameters:
+            arr (list): list to be rearranged
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+            k (int): index of the element to place correctly
+            max_depth (int): partitioning depth after which the median of medians is used as pivot
+
+        Returns:
+            None
+        """
+        depth = 0
+        while high-low+1 > self.INSERTION_CUTOFF:
+            if depth > max_depth:
+                pivot_idx = self.__median_of_medians(arr, low, high)
+                arr[low], arr[pivot_idx] = arr[pivot_idx], arr[low]
+            else:
+                self.__select_pivot(arr, low, high)
+            depth += 1
+
+            # arr[lt:gt+1] holds the elements equal to the pivot, which are all correctly placed
+            lt, gt = self.__three_way_partition(arr, low, high)
+            if k < lt:
+                high = lt-1
+            elif k > gt:
+                low = gt+1
+            else:
+                return
+        self.__insertion_sort.sort_range(arr, low, high)
+
+
+    def __median_of_medians(self, arr: list, low: int, high: int) -> int:
+        """
+        Finds an approximate median of the input subarray, which is larger than and smaller than at least 30% of its
+        elements. The medians of groups of five elements are moved to the front of the subarray, and their median is
+        found recursively by introselect using the median of medians for every pivot
+
+        Parameters:
+            arr (list): list to be rearranged
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+
+        Returns:
+            int: index of the median of medians
+        """
+        m = low
+        for i in range(low, high+1, 5):
+            group_high = min(i+4, high)
+            self.__insertion_sort.sort_range(arr, i, group_high)
+            median = (i+group_high) // 2
+            arr[m], arr[median] = arr[median], arr[m]
+            m += 1
+
+        mid = (low+m-1) // 2
+        self.__introselect(arr, low, m-1, mid, -1)
+        return mid
+
+
+    def __select_pivot(self, arr: list, low: int, high: int):
+        """
+        Moves the median-of-three (or for large subarrays the ninther, i.e. the median of three medians-of-three) of the
+        input subarray to its first position, where it is used as pivot
+
+        Parameters:
+            arr (list): list to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+
+        Returns:
+            None
+        """
+        n = high-low+1
+        mid = low + n//2
+        if n > self.NINTHER_THRESHOLD:
+            step = n//8
+            m1 = self.__median_of_three(arr, low, low+step, low+2*step)
+            m2 = self.__median_of_three(arr, mid-step, mid, mid+step)
+            m3 = self.__median_of_three(arr, high-2*step, high-step, high)
+            pivot_idx = self.__median_of_three(arr, m1, m2, m3)
+        else:
+            pivot_idx = self.__median_of_three(arr, low, mid, high)
+        arr[low], arr[pivot_idx] = arr[pivot_idx], arr[low]
+
+
+    def __median_of_three(self, arr: list, a: int, b: int, c: int) -> int:
+        """
+        Finds the index of the median of three elements
+
+        Parameters:
+            arr (list): list containing the elements
+            a (int): index of first element
+            b (int): index of second element
+            c (int): index of third element
+
+        Returns:
+            int: index of the median element
+        """
+        if arr[a] < arr[b]:
+            if arr[b] < arr[c]:
+                return b
+            return c if arr[a] < arr[c] else a
+        if arr[a] < arr[c]:
+            return a
+        return c if arr[b] < arr[c] else b
+
+
+    def __hoare_partition(self, arr: list, low: int, high: int) -> int:
+        """
+        Partitions the input subarray around its first element using Hoare's scheme and returns the index of the
+        correctly placed pivot. Both scans stop at elements equal to the pivot, so duplicates are spread evenly across
+        both sides
+
+        Parameters:
+            arr (list): list to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+
+        Returns:
+            partition index
+        """
+        pivot = arr[low]
+        i = low                 # left scan index
+        j = high+1              # right scan index
+
+        while True:
+            # find an element on the left that is not smaller than the pivot
+            i += 1
+            while arr[i] < pivot and i < high:
+                i += 1
+
+            # find an element on the right that is not larger than the pivot (the pivot itself stops the scan)
+            j -= 1
+            while pivot < arr[j]:
+                j -= 1
+
+            if i >= j:
+                break
+            arr[i], arr[j] = arr[j], arr[i]
+
+        # j is the last position of the left side, which is where the pivot belongs
+        arr[low], arr[j] = arr[j], arr[low]
+        return j
+
+
+    def __three_way_partition(self, arr: list, low: int, high: int) -> tuple:
+        """
+        Partitions the input subarray around its first element into elements smaller than, equal to and larger than
+        the pivot (Dutch national flag partitioning) and returns the bounds of the segment equal to the pivot
+
+        Parameters:
+            arr (list): list to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+
+        Returns:
+            tuple: first and last index of the elements equal to the pivot
+        """
+        pivot = arr[low]
+        lt = low                # arr[low:lt] is smaller than the pivot
+        i = low+1               # arr[lt:i] is equal to the pivot
+        gt = high               # arr[gt+1:high+1] is larger than the pivot
+
+        # classify every element in arr[i:gt+1], which is yet to be examined
+        while i <= gt:
+            x = arr[i]
+            if x < pivot:
+                arr[lt], arr[i] = x, arr[lt]
+                lt += 1
+                i += 1
+            elif pivot < x:
+                arr[i], arr[gt] = arr[gt], x
+                gt -= 1
+            else:
+                i += 1
+        return lt, gt
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='QuickSort algorithm')
 
     parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
     parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-mode', help='QuickSort variant', choices=QuickSort.MODES, default='lomuto')
     args = parser.parse_args()
     
     n = args.data[0]
@@ -117,7 +573,7 @@ if __name__ == '__main__':
     sorted_data = list(range(n))
     random.seed(seed)
     random_data = random.sample(sorted_data, n)
-    sorting_algo = QuickSort()
+    sorting_algo = QuickSort(args.mode)
 
     # verify that list is sorted correctly
     if not sorting_algo.sort(random_data) == sorted_data:
@@ -4,93 +4,481 @@ import timeit
 from functools import partial
 import random
 from itertools import accumulate
+from array import array
+import numpy as np
 from sorting import BaseSort
 
 
 class RadixSort(BaseSort):
     """
-    A class used to encapsulate the Radix Sort algorithm
+    A class used to encapsulate the (LSD) Radix Sort algorithm
 
     Attributes
     ----------
-    -
+    radix : int
+        number of distinct digit values, which must be a power of 2 (default 256, i.e. sorting one byte per pass)
+    dtype : str
+        type of the elements to sort, either 'int' (default) or 'float' (IEEE-754 doubles, including negative numbers
+        and infinities)
+    backend : str
+        implementation to use, either 'python' (default) or 'numpy', which extracts the digits of 64-bit keys with
+        vectorized operations and moves the keys of every pass by the permutation of numpy's stable argsort of the
+        digits, and accepts and returns ndarrays. Sorting with a key function always uses the python implementation,
+        as the keys are computed by calling a Python function on every element
 
     Methods
     -------
-    sort(arr, in_place=False)
+    sort(arr, in_place=False, key=None, reverse=False)
         Sorts an array using the radix sort algorithm
 
-    __digit_counting_sort(arr, exp)
-        Counting sort implementation that sorts the array based on the element digit specified by exp
+    __keyed_sort(arr, in_place, key, reverse)
+        Stable radix sort of the elements by their precomputed keys
+
+    argsort(arr, reverse=False)
+        Finds the stable permutation of indices that sorts an array using the radix sort algorithm
+
+    _argsort(values)
+        Finds the stable permutation of indices that sorts a list of integers or floats
+
+    __key_order(keys, reverse)
+        Finds the stable permutation of indices that sorts a list of keys
+
+    __integer_keys(arr)
+        Maps integers to non-negative keys in the same order
+
+    __lsd_sort(keys, bits, start=0)
+        Sorts non-negative integer keys of at most the given number of bits one digit at a time
+
+    __float_keys(arr)
+        Maps doubles to unsigned 64-bit integer keys in the same order
+
+    __float_values(keys)
+        Maps unsigned 64-bit integer keys back to the doubles they were created from
+
+    __numpy_sort(arr)
+        Vectorized radix sort implementation using numpy
+
+    __numpy_argsort(arr, reverse)
+        Vectorized stable permutation of a radix sort using numpy
+
+    __numpy_keys(a)
+        Maps integers or floats to unsigned 64-bit keys in the same order
+
+    __numpy_argsort_lsd_sort(keys, perm=None)
+        Vectorized LSD sort of unsigned 64-bit keys by stable argsorts of their digits, permuting perm along with them
+
+    __digit_counting_sort(src, dst, count_arr, shift)
+        Counting sort implementation that sorts the array based on the element digit specified by shift
 
     """
+    DTYPES = ('int', 'float')
+    BACKENDS = ('python', 'numpy')
+    COMPARISON_SORT = False
+
+    # masks of the sign bit and of all bits of a 64-bit integer
+    SIGN_BIT_64 = 1 << 63
+    MASK_64 = (1 << 64) - 1
+
+
+    def __init__(self, radix: int = 256, dtype: str = 'int', backend: str = 'python'):
+        if radix < 2 or radix & (radix-1):
+            raise ValueError('radix must be a power of 2')
+        if dtype not in self.DTYPES:
+            raise ValueError('unknown radix sort dtype: {}'.format(dtype))
+        if backend not in self.BACKENDS:
+            raise ValueError('unknown radix sort backend: {}'.format(backend))
+        self.radix = radix
+        self.digit_bits = radix.bit_length()-1
+        self.dtype = dtype
+        self.backend = backend
+
+
     def __repr__(self):
-        return "Radix Sort"
+        options = [option for option, default in ((self.dtype, 'int'), (self.backend, 'python')) if option != default]
+        if not options:
+            return "Radix Sort"
+        return "Radix Sort ({})".format(', '.join(options))
 
 
-    def sort(self, arr: list, in_place=False) -> list:
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
         """
-        Sorts an array using the radix sort algorithm
+        Sorts an array of integers or floats using the radix sort algorithm. Digits are extracted with shifts and
+        masks, and negative integers are handled by flipping the sign bit of their two's complement representation,
+        which maps the integers to unsigned keys in the same order. Floats are likewise mapped to unsigned keys
+        through their IEEE-754 bit patterns
 
         Parameters:
             arr (list): list to be sorted
             in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the integer (or float) sort key of each element, which is called once
+                per element
+            reverse (bool): whether the list should be sorted in descending order
 
         Returns:
             list: the sorted list
         """ 
+        if key is not None:
+            return self.__keyed_sort(arr, in_place, key, reverse)
+
+        if self.backend == 'numpy':
+            work_arr = self.__numpy_sort(arr)
+            if reverse:
+                work_arr = work_arr[::-1]
+            if in_place:
+                arr[:] = work_arr
+                return arr
+            return work_arr
+
         if in_place:
             work_arr = arr
         else:
             work_arr = arr.copy()
-        
-        max_elmt = max(work_arr)    # max element is used for stopping criteria
 
-        # sort every digit until the largest element is reduced to a decimal (assuming array consists of integers only)
-        exp = 1  
-        while max_elmt/exp >= 1:
-            # counting sort is used for every digit
-            work_arr = self.__digit_counting_sort(work_arr, exp)
+        n = len(work_arr)
+        if n < 2:
+            return work_arr
+
+        if self.dtype == 'float':
+            work_arr[:] = self.__float_values(self.__lsd_sort(self.__float_keys(work_arr), 64))
+        else:
+            keys, bits, sign_bit = self.__integer_keys(work_arr)
+            src = self.__lsd_sort(keys, bits)
 
-            # digits are represented using exp = 10^i, where i is the i'th digit
-            exp *= 10
+            # map the sorted keys back to the elements
+            if sign_bit:
+                work_arr[:] = [x - (1 << bits) if x & sign_bit else x for x in (k ^ sign_bit for k in src)]
+            elif src is not work_arr:
+                work_arr[:] = src
 
+        if reverse:
+            work_arr.reverse()
         return work_arr
-    
 
-    def __digit_counting_sort(self, arr: list, exp: int) -> list:
+
+    def __keyed_sort(self, arr, in_place: bool, key, reverse: bool):
         """
-        Counting sort implementation that sorts the array based on the element digit specified by exp
+        Stable radix sort of the elements by their precomputed keys. The permutation that sorts the keys is found by
+        radix sorting the keys combined with their indices, and the elements are gathered through it
 
         Parameters:
-            arr (list): list to be sorted
-            exp (int): specifies the digit to sort by (exp=10^i for digit i)
+            arr (list or buffer): the array to be sorted
+            in_place (bool): whether the array should be sorted in place
+            key (callable): function computing the sort key of each element
+            reverse (bool): whether the array should be sorted in descending order
 
         Returns:
-            list: the list sorted by the digit specified by exp
-        """ 
-        n = len(arr)
-        work_arr = [None]*n
+            list or buffer: the sorted array
+        """
+        result, work_arr = self._work_array(arr, in_place)
+        n = len(work_arr)
+        if n < 2:
+            return result
+
+        items = [work_arr[i] for i in self.__key_order([key(x) for x in work_arr], reverse)]
+        if isinstance(work_arr, list):
+            work_arr[:] = items
+        else:
+            for i, x in enumerate(items):
+                work_arr[i] = x
+        return result
+
+
+    def argsort(self, arr, reverse=False):
+        """
+        Finds the stable permutation of indices that sorts an array of integers or floats using the radix sort
+        algorithm
+
+        Parameters:
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) of integers or floats
+            reverse (bool): whether the permutation should sort the array in descending order
+
+        Returns:
+            array or ndarray: the permutation, as an ndarray of np.intp if arr is an ndarray and as an array('l')
+                otherwise
+        """
+        if self.backend == 'numpy':
+            return self._index_array(self.__numpy_argsort(arr, reverse), arr)
+        return super().argsort(arr, reverse)
+
+
+    def _argsort(self, values: list) -> list:
+        """
+        Finds the stable permutation of indices that sorts a list of integers or floats in ascending order
+
+        Parameters:
+            values (list): integers or floats to find the permutation of
+
+        Returns:
+            list: the permutation
+        """
+        return self.__key_order(values, False)
+
+
+    def __key_order(self, keys: list, reverse: bool) -> list:
+        """
+        Finds the stable permutation of indices that sorts a list of keys. Every key is mapped to an unsigned key and
+        combined with its index in the low bits, so a single list of integers is sorted and the indices are masked out
+        of the sorted combined keys. As the combined keys start out ordered by index, the passes over the index bits
+        are skipped and equal keys keep their relative order. For a descending order the unsigned keys are subtracted
+        from the largest key of their width
+
+        Parameters:
+            keys (list): integer (or float) keys
+            reverse (bool): whether the permutation should sort the keys in descending order
+
+        Returns:
+            list: the permutation
+        """
+        n = len(keys)
+        if n < 2:
+            return list(range(n))
+
+        if self.dtype == 'float':
+            keys = self.__float_keys(keys)
+            bits = 64
+        else:
+            keys, bits, _ = self.__integer_keys(keys)
+        if reverse:
+            largest = (1 << bits) - 1
+            keys = [largest - k for k in keys]
+
+        index_bits = (n-1).bit_length()
+        index_mask = (1 << index_bits) - 1
+        src = self.__lsd_sort([k << index_bits | i for i, k in enumerate(keys)], bits + index_bits, index_bits)
+        return [k & index_mask for k in src]
+
+
+    def __integer_keys(self, arr: list) -> tuple:
+        """
+        Maps integers to non-negative keys in the same order. If there are negative integers, the keys are their two's
+        complement representations with the sign bit flipped, using the fewest bits that represent every integer
+
+        Parameters:
+            arr (list): list of integers
+
+        Returns:
+            tuple: the keys (arr itself if there are no negative integers), the number of bits of the largest key and
+                the flipped sign bit (0 if there are no negative integers)
+        """
+        min_elmt = min(arr)
+        max_elmt = max(arr)
+
+        if min_elmt < 0:
+            bits = max(min_elmt.bit_length(), max_elmt.bit_length()) + 1
+            sign_bit = 1 << (bits-1)
+            mask = (1 << bits) - 1
+            return [(x & mask) ^ sign_bit for x in arr], bits, sign_bit
+        return arr, max_elmt.bit_length(), 0
+
+
+    def __lsd_sort(self, keys: list, bits: int, start: int = 0) -> list:
+        """
+        Sorts non-negative integer keys of at most the given number of bits one digit at a time, starting from the
+        least significant digit. The passes alternate between the keys and a single output list and reuse one
+        counting array. Passes over the bits below start are skipped, as the keys are already ordered by them
+
+        Parameters:
+            keys (list): non-negative integer keys, which are overwritten
+            bits (int): number of bits of the largest key
+            start (int): number of low bits the keys are already ordered by
+
+        Returns:
+            list: the sorted keys, which is either the keys list or the output list
+        """
+        src = keys
+        dst = [0]*len(keys)
+        count_arr = [0]*self.radix
+        for shift in range(start, bits, self.digit_bits):
+            if self.__digit_counting_sort(src, dst, count_arr, shift):
+                src, dst = dst, src
+        return src
+
+
+    def __float_keys(self, arr: list) -> list:
+        """
+        Maps doubles to unsigned 64-bit integer keys in the same order. The bit pattern of a non-negative double is
+        ordered like an unsigned integer once the sign bit is set, while all bits of a negative double are inverted
+        to reverse the order of its magnitude. Negative zero is ordered before zero, and NaNs are ordered after
+        infinity (or before negative infinity if their sign bit is set)
+
+        Parameters:
+            arr (list): list of floats
+
+        Returns:
+            list: the integer keys
+        """
+        bit_patterns = array('Q', array('d', arr).tobytes())
+        return [x ^ self.MASK_64 if x & self.SIGN_BIT_64 else x | self.SIGN_BIT_64 for x in bit_patterns]
+
+
+    def __float_values(self, keys: list) -> list:
+        """
+        Maps unsigned 64-bit integer keys back to the doubles they were created from by __float_keys
+
+        Parameters:
+            keys (list): integer keys
+
+        Returns:
+            list: the floats
+        """
+        bit_patterns = array('Q', [x ^ self.SIGN_BIT_64 if x & self.SIGN_BIT_64 else x ^ self.MASK_64 for x in keys])
+        return array('d', bit_patterns.tobytes()).tolist()
+
+
+    def __numpy_sort(self, arr):
+        """
+        Vectorized radix sort implementation. The elements are mapped to order-preserving unsigned 64-bit keys as in
+        the python backend, and the keys are moved in every pass by gathering them through the permutation of a stable
+        sort of the digits, which numpy performs as a counting sort for 8 and 16-bit digits
+
+        Parameters:
+            arr (list or ndarray): integers or floats to be sorted
+
+        Returns:
+            list or ndarray: the sorted elements, as an ndarray if arr is an ndarray and as a list otherwise
+        """
+        a = np.asarray(arr)
+        if a.size == 0:
+            return a.copy() if isinstance(arr, np.ndarray) else []
+
+        keys, _ = self.__numpy_argsort_lsd_sort(self.__numpy_keys(a))
+
+        # map the sorted keys back to the elements
+        if self.dtype == 'float':
+            work_arr = np.where(keys >> np.uint64(63), keys ^ np.uint64(self.SIGN_BIT_64), ~keys).view(np.float64)
+        elif a.dtype.kind == 'i':
+            work_arr = (keys ^ np.uint64(self.SIGN_BIT_64)).view(np.int64)
+        else:
+            work_arr = keys
+        work_arr = work_arr.astype(a.dtype, copy=False)
+
+        if isinstance(arr, np.ndarray):
+            return work_arr
+        return work_arr.tolist()
+
+
+    def __numpy_argsort(self, arr, reverse: bool):
+        """
+        Vectorized stable permutation of a radix sort. The permutation is gathered along with the keys in every pass,
+        and for a descending order all bits of the keys are inverted, which reverses their order but keeps equal keys
+        in their relative order
 
-        # initialize counting array (assuming base 10)
-        count_arr = [0]*10
+        Parameters:
+            arr (list or ndarray): integers or floats to find the permutation of
+            reverse (bool): whether the permutation should sort the array in descending order
+
+        Returns:
+            ndarray: the permutation
+        """
+        a = np.asarray(arr).ravel()
+        if a.size == 0:
+            return np.empty(0, dtype=np.intp)
+
+        keys = self.__numpy_keys(a)
+        if reverse:
+            keys = ~keys
+        _, perm = self.__numpy_argsort_lsd_sort(keys, np.arange(a.size))
+        return perm
+
+
+    def __numpy_keys(self, a: np.ndarray) -> np.ndarray:
+        """
+        Maps integers or floats to unsigned 64-bit keys in the same order, as in the python backend
+
+        Parameters:
+            a (ndarray): integers or floats
+
+        Returns:
+            ndarray: the keys
+        """
+        if self.dtype == 'float':
+            bits = a.astype(np.float64, copy=False).view(np.uint64)
+            return np.where(bits >> np.uint64(63), ~bits, bits | np.uint64(self.SIGN_BIT_64))
+        if a.dtype.kind == 'u':
+            return a.astype(np.uint64)
+        if a.dtype.kind == 'i':
+            return a.astype(np.int64).view(np.uint64) ^ np.uint64(self.SIGN_BIT_64)
+        raise TypeError('{} only sorts 64-bit integers with the numpy backend'.format(self))
+
+
+    def __numpy_argsort_lsd_sort(self, keys: np.ndarray, perm: np.ndarray = None) -> tuple:
+        """
+        Sorts unsigned 64-bit keys one digit at a time, starting from the least significant digit. Every pass
+        extracts the digits of all keys at once with vectorized shifts and masks, and gathers the keys through the
+        permutation of np.argsort(kind='stable') of the digits. For digits of at most 16 bits numpy performs this
+        argsort as a radix sort, which counts the digits and scatters the indices in C, so it stands in for the
+        counting sort of the python backend: scattering through np.cumsum offsets of the np.bincount counts would need
+        the rank of every key among the keys with the same digit, which cannot be found with vectorized operations
+        without sorting the digits. Larger digits are argsorted by numpy's merge sort. The digits are still counted
+        with np.bincount to skip passes in which all digits are equal
+
+        Parameters:
+            keys (ndarray): unsigned 64-bit keys
+            perm (ndarray): optional array that is permuted along with the keys
+
+        Returns:
+            tuple: the sorted keys and the permuted perm
+        """
+        if keys.size < 2:
+            return keys, perm
+
+        # only bits below the highest bit in which any two keys differ affect the order
+        bits = int(keys.max() ^ keys.min()).bit_length()
+        mask = np.uint64(self.radix-1)
+        digit_type = np.uint8 if self.digit_bits <= 8 else np.uint16 if self.digit_bits <= 16 else np.intp
+
+        for shift in range(0, bits, self.digit_bits):
+            digits = ((keys >> np.uint64(shift)) & mask).astype(digit_type)
+
+            # all keys have the same digit
+            if np.bincount(digits, minlength=self.radix).max() == keys.size:
+                continue
+            order = np.argsort(digits, kind='stable')
+            keys = keys[order]
+            if perm is not None:
+                perm = perm[order]
+        return keys, perm
+
+
+    def __digit_counting_sort(self, src: list, dst: list, count_arr: list, shift: int) -> bool:
+        """
+        Counting sort implementation that sorts the array based on the element digit specified by shift. The pass is
+        skipped if every element has the same digit, as it would not change the order of the elements
+
+        Parameters:
+            src (list): list to be sorted
+            dst (list): list the sorted elements are written to
+            count_arr (list): counting array of length radix, which is reset by this method
+            shift (int): specifies the digit to sort by (the digit is (x >> shift) & (radix-1))
+
+        Returns:
+            bool: whether the sorted elements were written to dst
+        """ 
+        mask = self.radix-1
+        for i in range(self.radix):
+            count_arr[i] = 0
 
         # count occurrences of each element digit in array
-        for x in arr:
-            # find digit index
-            digit_index = int((x / exp) % 10)
-            count_arr[digit_index] += 1
+        for x in src:
+            count_arr[(x >> shift) & mask] += 1
+
+        # all elements have the same digit
+        if count_arr[(src[0] >> shift) & mask] == len(src):
+            return False
 
-        # do an accumulative sun of the elements digit occurences in the counting array
-        count_arr = list(accumulate(count_arr))
+        # do an accumulative sum of the elements digit occurences in the counting array
+        total = 0
+        for i in range(self.radix):
+            total += count_arr[i]
+            count_arr[i] = total
 
         # iterate array elements in reverse and place in sorted array based on occurences in counting array
         # reverse iteration ensures that in the case of equality, the elements occuring first in the unsorted array will occur first in the sorted array
-        for x in arr[::-1]:
-            digit_index = int((x / exp) % 10)
-            work_arr[count_arr[digit_index]-1] = x
+        for x in reversed(src):
+            digit_index = (x >> shift) & mask
             count_arr[digit_index] -= 1
-        return work_arr
+            dst[count_arr[digit_index]] = x
+        return True
 
 
 if __name__ == '__main__':
@@ -98,6 +486,9 @@ if __name__ == '__main__':
 
     parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
     parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-radix', help='number of distinct digit values (power of 2)', type=int, default=256)
+    parser.add_argument('-dtype', help='type of the elements to sort', choices=RadixSort.DTYPES, default='int')
+    parser.add_argument('-backend', help='implementation to use', choices=RadixSort.BACKENDS, default='python')
     args = parser.parse_args()
     
     n = args.data[0]
@@ -108,7 +499,12 @@ if __name__ == '__main__':
     sorted_data = list(range(n))
     random.seed(seed)
     random_data = random.sample(sorted_data, n)
-    sorting_algo = RadixSort()
+    sorting_algo = RadixSort(args.radix, args.dtype, args.backend)
+
+    # floats are centered around zero to include negative numbers
+    if args.dtype == 'float':
+        sorted_data = [x - n/2 for x in sorted_data]
+        random_data = [x - n/2 for x in random_data]
 
     # verify that list is sorted correctly
     if not sorting_algo.sort(random_data) == sorted_data:
@@ -0,0 +1,338 @@
+import argparse
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import timeit
+from collections import Counter
+from functools import partial
+import random
+
+
+class RecordSort():
+    """
+    A class used to encapsulate an in-place MSD radix sort (American flag sort) of files of fixed-width records
+
+    Attributes
+    ----------
+    record_format : str
+        struct format string describing the layout of a record, e.g. '<Q24s' for a little-endian unsigned 64-bit
+        key followed by a 24 byte payload
+    key_field : int
+        index of the field of the record (as returned by struct.unpack) that the records are sorted by, which must be
+        an integer or a byte string
+    record_size : int
+        size of a record in bytes
+
+    Methods
+    -------
+    sort_file(path)
+        Sorts the records of a file in place through a memory map
+
+    sort_buffer(buf)
+        Sorts the records stored in a writable buffer in place
+
+    __key_layout(record_format, key_field)
+        Finds the position of every byte of the key field in the record, from the most significant byte
+
+    __american_flag_sort(view, n)
+        Iterative in-place MSD radix sort of the records one key byte at a time
+
+    __insertion_sort(view, low, high, d, tmp)
+        Insertion sorts the records of a small bucket by their key bytes from byte d
+
+    __less(a, a_offset, b, b_offset, d)
+        Compares the keys of two records from key byte d
+
+    """
+    # buckets of this many records or fewer are insertion sorted
+    INSERTION_CUTOFF = 32
+
+    # struct format codes of the supported key fields
+    SIGNED_CODES = 'bhilqn'
+    UNSIGNED_CODES = 'BHILQN?c'
+    BYTES_CODES = 's'
+
+
+    def __init__(self, record_format: str, key_field: int = 0):
+        self.record_format = record_format
+        self.key_field = key_field
+        self.record_size = struct.calcsize(record_format)
+        self.key_positions, self.signed = self.__key_layout(record_format, key_field)
+
+
+    def __repr__(self):
+        return 'Record Sort ({}, key field {})'.format(self.record_format, self.key_field)
+
+
+    def sort_file(self, path: str):
+        """
+        Sorts the records of a file in place through a memory map, so the file is never copied and only the pages
+        being worked on need to be in memory
+
+        Parameters:
+            path (str): path of the file to be sorted
+
+        Returns:
+            None
+        """
+        size = os.path.getsize(path)
+        if size % self.record_size:
+            raise ValueError('file size {} is not a multiple of the record size {}'.format(size, self.record_size))
+        if size == 0:
+            return
+
+        with open(path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mm:
+            self.sort_buffer(mm)
+            mm.flush()
+
+
+    def sort_buffer(self, buf):
+        """
+        Sorts the records stored in a writable buffer (bytearray, mmap, ...) in place. The records are distributed into
+        256 buckets by their most significant key byte, and every bucket is recursively sorted by the next key byte.
+        Key bytes are read straight from the buffer and whole records are moved through a single scratch buffer, so
+        no Python objects are kept per record
+
+        Parameters:
+            buf (buffer): writable buffer holding the packed records
+
+        Returns:
+            None
+        """
+        with memoryview(buf) as view, view.cast('B') as view:
+            if view.readonly:
+                raise TypeError('cannot sort a read-only buffer in place')
+            if view.nbytes % self.record_size:
+                raise ValueError('buffer size {} is not a multiple of the record size {}'.format(view.nbytes,
+                                                                                               self.record_size))
+            self.__american_flag_sort(view, view.nbytes // self.record_size)
+
+
+    def __key_layout(self, record_format: str, key_field: int) -> tuple:
+        """
+        Finds the position of every byte of the key field in the record, from the most significant byte, by parsing
+        the struct format string. The offset of the key field includes any alignment padding before it
+
+        Parameters:
+            record_format (str): struct format string describing the layout of a record
+            key_field (int): index of the key field
+
+        Returns:
+            tuple: list of byte positions of the key and whether the key is a signed integer
+        """
+        byte_order = record_format[:1] if record_format[:1] in '@=<>!' else '@'
+        fields = re.findall(r'(\d*)([xcbB?hHiIlLqQnNefdspP])', record_format)
+
+        # each code with a repeat count is that many fields, except for pad bytes and byte strings
+        prefix = ''
+        index = 0
+        for count, code in fields:
+            repeat = 1 if code in 'sp' else 0 if code == 'x' else int(count or 1)
+            if index + repeat > key_field:
+                break
+            prefix += count + code
+            index += repeat
+        else:
+            raise ValueError('record format {} has no field {}'.format(record_format, key_field))
+
+        if code in self.BYTES_CODES:
+            width = int(count or 1)
+        elif code in self.SIGNED_CODES + self.UNSIGNED_CODES:
+            width = struct.calcsize(byte_order + code)
+            prefix += str(key_field - index) + code
+        else:
+            raise ValueError('records can only be sorted by integer or byte string fields, not {}'.format(code))
+
+        # a zero repeat count aligns the offset to the key type without adding a field
+        offset = struct.calcsize(byte_order + prefix + '0' + code)
+        little_endian = byte_order == '<' or (byte_order in '@=' and sys.byteorder == 'little')
+        if code in self.BYTES_CODES or not little_endian:
+            positions = list(range(offset, offset+width))
+        else:
+            positions = list(range(offset+width-1, offset-1, -1))
+        return positions, code in self.SIGNED_CODES
+
+
+    def __american_flag_sort(self, view: memoryview, n: int):
+        """
+        Iterative in-place MSD radix sort of the records one key byte at a time (American flag sort). The key bytes of
+        a bucket are counted from a strided slice of the buffer, and the records are permuted into their sub-buckets
+        by swapping every misplaced record directly into the next free slot of its sub-bucket. The sign bit of the
+        most significant byte of signed keys is flipped, which orders negative keys first
+
+        Parameters:
+            view (memoryview): byte view of the records
+            n (int): number of records
+
+        Returns:
+            None
+        """
+        rs = self.record_size
+        positions = self.key_positions
+        tmp = bytearray(rs)
+
+        stack = [(0, n, 0)]
+        while stack:
+            low, high, d = stack.pop()
+            if high-low <= self.INSERTION_CUTOFF:
+                self.__insertion_sort(view, low, high, d, tmp)
+                continue
+
+            pos = positions[d]
+            flip = 0x80 if d == 0 and self.signed else 0
+
+            # count the occurrences of every key byte and find the bounds of each sub-bucket
+            counts = Counter(view[low*rs+pos:high*rs:rs])
+            heads = [0]*256
+            tails = [0]*256
+            total = low
+            for b in range(256):
+                heads[b] = total
+                total += counts.get(b ^ flip, 0)
+                tails[b] = total
+
+            # move every record into its sub-bucket, keeping the record in the current slot once it belongs there
+            for b in range(256):
+                i = heads[b]
+                while i < tails[b]:
+                    target = view[i*rs+pos] ^ flip
+                    if target == b:
+                        i += 1
+                        continue
+                    j = heads[target]
+                    heads[target] += 1
+                    tmp[:] = view[j*rs:(j+1)*rs]
+                    view[j*rs:(j+1)*rs] = view[i*rs:(i+1)*rs]
+                    view[i*rs:(i+1)*rs] = tmp
+                heads[b] = i
+
+            # sort the sub-buckets by the next key byte
+            if d+1 < len(positions):
+                start = low
+                for b in range(256):
+                    if tails[b]-start > 1:
+                        stack.append((start, tails[b], d+1))
+                    start = tails[b]
+
+
+    def __insertion_sort(self, view: memoryview, low: int, high: int, d: int, tmp: bytearray):
+        """
+        Insertion sorts the records of a small bucket by their key bytes from byte d. Every record is held in the
+        scratch buffer while the larger records before it are shifted one slot up with a single move
+
+        Parameters:
+            view (memoryview): byte view of the records
+            low (int): index of the first record of the bucket
+            high (int): index after the last record of the bucket
+            d (int): index of the first key byte that may differ within the bucket
+            tmp (bytearray): scratch buffer of one record
+
+        Returns:
+            None
+        """
+        rs = self.record_size
+        for i in range(low+1, high):
+            j = i
+            while j > low and self.__less(view, i*rs, view, (j-1)*rs, d):
+                j -= 1
+            if j < i:
+                tmp[:] = view[i*rs:(i+1)*rs]
+                view[(j+1)*rs:(i+1)*rs] = view[j*rs:i*rs]
+                view[j*rs:(j+1)*rs] = tmp
+
+
+    def __less(self, a, a_offset: int, b, b_offset: int, d: int) -> bool:
+        """
+        Compares the keys of two records from key byte d, which is allocation free as single bytes are read as cached
+        small integers
+
+        Parameters:
+            a (buffer): buffer holding the first record
+            a_offset (int): offset of the first record in a
+            b (buffer): buffer holding the second record
+            b_offset (int): offset of the second record in b
+            d (int): index of the first key byte to compare
+
+        Returns:
+            bool: whether the key of the first record is smaller than the key of the second record
+        """
+        positions = self.key_positions
+        for k in range(d, len(positions)):
+            p = positions[k]
+            x = a[a_offset+p]
+            y = b[b_offset+p]
+            if x != y:
+                if k == 0 and self.signed:
+                    return x ^ 0x80 < y ^ 0x80
+                return x < y
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='In-place radix sorting of fixed-width record files')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-i', help='path of the file to be sorted in place (random data is generated if omitted)',
+                        required=False)
+    parser.add_argument('-format', help='struct format of a record', default='<Q24s')
+    parser.add_argument('-key_field', help='index of the key field of a record', type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.i and not args.data:
+        parser.error('either -i or -data is required')
+
+    sorting_algo = RecordSort(args.format, args.key_field)
+    work_dir = tempfile.mkdtemp(prefix='record_sort_cli_')
+
+    try:
+        if args.i:
+            sorting_algo.sort_file(args.i)
+            input_path = args.i
+        else:
+            n = args.data[0]
+            seed = args.data[1]
+
+            # write records of random 64-bit keys and payloads
+            random.seed(seed)
+            record = struct.Struct(args.format)
+            keys = [random.getrandbits(64) for _ in range(n)]
+            data = b''.join(record.pack(key, key.to_bytes(8, 'big') * 3) for key in keys)
+            input_path = os.path.join(work_dir, 'records')
+            with open(input_path, 'wb') as f:
+                f.write(data)
+
+            # verify that file is sorted correctly
+            sorting_algo.sort_file(input_path)
+            with open(input_path, 'rb') as f:
+                if not [r[0] for r in record.iter_unpack(f.read())] == sorted(keys):
+                    print('Error sorting file using <{}>'.format(sorting_algo))
+                    exit(1)
+
+        # measure execution time, rewriting the unsorted data before every execution
+        if args.t:
+            t = args.t
+            if not args.i:
+                def rewrite_and_sort():
+                    with open(input_path, 'wb') as f:
+                        f.write(data)
+                    sorting_algo.sort_file(input_path)
+                method = rewrite_and_sort
+            else:
+                method = partial(sorting_algo.sort_file, input_path)
+            times = timeit.Timer(method).repeat(t[1], t[0])
+
+            # average time taken
+            time_taken = min(times) / t[0]
+
+            print('Timing analysis')
+            print('Sorting method: {}'.format(sorting_algo))
+            print('File size: {} bytes'.format(os.path.getsize(input_path)))
+            print('Executions: {}'.format(t[0]))
+            print('Average time: {}s'.format(time_taken))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
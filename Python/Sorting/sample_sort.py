@@ -0,0 +1,278 @@
+import argparse
+import os
+import timeit
+from functools import partial
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from sorting import BaseSort
+from quick_sort import QuickSort
+
+
+# signed 64-bit integer range that can be stored in shared memory
+INT64_MIN = -2**63
+INT64_MAX = 2**63-1
+
+
+def _sort_shared_bucket(shm_name: str, typecode: str, start: int, stop: int, local_sort: BaseSort):
+    """
+    Sorts the bucket stored at [start:stop] of a shared memory array in place through a memoryview of the bucket, so
+    the elements are never copied out of shared memory. Executed in a worker process
+
+    Parameters:
+        shm_name (str): name of the shared memory block holding the partitioned data
+        typecode (str): array typecode of the data ('q' or 'd')
+        start (int): index of the first element of the bucket
+        stop (int): index after the last element of the bucket
+        local_sort (BaseSort): algorithm used to sort the bucket
+
+    Returns:
+        None
+    """
+    # worker processes share the resource tracker of the creating process, which unlinks the block when done
+    shm = shared_memory.SharedMemory(name=shm_name)
+    view = shm.buf.cast(typecode)
+    try:
+        local_sort.sort(view[start:stop], in_place=True)
+    finally:
+        view.release()
+        shm.close()
+
+
+def _sort_bucket(bucket: list, local_sort: BaseSort) -> list:
+    """
+    Sorts a bucket which is transferred to and from the worker process by pickling. Executed in a worker process
+
+    Parameters:
+        bucket (list): the bucket to be sorted
+        local_sort (BaseSort): algorithm used to sort the bucket
+
+    Returns:
+        list: the sorted bucket
+    """
+    return local_sort.sort(bucket)
+
+
+class SampleSort(BaseSort):
+    """
+    A class used to encapsulate the parallel Sample Sort algorithm
+
+    Attributes
+    ----------
+    workers : int
+        number of worker processes (defaults to the number of CPUs)
+    local_sort : BaseSort
+        algorithm used by the workers to sort each bucket (defaults to introsort)
+    oversampling : int
+        number of sampled elements per worker used to select the splitters
+    min_parallel_size : int
+        arrays shorter than this are sorted by local_sort in the calling process, as the cost of starting
+        worker processes outweighs the gain
+    seed : int
+        seed of the private random number generator that samples the splitters (defaults to a random seed), so
+        sorting never touches the state of the global random module
+
+    Methods
+    -------
+    sort(arr, in_place=False, key=None, reverse=False)
+        Sorts an array using the parallel sample sort algorithm
+
+    __select_splitters(arr)
+        Selects the splitters dividing the elements into buckets from a random sample of the array
+
+    __partition(arr, splitters, typecode)
+        Distributes the elements of the array into buckets bounded by the splitters
+
+    __numeric_typecode(arr)
+        Finds the array typecode that can represent every element of the array in shared memory
+
+    __sort_shared(buckets, typecode, executor)
+        Sorts the buckets in the worker processes with the data stored in shared memory
+
+    """
+    def __init__(self, workers: int = None, local_sort: BaseSort = None, oversampling: int = 32,
+                 min_parallel_size: int = 100000, seed: int = None):
+        self.workers = workers or os.cpu_count()
+        self.local_sort = local_sort or QuickSort('introsort')
+        self.oversampling = oversampling
+        self.min_parallel_size = min_parallel_size
+        self.seed = seed
+
+
+    def __repr__(self):
+        return "Sample Sort ({} workers, {})".format(self.workers, self.local_sort)
+
+
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
+        """
+        Sorts an array using the parallel sample sort algorithm. Splitters are selected from a random sample, the
+        elements are partitioned into one bucket per worker and the buckets are sorted in parallel by worker processes
+        before being concatenated. Integers and floats are exchanged with the workers through shared memory, while
+        other elements are pickled
+
+        Parameters:
+            arr (list): list to be sorted
+            in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
+
+        Returns:
+            list: the sorted list
+        """
+        if key is not None or reverse:
+            return self._keyed_sort(arr, in_place, key, reverse)
+
+        n = len(arr)
+        if n < max(self.min_parallel_size, 2) or self.workers < 2:
+            return self.local_sort.sort(arr, in_place)
+
+        typecode = self.__numeric_typecode(arr)
+        buckets = self.__partition(arr, self.__select_splitters(arr), typecode)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            if typecode:
+                work_arr = self.__sort_shared(buckets, typecode, executor)
+            else:
+                work_arr = []
+                for bucket in executor.map(_sort_bucket, buckets, [self.local_sort]*len(buckets)):
+                    work_arr.extend(bucket)
+
+        if in_place:
+            arr[:] = work_arr
+            return arr
+        return work_arr
+
+
+    def __select_splitters(self, arr: list) -> list:
+        """
+        Selects the splitters dividing the elements into buckets from a random sample of the array, which is drawn
+        by a private random number generator seeded with the seed attribute
+
+        Parameters:
+            arr (list): list to be sorted
+
+        Returns:
+            list: sorted list of at most workers-1 distinct splitters
+        """
+        sample_size = min(len(arr), self.workers * self.oversampling)
+        sample = self.local_sort.sort(random.Random(self.seed).sample(arr, sample_size))
+
+        # pick evenly spaced elements of the sorted sample, discarding duplicates to avoid empty buckets
+        splitters = []
+        for i in range(1, self.workers):
+            splitter = sample[i * sample_size // self.workers]
+            if not splitters or splitters[-1] < splitter:
+                splitters.append(splitter)
+        return splitters
+
+
+    def __partition(self, arr: list, splitters: list, typecode: str) -> list:
+        """
+        Distributes the elements of the array into buckets bounded by the splitters, such that every element of
+        bucket i is smaller than or equal to every element of bucket i+1. Numeric elements are collected in typed
+        arrays, which are copied into shared memory without converting them again
+
+        Parameters:
+            arr (list): list to be sorted
+            splitters (list): sorted list of splitters
+            typecode (str): array typecode of the buckets, or None for lists
+
+        Returns:
+            list: list of len(splitters)+1 buckets
+        """
+        buckets = [array(typecode) if typecode else [] for _ in range(len(splitters)+1)]
+        for x in arr:
+            buckets[bisect_right(splitters, x)].append(x)
+        return buckets
+
+
+    def __numeric_typecode(self, arr: list) -> str:
+        """
+        Finds the array typecode that can represent every element of the array in shared memory
+
+        Parameters:
+            arr (list): list to be sorted
+
+        Returns:
+            str: 'q' for 64-bit integers, 'd' for floats or None if the elements must be pickled
+        """
+        if all(type(x) is int for x in arr):
+            if INT64_MIN <= min(arr) and max(arr) <= INT64_MAX:
+                return 'q'
+        elif all(type(x) is float for x in arr):
+            return 'd'
+        return None
+
+
+    def __sort_shared(self, buckets: list, typecode: str, executor: ProcessPoolExecutor) -> list:
+        """
+        Sorts the buckets in the worker processes with the data stored contiguously in a shared memory array, so
+        only the bounds of each bucket are sent to the workers
+
+        Parameters:
+            buckets (list): list of typed array buckets
+            typecode (str): array typecode of the data
+            executor (ProcessPoolExecutor): pool of worker processes
+
+        Returns:
+            list: the sorted list
+        """
+        n = sum(len(bucket) for bucket in buckets)
+        shm = shared_memory.SharedMemory(create=True, size=n*array(typecode).itemsize)
+        view = shm.buf.cast(typecode)
+        try:
+            # copy the buckets into shared memory and let each worker sort its bucket in place
+            futures = []
+            start = 0
+            for bucket in buckets:
+                stop = start+len(bucket)
+                view[start:stop] = bucket
+                futures.append(executor.submit(_sort_shared_bucket, shm.name, typecode, start, stop, self.local_sort))
+                start = stop
+
+            for future in futures:
+                future.result()
+            return view.tolist()
+        finally:
+            view.release()
+            shm.close()
+            shm.unlink()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Parallel sample sorting algorithm')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-workers', help='number of worker processes', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    n = args.data[0]
+    seed = args.data[1]
+    t = args.t
+
+    # shuffle data randomly with seed
+    sorted_data = list(range(n))
+    random.seed(seed)
+    random_data = random.sample(sorted_data, n)
+    sorting_algo = SampleSort(args.workers, min_parallel_size=0)
+
+    # verify that list is sorted correctly
+    if not sorting_algo.sort(random_data) == sorted_data:
+        print('Error sorting array using <{}>'.format(sorting_algo))
+        exit(1)
+
+    # measure execution time
+    if args.t:
+        times = timeit.Timer(partial(sorting_algo.sort, random_data)).repeat(t[1], t[0])
+
+        # average time taken
+        time_taken = min(times) / t[0]
+
+        print('Timing analysis')
+        print('Sorting method: {}'.format(sorting_algo))
+        print('Data length: {}'.format(n))
+        print('Executions: {}'.format(t[0]))
+        print('Average time: {}s'.format(time_taken))
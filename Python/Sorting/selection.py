@@ -0,0 +1,160 @@
+import argparse
+import timeit
+from functools import partial
+from itertools import islice
+import random
+from quick_sort import QuickSort
+from heap_sort import HeapSort
+
+
+# selection shares the partitioning of introsort and the heap of heap sort
+_quick_sort = QuickSort('introsort')
+_heap_sort = HeapSort()
+
+
+def select(arr, k: int):
+    """
+    Finds the k'th smallest element (counting from 0) of an array in O(n) time using introselect
+
+    Parameters:
+        arr (list or buffer): the array to search
+        k (int): rank of the element to find
+
+    Returns:
+        the k'th smallest element
+    """
+    return _quick_sort.select(arr, k)
+
+
+def nth_element(arr, k: int, in_place=False):
+    """
+    Rearranges an array such that the element at index k is the element that would be there if the array was sorted,
+    with no larger elements before it and no smaller elements after it
+
+    Parameters:
+        arr (list or buffer): the array to rearrange
+        k (int): index of the element to place correctly
+        in_place (bool): whether the array should be rearranged in place
+
+    Returns:
+        list or buffer: the rearranged array
+    """
+    return _quick_sort.nth_element(arr, k, in_place)
+
+
+def partial_sort(arr, k: int, in_place=False):
+    """
+    Rearranges an array such that its first k elements are the k smallest elements in ascending order, in
+    O(n + k log k) time
+
+    Parameters:
+        arr (list or buffer): the array to rearrange
+        k (int): number of smallest elements to sort
+        in_place (bool): whether the array should be rearranged in place
+
+    Returns:
+        list or buffer: the rearranged array
+    """
+    return _quick_sort.partial_sort(arr, k, in_place)
+
+
+def nsmallest(iterable, k: int, key=None) -> list:
+    """
+    Finds the k smallest elements of an iterable in a single pass using a bounded heap, in O(n log k) time and O(k)
+    memory
+
+    Parameters:
+        iterable (iterable): elements to search
+        k (int): number of elements to find
+        key (callable): function computing the sort key of each element
+
+    Returns:
+        list: the k smallest elements in ascending order
+    """
+    return _heap_sort.nsmallest(iterable, k, key)
+
+
+def nlargest(iterable, k: int, key=None) -> list:
+    """
+    Finds the k largest elements of an iterable in a single pass using a bounded heap, in O(n log k) time and O(k)
+    memory
+
+    Parameters:
+        iterable (iterable): elements to search
+        k (int): number of elements to find
+        key (callable): function computing the sort key of each element
+
+    Returns:
+        list: the k largest elements in descending order
+    """
+    return _heap_sort.nlargest(iterable, k, key)
+
+
+def sort_iter(iterable, key=None, reverse=False):
+    """
+    Lazily sorts the elements of an iterable using a heap built in O(n) time, yielding them one at a time in
+    O(log n) time each
+
+    Parameters:
+        iterable (iterable): elements to be sorted
+        key (callable): function computing the sort key of each element
+        reverse (bool): whether the elements should be yielded in descending order
+
+    Returns:
+        generator: the elements in sorted order
+    """
+    return _heap_sort.sort_iter(iterable, key, reverse)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Selection and partial sorting algorithms')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-k', help='number of elements to select', type=int, default=100)
+    args = parser.parse_args()
+
+    n = args.data[0]
+    seed = args.data[1]
+    t = args.t
+    k = min(args.k, n)
+
+    # shuffle data randomly with seed
+    sorted_data = list(range(n))
+    random.seed(seed)
+    random_data = random.sample(sorted_data, n)
+
+    # verify that the elements are selected correctly
+    if n and not select(random_data, n//2) == sorted_data[n//2]:
+        print('Error selecting the median')
+        exit(1)
+    if not partial_sort(random_data, k)[:k] == sorted_data[:k]:
+        print('Error partially sorting the {} smallest elements'.format(k))
+        exit(1)
+    if not nsmallest(random_data, k) == sorted_data[:k] or not nlargest(random_data, k) == sorted_data[::-1][:k]:
+        print('Error finding the {} smallest and largest elements'.format(k))
+        exit(1)
+    if not list(sort_iter(random_data)) == sorted_data:
+        print('Error lazily sorting the elements')
+        exit(1)
+
+    # measure execution time
+    if args.t:
+        methods = {
+            'select median': partial(select, random_data, n//2),
+            'partial sort': partial(partial_sort, random_data, k),
+            'nsmallest': partial(nsmallest, random_data, k),
+            'first k of sort_iter': lambda: list(islice(sort_iter(random_data), k)),
+            'full sort': partial(_quick_sort.sort, random_data),
+        }
+
+        print('Timing analysis')
+        print('Data length: {}'.format(n))
+        print('k: {}'.format(k))
+        print('Executions: {}'.format(t[0]))
+        for name, method in methods.items():
+            times = timeit.Timer(method).repeat(t[1], t[0])
+
+            # average time taken
+            time_taken = min(times) / t[0]
+            print('Average time ({}): {}s'.format(name, time_taken))
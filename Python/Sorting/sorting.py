@@ -1,24 +1,69 @@
+import copy
+import sys
+import tracemalloc
+import types
+from array import array
+import numpy as np
+
+
 class BaseSort():
     """
     A base class for sorting algorithms
 
     Attributes
     ----------
-    -
+    COMPARISON_SORT : bool
+        whether the algorithm orders the elements by comparing them, which subclasses that order the elements by
+        their digits or values set to False
 
     Methods
     -------
-    sort(arr, in_place=False)
+    sort(arr, in_place=False, key=None, reverse=False)
         Sorts an array using built-in sort method
 
+    instrumented_sort(arr, key=None, reverse=False, trace=True)
+        Sorts an array while counting the operations performed by the algorithm
+
+    _work_array(arr, in_place)
+        Prepares the array that a sorting algorithm works on, supporting lists and typed buffers
+
+    _buffer(arr, n)
+        Allocates an auxiliary buffer of n elements for sorting an array
+
+    _stack(arr, items)
+        Creates the explicit stack of pending subarrays of an iterative algorithm sorting an array
+
+    argsort(arr, reverse=False)
+        Finds the permutation of indices that sorts an array
+
+    _keyed_sort(arr, in_place, key, reverse)
+        Sorts an array by precomputed keys and/or in descending order using the sort method of the algorithm
+
+    _argsort(values)
+        Finds the permutation of indices that sorts a list in ascending order
+
+    _index_array(order, arr)
+        Packs a permutation of indices into a compact array
+
+    __counted_sort(work_arr, key, reverse)
+        Sorts the counting list of an instrumented sort in place
+
+    __method_codes()
+        Finds the code objects of every method of the algorithm
+
     """
-    def sort(self, arr: list, in_place=False) -> list:
+    COMPARISON_SORT = True
+
+
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
         """
         Sorts an array using the built-in sort method
 
         Parameters:
             arr (list): list to be sorted
             in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
 
         Returns:
             list: the sorted list
@@ -28,5 +73,475 @@ class BaseSort():
         else:
             work_arr = arr.copy()
         
-        work_arr.sort()
-        return work_arr
\ No newline at end of file
+        work_arr.sort(key=key, reverse=reverse)
+        return work_arr
+
+
+    def argsort(self, arr, reverse=False):
+        """
+        Finds the permutation of indices that sorts an array, such that arr[order[0]], arr[order[1]], ... is sorted.
+        The permutation can be used to reorder other arrays by the order of arr. A descending permutation is found as
+        the reversed ascending permutation of the reversed array, mapped back to indices of arr, so elements that are
+        equal keep their relative order if the algorithm is stable
+
+        Parameters:
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) to find the permutation of
+            reverse (bool): whether the permutation should sort the array in descending order
+
+        Returns:
+            array or ndarray: the permutation, as an ndarray of np.intp if arr is an ndarray and as an array('l')
+                otherwise
+        """
+        if isinstance(arr, list):
+            values = arr
+        else:
+            try:
+                values = np.asarray(memoryview(arr)).ravel().tolist()
+            except TypeError:
+                values = list(arr)
+
+        if reverse:
+            n = len(values)
+            order = [n-1-i for i in reversed(self._argsort(values[::-1]))]
+        else:
+            order = self._argsort(values)
+        return self._index_array(order, arr)
+
+
+    def instrumented_sort(self, arr, key=None, reverse=False, trace=True) -> tuple:
+        """
+        Sorts an array while counting the operations performed by the algorithm. Nothing is counted by the algorithms
+        themselves, so sort is unaffected. Instead, the elements of a comparison sort are wrapped in objects that
+        count every comparison, and the array is wrapped in a list that counts every element written to it. Slices
+        of the array, and the auxiliary buffers and explicit stacks the algorithms create with _buffer and _stack,
+        are counting lists too, so writes to auxiliary buffers are counted along with the allocations and the size of
+        the stacks. The recursion of the methods of the algorithm is tracked by a profiling hook, and the memory
+        allocated while sorting by tracemalloc. The counts are slowed down by the wrappers, so sort should still be
+        used to measure the running time. The profiling hook and tracemalloc are by far the slowest part, so they
+        can be left out when only the operations are counted. Work done in other processes (e.g. by the workers of
+        SampleSort) is not counted
+
+        Parameters:
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) to be sorted
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the array should be sorted in descending order
+            trace (bool): whether the recursion and the memory are traced, otherwise max_depth only covers the
+                explicit stacks and peak_memory is None
+
+        Returns:
+            tuple: the sorted array (a list if arr is a list and otherwise of the same type as arr, or a memoryview
+                if arr is bytes), and the SortCounters of the sort
+        """
+        result, source = self._work_array(arr, False)
+        counters = SortCounters(0 if self.COMPARISON_SORT else None)
+
+        # the elements of comparison sorts are sorted by their wrapped keys, which count their comparisons
+        if self.COMPARISON_SORT:
+            element_type = _ReversedCountedElement if reverse else _CountedElement
+            keys = source if key is None else map(key, source)
+            work_arr = _CountingList((element_type(k, x, counters) for k, x in zip(keys, source)), counters)
+        else:
+            work_arr = _CountingList(source, counters)
+
+        # every call and return of a method of the algorithm changes the recursion depth of the method
+        nesting = dict.fromkeys(self.__method_codes(), 0)
+        def profile(frame, event, arg):
+            code = frame.f_code
+            if code in nesting:
+                if event == 'call':
+                    nesting[code] += 1
+                    counters.max_depth = max(counters.max_depth, nesting[code])
+                elif event == 'return':
+                    nesting[code] -= 1
+
+        if not trace:
+            counters.peak_memory = None
+            self.__counted_sort(work_arr, key, reverse)
+        else:
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            allocated = tracemalloc.get_traced_memory()[0]
+            previous_profile = sys.getprofile()
+            sys.setprofile(profile)
+            try:
+                self.__counted_sort(work_arr, key, reverse)
+            finally:
+                sys.setprofile(previous_profile)
+                counters.peak_memory = tracemalloc.get_traced_memory()[1] - allocated
+                if not tracing:
+                    tracemalloc.stop()
+
+        items = [x.item for x in work_arr] if self.COMPARISON_SORT else list(work_arr)
+        if isinstance(result, list):
+            result[:] = items
+        else:
+            for i, x in enumerate(items):
+                source[i] = x
+        return result, counters
+
+
+    def __counted_sort(self, work_arr: list, key, reverse: bool):
+        """
+        Sorts the counting list of an instrumented sort in place. The counted elements of a comparison sort already
+        order themselves by their keys and direction, while other algorithms are given the key and direction
+
+        Parameters:
+            work_arr (list): the counting list
+            key (callable): function computing the sort key of each element
+            reverse (bool): whether the array should be sorted in descending order
+
+        Returns:
+            None
+        """
+        if self.COMPARISON_SORT:
+            self.sort(work_arr, in_place=True)
+        else:
+            self.sort(work_arr, in_place=True, key=key, reverse=reverse)
+
+
+    def _work_array(self, arr, in_place: bool) -> tuple:
+        """
+        Prepares the array that a sorting algorithm works on. Lists are copied unless sorted in place. Objects
+        supporting the buffer protocol (array.array, bytearray, numpy.ndarray and memoryview) are copied into a
+        container of the same type unless sorted in place, and are sorted through a one-dimensional memoryview of
+        the container, so the elements stay in the typed buffer instead of being converted to a list and back. Only
+        buffers sorted in place must be writable, read-only buffers such as bytes are copied into a memoryview, which
+        is returned to the caller instead of a bytes object
+
+        Parameters:
+            arr (list or buffer): the array to be sorted
+            in_place (bool): whether the array should be sorted in place
+
+        Returns:
+            tuple: the object to return to the caller and the indexable sequence to sort
+        """
+        if isinstance(arr, list):
+            work_arr = arr if in_place else arr.copy()
+            return work_arr, work_arr
+
+        # buffers of formats that memoryview cannot index (e.g. float16 or non-native byte order) are sorted as a
+        # sequence, like objects that do not support the buffer protocol
+        try:
+            view = memoryview(arr)
+            memoryview(bytes(view.itemsize)).cast(view.format)
+        except (TypeError, ValueError):
+            work_arr = arr if in_place else arr.copy()
+            return work_arr, work_arr
+
+        # an empty buffer cannot be cast to another shape, and there is nothing to sort
+        if not view.nbytes:
+            return arr if in_place or isinstance(arr, memoryview) else copy.copy(arr), memoryview(bytearray())
+
+        if in_place:
+            result = arr
+        else:
+            # containers are copied as themselves, while memoryviews and read-only buffers whose copy is still
+            # read-only (bytes) are copied into a writable memoryview of the same format and shape
+            result = None if isinstance(arr, memoryview) else copy.copy(arr)
+            if result is not None and not memoryview(result).readonly:
+                view = memoryview(result)
+            else:
+                shape = view.shape
+                view = memoryview(bytearray(view.tobytes())).cast(view.format)
+                result = view.cast('B').cast(view.format, shape) if len(shape) != 1 else view
+
+        if view.readonly:
+            raise TypeError('cannot sort a read-only buffer in place')
+
+        # multi-dimensional (or otherwise shaped) buffers are sorted as a flat array of their elements
+        if view.ndim != 1:
+            view = view.cast('B').cast(view.format)
+        return result, view
+
+
+    def _buffer(self, arr, n: int):
+        """
+        Allocates an auxiliary buffer of n elements for sorting an array, which is a buffer of the same element type
+        if the array is a memoryview and a list otherwise. The buffers of an instrumented sort count the elements
+        written to them
+
+        Parameters:
+            arr (list or memoryview): the array being sorted
+            n (int): number of elements of the buffer
+
+        Returns:
+            list or memoryview: the buffer
+        """
+        if isinstance(arr, memoryview):
+            return memoryview(bytearray(n * arr.itemsize)).cast(arr.format)
+        if isinstance(arr, _CountingList):
+            arr.counters.allocations += 1
+            return _CountingList([None]*n, arr.counters)
+        return [None]*n
+
+
+    def _stack(self, arr, items: list) -> list:
+        """
+        Creates the explicit stack of pending subarrays (or runs) of an iterative algorithm sorting an array. The
+        stacks of an instrumented sort record their largest size as the depth of the sort
+
+        Parameters:
+            arr (list or memoryview): the array being sorted
+            items (list): the initial items of the stack
+
+        Returns:
+            list: the stack
+        """
+        if isinstance(arr, _CountingList):
+            return _DepthStack(items, arr.counters)
+        return items
+
+
+    def _keyed_sort(self, arr, in_place: bool, key, reverse: bool):
+        """
+        Sorts an array by precomputed keys and/or in descending order using the sort method of the algorithm
+        (decorate-sort-undecorate). Every element is decorated with its key and its index, so the key is computed once
+        per element, the elements themselves are never compared, and elements with equal keys keep their relative
+        order. For a descending sort the indices are negated before the decorated elements are sorted in ascending
+        order and reversed
+
+        Parameters:
+            arr (list or buffer): the array to be sorted
+            in_place (bool): whether the array should be sorted in place
+            key (callable): function computing the sort key of each element, or None to sort by the elements
+            reverse (bool): whether the array should be sorted in descending order
+
+        Returns:
+            list or buffer: the sorted array
+        """
+        result, work_arr = self._work_array(arr, in_place)
+        n = len(work_arr)
+        step = -1 if reverse else 1
+
+        keys = work_arr if key is None else map(key, work_arr)
+        decorated = self.sort(list(zip(keys, range(0, step*n, step), work_arr)), in_place=True)
+        if reverse:
+            decorated.reverse()
+
+        if isinstance(work_arr, list):
+            work_arr[:] = [x for _, _, x in decorated]
+        else:
+            for i, (_, _, x) in enumerate(decorated):
+                work_arr[i] = x
+        return result
+
+
+    def _argsort(self, values: list) -> list:
+        """
+        Finds the permutation of indices that sorts a list in ascending order by sorting the indices with the sort
+        method of the algorithm, using the values as keys. Algorithms with a native implementation override this
+
+        Parameters:
+            values (list): the list to find the permutation of
+
+        Returns:
+            list: the permutation
+        """
+        return self.sort(list(range(len(values))), in_place=True, key=values.__getitem__)
+
+
+    @staticmethod
+    def _index_array(order, arr):
+        """
+        Packs a permutation of indices into a compact array, which is an ndarray if the permuted array is an ndarray
+
+        Parameters:
+            order (list or ndarray): the permutation
+            arr (list or buffer): the permuted array
+
+        Returns:
+            array or ndarray: the permutation as an ndarray of np.intp or an array('l')
+        """
+        if isinstance(arr, np.ndarray):
+            return np.asarray(order, dtype=np.intp)
+        if isinstance(order, np.ndarray):
+            return array('l', order.astype('l').tobytes())
+        return array('l', order)
+
+
+    def __method_codes(self) -> set:
+        """
+        Finds the code objects of every method of the algorithm, including the methods it inherits
+
+        Returns:
+            set: the code objects
+        """
+        return {method.__code__ for cls in type(self).__mro__ for method in vars(cls).values()
+                if isinstance(method, types.FunctionType)}
+
+
+class SortCounters():
+    """
+    A class used to hold the operation counts of an instrumented sort
+
+    Attributes
+    ----------
+    comparisons : int
+        number of comparisons between elements (or their keys), or None if the algorithm does not compare elements
+    writes : int
+        number of elements written to the array being sorted, to its slices and copies and to the auxiliary buffers
+        of the algorithm, which counts swaps, moves and the elements copied into new buffers
+    max_depth : int
+        recursion depth of the deepest recursive method of the algorithm, or the largest size of the explicit stack of
+        an iterative algorithm, whichever is larger
+    allocations : int
+        number of auxiliary buffers allocated while sorting, including the slices and copies of the array
+    peak_memory : int
+        peak number of bytes allocated while sorting, in addition to the memory allocated before the sort, or None if
+        the memory was not traced
+
+    """
+    def __init__(self, comparisons: int = 0):
+        self.comparisons = comparisons
+        self.writes = 0
+        self.max_depth = 0
+        self.allocations = 0
+        self.peak_memory = 0
+
+
+    def __repr__(self):
+        return 'SortCounters(comparisons={}, writes={}, max_depth={}, allocations={}, peak_memory={})'.format(
+            self.comparisons, self.writes, self.max_depth, self.allocations, self.peak_memory)
+
+
+class _CountedElement():
+    """
+    Wraps an element and its sort key, and counts the comparisons of the key with the keys of other elements
+    """
+    __slots__ = ('key', 'item', 'counters')
+
+
+    def __init__(self, key, item, counters: SortCounters):
+        self.key = key
+        self.item = item
+        self.counters = counters
+
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+    def __lt__(self, other):
+        self.counters.comparisons += 1
+        return self.key < other.key
+
+
+    def __le__(self, other):
+        self.counters.comparisons += 1
+        return self.key <= other.key
+
+
+    def __gt__(self, other):
+        self.counters.comparisons += 1
+        return self.key > other.key
+
+
+    def __ge__(self, other):
+        self.counters.comparisons += 1
+        return self.key >= other.key
+
+
+    def __eq__(self, other):
+        self.counters.comparisons += 1
+        return self.key == other.key
+
+
+    def __ne__(self, other):
+        self.counters.comparisons += 1
+        return self.key != other.key
+
+
+class _ReversedCountedElement(_CountedElement):
+    """
+    Counted element that is ordered in descending order of its key, so an ascending sort of the elements sorts them
+    in descending order while elements with equal keys keep their relative order
+    """
+    __slots__ = ()
+
+
+    def __lt__(self, other):
+        self.counters.comparisons += 1
+        return other.key < self.key
+
+
+    def __le__(self, other):
+        self.counters.comparisons += 1
+        return other.key <= self.key
+
+
+    def __gt__(self, other):
+        self.counters.comparisons += 1
+        return other.key > self.key
+
+
+    def __ge__(self, other):
+        self.counters.comparisons += 1
+        return other.key >= self.key
+
+
+class _CountingList(list):
+    """
+    List that counts the elements written to it. Slices and copies are counted as allocations whose elements are
+    written to new counting lists
+    """
+    __slots__ = ('counters',)
+
+
+    def __init__(self, iterable, counters: SortCounters):
+        super().__init__(iterable)
+        self.counters = counters
+
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.counters.writes += len(value)
+        else:
+            self.counters.writes += 1
+        super().__setitem__(index, value)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__counted_copy(super().__getitem__(index))
+        return super().__getitem__(index)
+
+
+    def copy(self):
+        return self.__counted_copy(self)
+
+
+    def __counted_copy(self, items):
+        self.counters.allocations += 1
+        self.counters.writes += len(items)
+        return _CountingList(items, self.counters)
+
+
+    def reverse(self):
+        self.counters.writes += len(self)
+        super().reverse()
+
+
+class _DepthStack(list):
+    """
+    Explicit stack of an iterative algorithm, which records its largest size as the depth of an instrumented sort
+    """
+    __slots__ = ('counters',)
+
+
+    def __init__(self, iterable, counters: SortCounters):
+        super().__init__(iterable)
+        self.counters = counters
+        counters.max_depth = max(counters.max_depth, len(self))
+
+
+    def append(self, item):
+        super().append(item)
+        self.counters.max_depth = max(self.counters.max_depth, len(self))
+
+
+    def extend(self, items):
+        super().extend(items)
+        self.counters.max_depth = max(self.counters.max_depth, len(self))
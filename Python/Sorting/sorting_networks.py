@@ -0,0 +1,318 @@
+import argparse
+import timeit
+from functools import partial
+import random
+import numpy as np
+from sorting import BaseSort
+
+
+class NetworkSort(BaseSort):
+    """
+    A class used to encapsulate sorting with sorting networks, which sort an array of a fixed size by a fixed sequence
+    of compare-exchange operations and are suited to sorting many small arrays
+
+    Attributes
+    ----------
+    -
+
+    Methods
+    -------
+    sort(arr, in_place=False, key=None, reverse=False)
+        Sorts an array using the sorting network for its size
+
+    sort_many(arrays, in_place=False)
+        Sorts a batch of small arrays using the sorting network for the size of each array
+
+    network(n)
+        Finds the sorting network for arrays of n elements
+
+    __sorter(n)
+        Finds the function that sorts an array of n elements in place with the sorting network for its size
+
+    __compile(network, n)
+        Unrolls a sorting network into a function of straight-line compare-exchange operations
+
+    __odd_even_merge_network(n)
+        Generates the compare-exchange operations of Batcher's odd-even merge sort for n elements
+
+    __network_sort(arr, network)
+        Applies the compare-exchange operations of a sorting network to an array in place
+
+    __numpy_sort_many(arrays, in_place)
+        Vectorized sorting of the rows of a two-dimensional numpy array
+
+    """
+    # size-optimal sorting networks (Knuth, TAOCP Vol. 3, 5.3.4)
+    OPTIMAL_NETWORKS = {
+        2: ((0, 1),),
+        3: ((0, 2), (0, 1), (1, 2)),
+        4: ((0, 1), (2, 3), (0, 2), (1, 3), (1, 2)),
+        5: ((0, 3), (1, 4), (0, 2), (1, 3), (0, 1), (2, 4), (1, 2), (3, 4), (2, 3)),
+        6: ((0, 5), (1, 3), (2, 4), (1, 2), (3, 4), (0, 3), (2, 5), (0, 1), (2, 3), (4, 5), (1, 2), (3, 4)),
+        7: ((0, 6), (2, 3), (4, 5), (0, 2), (1, 4), (3, 6), (0, 1), (2, 5), (3, 4), (1, 2), (4, 6), (2, 3), (4, 5),
+            (1, 2), (3, 4), (5, 6)),
+        8: ((0, 2), (1, 3), (4, 6), (5, 7), (0, 4), (1, 5), (2, 6), (3, 7), (0, 1), (2, 3), (4, 5), (6, 7), (2, 4),
+            (3, 5), (1, 4), (3, 6), (1, 2), (3, 4), (5, 6)),
+    }
+
+    # networks of arrays with at most this many elements are cached and unrolled, larger networks are generated for
+    # every sort
+    MAX_NETWORK_SIZE = 32
+
+
+    def __init__(self):
+        self.__networks = {}
+        self.__sorters = {}
+
+
+    def __repr__(self):
+        return "Sorting Network"
+
+
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
+        """
+        Sorts an array using the sorting network for its size. Arrays of at most 8 elements are sorted by the
+        networks with the fewest compare-exchange operations, and larger arrays by Batcher's odd-even merge sort
+        network in O(n log^2 n) time
+
+        Parameters:
+            arr (list or buffer): list or typed buffer (array.array, ndarray, memoryview) to be sorted
+            in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
+
+        Returns:
+            list or buffer: the sorted array, of the same type as arr, or a memoryview if arr is bytes
+        """
+        if key is not None or reverse:
+            return self._keyed_sort(arr, in_place, key, reverse)
+
+        result, work_arr = self._work_array(arr, in_place)
+        self.__sorter(len(work_arr))(work_arr)
+        return result
+
+
+    def sort_many(self, arrays, in_place=False):
+        """
+        Sorts a batch of small arrays using the sorting network for the size of each array. The unrolled networks are
+        looked up once per size, and lists are sorted without the per-call overhead of sort. A two-dimensional numpy
+        array of numbers is sorted row by row with vectorized operations, where every compare-exchange operation is
+        a column-wise np.minimum and np.maximum over all rows at once
+
+        Parameters:
+            arrays (iterable or ndarray): the arrays (lists or typed buffers) to be sorted, or a two-dimensional
+                ndarray whose rows are sorted
+            in_place (bool): whether the arrays should be sorted in place
+
+        Returns:
+            list or ndarray: the sorted arrays, as an ndarray if arrays is a two-dimensional ndarray and as a list of
+                arrays of the same type as the input arrays otherwise
+        """
+        if isinstance(arrays, np.ndarray) and arrays.ndim == 2:
+            return self.__numpy_sort_many(arrays, in_place)
+
+        results = []
+        for arr in arrays:
+            if isinstance(arr, list):
+                result = work_arr = arr if in_place else arr.copy()
+            else:
+                result, work_arr = self._work_array(arr, in_place)
+            sorter = self.__sorters.get(len(work_arr))
+            if sorter is None:
+                sorter = self.__sorter(len(work_arr))
+            sorter(work_arr)
+            results.append(result)
+        return results
+
+
+    def network(self, n: int):
+        """
+        Finds the sorting network for arrays of n elements, which is a size-optimal network for at most 8 elements
+        and Batcher's odd-even merge sort network otherwise
+
+        Parameters:
+            n (int): number of elements
+
+        Returns:
+            tuple or generator: the pairs of indices (i, j), i < j, to compare-exchange in order
+        """
+        if n in self.__networks:
+            return self.__networks[n]
+        if n > self.MAX_NETWORK_SIZE:
+            return self.__odd_even_merge_network(n)
+
+        network = self.OPTIMAL_NETWORKS.get(n)
+        if network is None:
+            network = tuple(self.__odd_even_merge_network(n))
+        self.__networks[n] = network
+        return network
+
+
+    def __sorter(self, n: int):
+        """
+        Finds the function that sorts an array of n elements in place with the sorting network for its size. The
+        networks of small arrays are unrolled and cached
+
+        Parameters:
+            n (int): number of elements
+
+        Returns:
+            callable: function sorting an indexable array in place
+        """
+        if n in self.__sorters:
+            return self.__sorters[n]
+        if n > self.MAX_NETWORK_SIZE:
+            return partial(self.__network_sort, network=self.network(n))
+
+        sorter = self.__compile(self.network(n), n)
+        self.__sorters[n] = sorter
+        return sorter
+
+
+    def __compile(self, network, n: int):
+        """
+        Unrolls a sorting network into a function of straight-line compare-exchange operations. The elements are
+        loaded into local variables, so every operation is a single comparison and at most a tuple swap, without the
+        loop and indexing of __network_sort, and written back once they are sorted
+
+        Parameters:
+            network (iterable): the pairs of indices (i, j), i < j, to compare-exchange in order
+            n (int): number of elements
+
+        Returns:
+            callable: function sorting an indexable array of n elements in place
+        """
+        if n < 2:
+            return lambda arr: None
+
+        elements = ', '.join('x{}'.format(i) for i in range(n))
+        lines = ['def network_sort(arr):', '    {}, = arr'.format(elements)]
+        for i, j in network:
+            lines.append('    if x{j} < x{i}: x{i}, x{j} = x{j}, x{i}'.format(i=i, j=j))
+        lines.append('    {}, = {}'.format(', '.join('arr[{}]'.format(i) for i in range(n)), elements))
+
+        namespace = {}
+        exec('\n'.join(lines), namespace)
+        return namespace['network_sort']
+
+
+    def __odd_even_merge_network(self, n: int):
+        """
+        Generates the compare-exchange operations of Batcher's odd-even merge sort for n elements. The network sorts
+        the next power of 2 elements with the elements beyond n treated as infinite, so the operations involving them
+        are left out
+
+        Parameters:
+            n (int): number of elements
+
+        Returns:
+            generator: the pairs of indices (i, j), i < j, to compare-exchange in order
+        """
+        p = 1
+        while p < n:
+            k = p
+            while k >= 1:
+                for j in range(k % p, n-k, 2*k):
+                    for i in range(min(k, n-j-k)):
+                        # only elements within the same pair of merged blocks of size p are compared
+                        if (i+j) // (2*p) == (i+j+k) // (2*p):
+                            yield i+j, i+j+k
+                k //= 2
+            p *= 2
+
+
+    def __network_sort(self, arr, network):
+        """
+        Applies the compare-exchange operations of a sorting network to an array in place
+
+        Parameters:
+            arr (list or memoryview): the array to be sorted
+            network (iterable): the pairs of indices (i, j), i < j, to compare-exchange in order
+
+        Returns:
+            None
+        """
+        for i, j in network:
+            if arr[j] < arr[i]:
+                arr[i], arr[j] = arr[j], arr[i]
+
+
+    def __numpy_sort_many(self, arrays: np.ndarray, in_place: bool) -> np.ndarray:
+        """
+        Vectorized sorting of the rows of a two-dimensional numpy array of numbers. The array is transposed into a
+        contiguous copy, so every column is a contiguous row, and every compare-exchange operation writes the
+        element-wise minimum and maximum of two columns back into them. NaNs cannot be sorted, as the minimum and
+        maximum of NaN and a number are both NaN
+
+        Parameters:
+            arrays (ndarray): two-dimensional array of numbers whose rows are sorted
+            in_place (bool): whether the array should be sorted in place
+
+        Returns:
+            ndarray: the array with sorted rows
+        """
+        if arrays.dtype.kind not in 'iuf':
+            raise TypeError('{} only sorts numbers with numpy'.format(self))
+        if arrays.dtype.kind == 'f' and np.isnan(arrays).any():
+            raise ValueError('{} cannot sort NaNs with numpy'.format(self))
+
+        columns = np.ascontiguousarray(arrays.T)
+        for i, j in self.network(columns.shape[0]):
+            a = columns[i]
+            b = columns[j]
+            smaller = np.minimum(a, b)
+            np.maximum(a, b, out=b)
+            a[:] = smaller
+
+        if in_place:
+            arrays[:] = columns.T
+            return arrays
+        return np.ascontiguousarray(columns.T)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Batched sorting of small arrays with sorting networks')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    parser.add_argument('-size', help='number of elements of every array in the batch', type=int, default=8)
+    args = parser.parse_args()
+
+    n = args.data[0]
+    seed = args.data[1]
+    t = args.t
+    size = args.size
+
+    # a batch of n shuffled arrays with seed
+    random.seed(seed)
+    batch = [random.sample(range(size), size) for _ in range(n)]
+    numpy_batch = np.array(batch).reshape(n, size)
+    sorting_algo = NetworkSort()
+
+    # verify that the arrays are sorted correctly
+    sorted_batch = [sorted(arr) for arr in batch]
+    if not sorting_algo.sort_many(batch) == sorted_batch or \
+            not sorting_algo.sort_many(numpy_batch).tolist() == sorted_batch:
+        print('Error sorting batch using <{}>'.format(sorting_algo))
+        exit(1)
+
+    # measure execution time
+    if args.t:
+        methods = {
+            'sort_many': partial(sorting_algo.sort_many, batch),
+            'sort_many (numpy)': partial(sorting_algo.sort_many, numpy_batch),
+            'sort per array': lambda: [sorting_algo.sort(arr) for arr in batch],
+            'built-in sort per array': lambda: [sorted(arr) for arr in batch],
+        }
+
+        print('Timing analysis')
+        print('Sorting method: {}'.format(sorting_algo))
+        print('Batch size: {}'.format(n))
+        print('Array size: {}'.format(size))
+        print('Executions: {}'.format(t[0]))
+        for name, method in methods.items():
+            times = timeit.Timer(method).repeat(t[1], t[0])
+
+            # average time taken
+            time_taken = min(times) / t[0]
+            print('Average time ({}): {}s'.format(name, time_taken))
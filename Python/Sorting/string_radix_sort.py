@@ -0,0 +1,266 @@
+import argparse
+import os
+import timeit
+from functools import partial
+import random
+from sorting import BaseSort
+from insertion_sort import InsertionSort
+
+
+class StringRadixSort(BaseSort):
+    """
+    A class used to encapsulate the MSD String Radix Sort algorithm (multikey quicksort) for str and bytes keys
+
+    Attributes
+    ----------
+    -
+
+    Methods
+    -------
+    sort(arr, in_place=False, key=None, reverse=False)
+        Sorts an array of strings using the MSD string radix sort algorithm
+
+    __keyed_sort(arr, key, reverse)
+        Stable sort of the elements by their precomputed string keys
+
+    __check_strings(arr)
+        Verifies that every element of the array is a string of a single type
+
+    __multikey_quick_sort(arr, low, high)
+        Iterative implementation of the multikey quicksort algorithm
+
+    __partition(arr, low, high, d)
+        Partitions the input subarray by the character at position d of each string
+
+    __skip_common_prefix(arr, low, high, d)
+        Finds the length of the prefix shared by all strings in the input subarray
+
+    """
+    COMPARISON_SORT = False
+
+    # buckets of this size or smaller are insertion sorted
+    INSERTION_CUTOFF = 32
+
+
+    def __init__(self):
+        self.__insertion_sort = InsertionSort()
+
+
+    def __repr__(self):
+        return "String Radix Sort"
+
+
+    def sort(self, arr: list, in_place=False, key=None, reverse=False) -> list:
+        """
+        Sorts an array of strings (str or bytes) using the MSD string radix sort algorithm. Strings are partitioned
+        three ways by their character at the current position, so each character is only examined once per string,
+        and prefixes shared by all strings of a bucket are skipped without partitioning
+
+        Parameters:
+            arr (list): list of strings to be sorted
+            in_place (bool): whether the list should be sorted in place
+            key (callable): function computing the string sort key of each element, which is called once per element
+            reverse (bool): whether the list should be sorted in descending order
+
+        Returns:
+            list: the sorted list
+        """
+        if in_place:
+            work_arr = arr
+        else:
+            work_arr = arr.copy()
+
+        if key is not None:
+            work_arr[:] = self.__keyed_sort(work_arr, key, reverse)
+            return work_arr
+
+        self.__check_strings(work_arr)
+        self.__multikey_quick_sort(work_arr, 0, len(work_arr)-1)
+        if reverse:
+            work_arr.reverse()
+        return work_arr
+
+
+    def __keyed_sort(self, arr: list, key, reverse: bool) -> list:
+        """
+        Stable sort of the elements by their precomputed string keys. The elements are grouped by key in order of
+        appearance, and only the distinct keys are radix sorted before the groups are concatenated in key order
+
+        Parameters:
+            arr (list): elements to be sorted
+            key (callable): function computing the string sort key of each element
+            reverse (bool): whether the elements should be sorted in descending order
+
+        Returns:
+            list: the sorted elements
+        """
+        groups = {}
+        for x in arr:
+            k = key(x)
+            group = groups.get(k)
+            if group is None:
+                groups[k] = [x]
+            else:
+                group.append(x)
+
+        keys = list(groups)
+        self.__check_strings(keys)
+        self.__multikey_quick_sort(keys, 0, len(keys)-1)
+        if reverse:
+            keys.reverse()
+        return [x for k in keys for x in groups[k]]
+
+
+    def __check_strings(self, arr: list):
+        """
+        Verifies that every element of the array is a string of the same type as the first element, as str and
+        bytes cannot be compared with each other
+
+        Parameters:
+            arr (list): list of strings to be sorted
+
+        Returns:
+            None
+        """
+        if not arr:
+            return
+        string_type = str if isinstance(arr[0], str) else bytes
+        if not all(isinstance(s, string_type) for s in arr):
+            raise TypeError('{} only sorts either str or bytes'.format(self))
+
+
+    def __multikey_quick_sort(self, arr: list, low: int, high: int):
+        """
+        Iterative implementation of the multikey quicksort algorithm. Every bucket is split into strings with a
+        smaller, equal and larger character at position d than the pivot character. Only the equal bucket advances to
+        the next character position. Buckets are kept on an explicit stack, as their nesting depth can be as large as
+        the string length
+
+        Parameters:
+            arr (list): list of strings to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+
+        Returns:
+            None
+        """
+        stack = self._stack(arr, [(low, high, 0)])
+        while stack:
+            low, high, d = stack.pop()
+
+            # all strings in a bucket share the first d characters, so comparing them whole is cheap
+            if high-low+1 <= self.INSERTION_CUTOFF:
+                self.__insertion_sort.sort_range(arr, low, high)
+                continue
+
+            lt, gt, pivot = self.__partition(arr, low, high, d)
+            stack.append((low, lt-1, d))
+            stack.append((gt+1, high, d))
+
+            # strings that end at position d are equal and need no further sorting
+            if pivot:
+                # if every string shares the pivot character, the entire common prefix is skipped at once
+                if lt == low and gt == high:
+                    d = self.__skip_common_prefix(arr, low, high, d+1)
+                    if d is not None:
+                        stack.append((low, high, d))
+                else:
+                    stack.append((lt, gt, d+1))
+
+
+    def __partition(self, arr: list, low: int, high: int, d: int) -> tuple:
+        """
+        Partitions the input subarray by the character at position d of each string into strings with a smaller,
+        equal and larger character than the pivot character, which is the median of the characters of the first,
+        middle and last string. Strings shorter than d+1 characters have the empty character, which is smallest
+
+        Parameters:
+            arr (list): list of strings to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+            d (int): character position
+
+        Returns:
+            tuple: first and last index of the strings with the pivot character, and the pivot character
+        """
+        a = arr[low][d:d+1]
+        b = arr[(low+high)//2][d:d+1]
+        c = arr[high][d:d+1]
+        pivot = sorted((a, b, c))[1]
+
+        lt = low                # arr[low:lt] has a smaller character than the pivot
+        i = low                 # arr[lt:i] has the pivot character
+        gt = high               # arr[gt+1:high+1] has a larger character than the pivot
+
+        while i <= gt:
+            ch = arr[i][d:d+1]
+            if ch < pivot:
+                arr[lt], arr[i] = arr[i], arr[lt]
+                lt += 1
+                i += 1
+            elif pivot < ch:
+                arr[i], arr[gt] = arr[gt], arr[i]
+                gt -= 1
+            else:
+                i += 1
+        return lt, gt, pivot
+
+
+    def __skip_common_prefix(self, arr: list, low: int, high: int, d: int) -> int:
+        """
+        Finds the length of the prefix shared by all strings in the input subarray, given that they share at least the
+        first d characters. The common prefix of all strings is the common prefix of the smallest and largest string
+
+        Parameters:
+            arr (list): list of strings to be sorted
+            low (int): start index of current subarray
+            high (int): end index of current subarray
+            d (int): length of a prefix known to be shared by all strings
+
+        Returns:
+            int: length of the common prefix, or None if all strings are equal
+        """
+        smallest = min(arr[low:high+1])
+        largest = max(arr[low:high+1])
+        if smallest == largest:
+            return None
+
+        while smallest[d:d+1] == largest[d:d+1]:
+            d += 1
+        return d
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MSD string radix sorting algorithm')
+
+    parser.add_argument('-data', help='parameters for generating random data [len, seed]', nargs=2, type=int)
+    parser.add_argument('-t', help='measure the execution time', nargs=2, required=False, type=int)
+    args = parser.parse_args()
+
+    n = args.data[0]
+    seed = args.data[1]
+    t = args.t
+
+    # generate random URLs sharing a long common prefix
+    random.seed(seed)
+    random_data = ['https://example.com/api/v1/items/{}'.format(random.getrandbits(40)) for _ in range(n)]
+    sorted_data = sorted(random_data)
+    sorting_algo = StringRadixSort()
+
+    # verify that list is sorted correctly
+    if not sorting_algo.sort(random_data) == sorted_data:
+        print('Error sorting array using <{}>'.format(sorting_algo))
+        exit(1)
+
+    # measure execution time
+    if args.t:
+        times = timeit.Timer(partial(sorting_algo.sort, random_data)).repeat(t[1], t[0])
+
+        # average time taken
+        time_taken = min(times) / t[0]
+
+        print('Timing analysis')
+        print('Sorting method: {}'.format(sorting_algo))
+        print('Data length: {}'.format(n))
+        print('Executions: {}'.format(t[0]))
+        print('Average time: {}s'.format(time_taken))
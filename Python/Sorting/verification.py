@@ -1,17 +1,137 @@
 import unittest
+from auto_sort import AutoSort
 from bubble_sort import BubbleSort
 from counting_sort import CountingSort
+from dual_pivot_quick_sort import DualPivotQuickSort
 from heap_sort import HeapSort
 from insertion_sort import InsertionSort
 from merge_sort import MergeSort
 from quick_sort import QuickSort
 from radix_sort import RadixSort
+from sample_sort import SampleSort
+from string_radix_sort import StringRadixSort
+from selection import select, nth_element, partial_sort, nsmallest, nlargest, sort_iter
 from bucket_sort import BucketSort
+from sorting_networks import NetworkSort
+from multi_key_sort import MultiKeySort
+from k_way_merge import merge_sorted
+import os
+import math
 import random
+import tempfile
+import tracemalloc
+from array import array
+from external_sort import ExternalSort
+from record_sort import RecordSort
+import struct
 from sorting import BaseSort
+from bench import DISTRIBUTIONS, discover_algorithms
+import timeit
+from functools import partial
+from itertools import chain
 import numpy as np
 
 
+def sawtooth_data(n: int, seed: int) -> list:
+    # ascending runs of 64 elements
+    return [i % 64 for i in range(n)]
+
+
+def all_equal_data(n: int, seed: int) -> list:
+    # a single distinct value
+    return [7]*n
+
+
+def signed_data(n: int, seed: int) -> list:
+    # random negative and non-negative integers
+    rng = random.Random(seed)
+    return [rng.randrange(-n, n) for _ in range(n)]
+
+
+def median_of_three_killer_data(n: int, seed: int) -> list:
+    # Musser's sequence, which makes the median of the first, middle and last element a bad pivot at every level
+    k = n // 2
+    data = list(range(n))
+    for i in range(1, k+1):
+        data[i-1] = i if i % 2 else k+i-1
+        data[k+i-1] = 2*i
+    return data
+
+
+def uniform_unit_data(n: int, seed: int) -> list:
+    # uniformly distributed floats in the range [0,1)
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(n)]
+
+
+def near_one_data(n: int, seed: int) -> list:
+    # floats just below 1, which all fall in the last bucket of a bucket sort
+    rng = random.Random(seed)
+    return [1 - rng.random() * 1e-9 for _ in range(n-1)] + [float(np.nextafter(1, 0))] if n else []
+
+
+def string_data(generator, n: int, seed: int) -> list:
+    # the integers of another distribution as strings
+    return [str(x) for x in generator(n, seed)]
+
+
+def shared_prefix_data(n: int, seed: int) -> list:
+    # strings sharing a long prefix, followed by random digits
+    rng = random.Random(seed)
+    return ['prefix' * 8 + str(rng.randrange(n)) for _ in range(n)]
+
+
+ADVERSARIAL_DISTRIBUTIONS = dict(DISTRIBUTIONS, sawtooth=sawtooth_data, all_equal=all_equal_data, signed=signed_data,
+                                 median_of_three_killer=median_of_three_killer_data)
+UNIT_FLOAT_DISTRIBUTIONS = {'uniform': uniform_unit_data, 'near_one': near_one_data}
+STRING_DISTRIBUTIONS = {name: partial(string_data, generator) for name, generator in ADVERSARIAL_DISTRIBUTIONS.items()}
+STRING_DISTRIBUTIONS['shared_prefix'] = shared_prefix_data
+
+
+def excess_growth_exponent(algo: BaseSort, generator, sizes: list, seed: int, bound) -> float:
+    """
+    Fits the exponent e of the number of operations c*bound(n)*n^e of an algorithm in excess of an expected bound by
+    least squares on a log-log scale, where the operations are the comparisons and writes counted by an instrumented
+    sort. The exponent is close to 0 if the operations grow as the bound
+
+    Parameters:
+        algo (BaseSort): the sorting algorithm
+        generator (callable): function generating the data of a size from a seed
+        sizes (list): input sizes to measure
+        seed (int): seed of the data
+        bound (callable): the expected number of operations of a size, up to a constant factor
+
+    Returns:
+        float: the excess growth exponent
+    """
+    ratios = []
+    for n in sizes:
+        _, counters = algo.instrumented_sort(generator(n, seed), trace=False)
+        ratios.append(max((counters.comparisons or 0) + counters.writes, 1) / bound(n))
+    return np.polyfit(np.log(sizes), np.log(ratios), 1)[0]
+
+
+def growth_exponent(algo, generator, sizes: list, seed: int, repeat: int = 3) -> float:
+    """
+    Fits the exponent e of the running time c*n^e of an algorithm by least squares on a log-log scale
+
+    Parameters:
+        algo: the sorting algorithm
+        generator (callable): function generating the data of a size from a seed
+        sizes (list): input sizes to measure
+        seed (int): seed of the data
+        repeat (int): number of executions per size, of which the fastest is used
+
+    Returns:
+        float: the growth exponent
+    """
+    times = []
+    for n in sizes:
+        data = generator(n, seed)
+        times.append(min(timeit.Timer(partial(algo.sort, data)).repeat(repeat, 1)))
+    return np.polyfit(np.log(sizes), np.log(times), 1)[0]
+
+
 class SortingTestWrapper():
 
     def __init__(self, algo: BaseSort , n: int, seed: int):
@@ -46,6 +166,37 @@ class TestSortingAlgorithms(unittest.TestCase):
         self.verification = SortingTestWrapper(BaseSort(), self.n, self.seed)
 
 
+    def test_auto_sort(self):
+        random.seed(self.seed)
+        inputs = {
+            'Counting Sort': [random.randrange(self.n) for _ in range(self.n)],
+            'Radix Sort': [random.randrange(-2**32, 2**32) for _ in range(self.n)],
+            'Merge Sort (adaptive)': list(range(self.n)) + [0],
+            'QuickSort (three_way)': [random.choice('abc') for _ in range(self.n)],
+            'QuickSort (introsort)': [random.random() for _ in range(self.n)],
+            'Counting Sort (numpy)': np.random.randint(0, 100, self.n),
+            'Radix Sort (float, numpy)': np.random.rand(self.n),
+        }
+        algo = AutoSort()
+        for decision, data in inputs.items():
+            self.assertListEqual(list(algo.sort(data)), sorted(data))
+            self.assertEqual(algo.decision, decision)
+            self.assertEqual(algo.stats['n'], self.n if decision != 'Merge Sort (adaptive)' else self.n+1)
+
+        # arrays of strings, objects and dates are sorted as lists of their elements
+        strings = np.array(['b', 'a', 'c']*50)
+        np.testing.assert_array_equal(algo.sort(strings), np.sort(strings))
+        self.assertEqual(algo.decision, 'QuickSort (three_way)')
+        np.testing.assert_array_equal(algo.sort(strings, key=str.upper, reverse=True), np.sort(strings)[::-1])
+        for data in (np.array([3, 1, 2], dtype=object), np.array([3, 1, 2], dtype='datetime64[D]'),
+                     strings.reshape(3, -1)):
+            expected = np.sort(data.ravel()).reshape(data.shape)
+            np.testing.assert_array_equal(algo.sort(data), expected)
+            self.assertIsNot(algo.sort(data), data)
+            self.assertIs(algo.sort(data, in_place=True), data)
+            np.testing.assert_array_equal(data, expected)
+
+
     def test_bubble_sort(self):
         algo = SortingTestWrapper(BubbleSort(), self.n, self.seed)
         self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
@@ -56,6 +207,33 @@ class TestSortingAlgorithms(unittest.TestCase):
         self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
 
 
+    def test_counting_sort_numpy(self):
+        algo = SortingTestWrapper(CountingSort('numpy'), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+        random.seed(self.seed)
+        offset_data = np.array([random.randint(-100, 100) for _ in range(self.n)])
+        self.assertListEqual(CountingSort().sort(offset_data.tolist()), sorted(offset_data.tolist()))
+        np.testing.assert_array_equal(CountingSort('numpy').sort(offset_data), np.sort(offset_data))
+
+
+    def test_counting_sort_max_range(self):
+        # ranges are unlimited by default, and an opt-in limit is checked by every sort and argsort
+        self.assertListEqual(CountingSort('numpy').sort([2**25, 0, 5]), [0, 5, 2**25])
+        data = [0, 2**30, 5, 5]
+        for backend in CountingSort.BACKENDS:
+            algo = CountingSort(backend, max_range=2**24)
+            self.assertListEqual(algo.sort([10**6, -10**6, 0, 5]), [-10**6, 0, 5, 10**6])
+            for sort in (algo.sort, algo.argsort, partial(algo.sort, key=lambda x: -x)):
+                with self.assertRaises(ValueError):
+                    sort(data)
+
+
+    def test_dual_pivot_quick_sort(self):
+        algo = SortingTestWrapper(DualPivotQuickSort(), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+
     def test_heap_sort(self):
         algo = SortingTestWrapper(HeapSort(), self.n, self.seed)
         self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
@@ -71,20 +249,555 @@ class TestSortingAlgorithms(unittest.TestCase):
         self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
 
 
+    def test_merge_sort_bottom_up(self):
+        algo = SortingTestWrapper(MergeSort('bottom_up'), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+
+    def test_merge_sort_adaptive(self):
+        algo = SortingTestWrapper(MergeSort('adaptive'), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+
+    def test_merge_sort_block(self):
+        algo = SortingTestWrapper(MergeSort('block'), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+        # integers and floats of the same value compare equal, so a stable sort keeps the order of their types
+        random.seed(self.seed)
+        mixed = [random.choice((x, float(x))) for x in random.choices(range(self.n // 10), k=self.n)]
+        result = MergeSort('block').sort(mixed)
+        self.assertListEqual([type(x) for x in result], [type(x) for x in sorted(mixed)])
+
+        doubles = array('d', (random.random() for _ in range(self.n)))
+        self.assertListEqual(list(MergeSort('block').sort(doubles, in_place=True)), sorted(doubles))
+
+        # the merges only allocate a buffer of about sqrt(n) elements, instead of a buffer of n elements
+        peaks = {}
+        for mode in ('bottom_up', 'block'):
+            data = random.sample(range(self.n), self.n)
+            tracemalloc.start()
+            MergeSort(mode).sort(data, in_place=True)
+            peaks[mode] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertListEqual(data, list(range(self.n)))
+        self.assertLess(peaks['block'], peaks['bottom_up'] / 4)
+
+
+    def test_merge_sort_adaptive_nearly_sorted(self):
+        # ascending data with a few random swaps, descending runs and appended unsorted tail
+        random.seed(self.seed)
+        nearly_sorted = list(range(self.n))
+        for _ in range(self.n // 100):
+            i, j = random.randrange(self.n), random.randrange(self.n)
+            nearly_sorted[i], nearly_sorted[j] = nearly_sorted[j], nearly_sorted[i]
+        nearly_sorted += list(range(self.n, 0, -1)) + random.sample(range(self.n), self.n)
+        self.assertListEqual(MergeSort('adaptive').sort(nearly_sorted), sorted(nearly_sorted))
+
+
+    def test_merge_sort_in_place(self):
+        for mode in MergeSort.MODES:
+            arr = list(range(self.n, 0, -1))
+            self.assertIs(MergeSort(mode).sort(arr, in_place=True), arr)
+            self.assertListEqual(arr, list(range(1, self.n+1)))
+
+
+    def test_typed_buffer_sort(self):
+        algos = [HeapSort(), InsertionSort()] + [QuickSort(mode) for mode in QuickSort.MODES] + \
+                [MergeSort(mode) for mode in MergeSort.MODES]
+        random.seed(self.seed)
+        data = [random.randrange(-1000, 1000) for _ in range(500)]
+        for algo in algos:
+            arr = array('q', data)
+            self.assertEqual(algo.sort(arr), array('q', sorted(data)))
+            self.assertEqual(arr, array('q', data))
+
+            ndarr = np.array(data, dtype=np.int32)
+            self.assertIs(algo.sort(ndarr, in_place=True), ndarr)
+            self.assertListEqual(ndarr.tolist(), sorted(data))
+
+            # float16 arrays cannot be indexed through a memoryview and are sorted as a sequence
+            halves = np.array(data, dtype=np.float16)
+            self.assertListEqual(algo.sort(halves).tolist(), sorted(halves.tolist()))
+            self.assertListEqual(halves.tolist(), np.array(data, dtype=np.float16).tolist())
+
+            # read-only buffers are copied into a writable memoryview, and only sorting them in place is rejected
+            result = algo.sort(b'sorting')
+            self.assertIsInstance(result, memoryview)
+            self.assertEqual(bytes(result), bytes(sorted(b'sorting')))
+            ndarr.flags.writeable = False
+            self.assertListEqual(algo.sort(ndarr[::-1]).tolist(), sorted(data))
+            with self.assertRaises(TypeError):
+                algo.sort(b'sorting', in_place=True)
+
+
     def test_quick_sort(self):
         algo = SortingTestWrapper(QuickSort(), self.n, self.seed)
         self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
 
 
+    def test_quick_sort_introsort(self):
+        algo = SortingTestWrapper(QuickSort('introsort'), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+
+    def test_quick_sort_introsort_presorted(self):
+        algo = QuickSort('introsort')
+        sorted_data = list(range(self.n))
+        self.assertListEqual(algo.sort(sorted_data), sorted_data)
+        self.assertListEqual(algo.sort(sorted_data[::-1]), sorted_data)
+        self.assertListEqual(algo.sort([7]*self.n), [7]*self.n)
+
+
+    def test_quick_sort_three_way(self):
+        algo = SortingTestWrapper(QuickSort('three_way'), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+
+    def test_quick_sort_three_way_duplicates(self):
+        random.seed(self.seed)
+        few_unique = [random.randrange(4) for _ in range(self.n)]
+        self.assertListEqual(QuickSort('three_way').sort(few_unique), sorted(few_unique))
+
+
     def test_radix_sort(self):
         algo = SortingTestWrapper(RadixSort(), self.n, self.seed)
         self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
 
 
+    def test_radix_sort_signed(self):
+        random.seed(self.seed)
+        signed_data = [random.randint(-2**64, 2**64) for _ in range(self.n)] + [2**53+1, 2**53, -1, 0]
+        for radix in (2, 16, 256, 2**16):
+            self.assertListEqual(RadixSort(radix).sort(signed_data), sorted(signed_data))
+
+
+    def test_radix_sort_float(self):
+        random.seed(self.seed)
+        float_data = [random.uniform(-1e300, 1e300) for _ in range(self.n)] + [random.gauss(0, 1) for _ in range(self.n)]
+        float_data += [float('inf'), float('-inf'), 0.0, -0.0, 5e-324, -5e-324]
+        self.assertListEqual(RadixSort(dtype='float').sort(float_data), sorted(float_data))
+
+
+    def test_radix_sort_numpy(self):
+        algo = SortingTestWrapper(RadixSort(backend='numpy'), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+        np.random.seed(self.seed)
+        int_data = np.random.randint(-2**63, 2**63-1, size=self.n, dtype=np.int64)
+        np.testing.assert_array_equal(RadixSort(backend='numpy').sort(int_data), np.sort(int_data))
+        float_data = np.random.randn(self.n) * 1e100
+        np.testing.assert_array_equal(RadixSort(dtype='float', backend='numpy').sort(float_data), np.sort(float_data))
+
+
+    def test_sample_sort(self):
+        algo = SortingTestWrapper(SampleSort(workers=2, min_parallel_size=0), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+        self.assertListEqual(algo.float_sort(), self.verification.float_sort())
+
+        # the splitters are sampled without touching the global random state
+        random.seed(self.seed)
+        data = [random.randrange(2**40) for _ in range(self.n)]
+        state = random.getstate()
+        self.assertListEqual(SampleSort(workers=2, min_parallel_size=0, seed=self.seed).sort(data), sorted(data))
+        self.assertEqual(random.getstate(), state)
+
+
+    def test_string_radix_sort(self):
+        random.seed(self.seed)
+        urls = ['https://example.com/{}/{}'.format(random.choice(['a', 'ab', 'b']), random.randrange(self.n))
+                for _ in range(self.n)] + ['', 'https://example.com/']
+        self.assertListEqual(StringRadixSort().sort(urls), sorted(urls))
+
+        keys = [url.encode() for url in urls]
+        self.assertListEqual(StringRadixSort().sort(keys), sorted(keys))
+
+        # str and bytes cannot be compared, so mixing them is rejected like sorted() does
+        for mixed in (['b', b'a', 'c'], [b'b', 'a', b'c'], ['b', 1]):
+            with self.assertRaises(TypeError):
+                StringRadixSort().sort(mixed)
+
+
+    def test_key_reverse_sort(self):
+        # records with many equal keys, so the order of equal keys verifies stability
+        random.seed(self.seed)
+        records = [(random.randrange(-50, 50), i) for i in range(1000)]
+        key = lambda record: record[0]
+        algos = [BubbleSort(), CountingSort(), DualPivotQuickSort(), HeapSort(), InsertionSort(), RadixSort(),
+                 SampleSort(workers=2, min_parallel_size=0)] + [MergeSort(mode) for mode in MergeSort.MODES] + \
+                [QuickSort(mode) for mode in QuickSort.MODES]
+        for algo in algos:
+            for reverse in (False, True):
+                self.assertListEqual(algo.sort(records, key=key, reverse=reverse),
+                                     sorted(records, key=key, reverse=reverse))
+
+        string_records = [(str(k), i) for k, i in records]
+        self.assertListEqual(StringRadixSort().sort(string_records, key=key, reverse=True),
+                             sorted(string_records, key=key, reverse=True))
+
+
+    def test_argsort(self):
+        # many equal elements, so the permutation of the stable algorithms is unique
+        random.seed(self.seed)
+        data = [random.randrange(-50, 50) for _ in range(1000)]
+        stable_order = sorted(range(len(data)), key=data.__getitem__)
+        stable = [BaseSort(), CountingSort(), CountingSort('numpy'), RadixSort(), RadixSort(backend='numpy')] + \
+                 [MergeSort(mode) for mode in MergeSort.MODES]
+        for algo in stable:
+            order = algo.argsort(data)
+            self.assertIsInstance(order, array)
+            self.assertListEqual(list(order), stable_order)
+            self.assertListEqual(list(algo.argsort(data, reverse=True)),
+                                 sorted(range(len(data)), key=data.__getitem__, reverse=True))
+        for algo in [QuickSort(mode) for mode in QuickSort.MODES]:
+            self.assertListEqual([data[i] for i in algo.argsort(data)], sorted(data))
+            self.assertListEqual([data[i] for i in algo.argsort(data, reverse=True)], sorted(data, reverse=True))
+
+        # typed buffers are read without conversion, and ndarrays give ndarray permutations
+        self.assertListEqual(list(MergeSort().argsort(array('d', data))), stable_order)
+        for algo in (MergeSort(), CountingSort('numpy'), RadixSort(dtype='float', backend='numpy')):
+            order = algo.argsort(np.array(data))
+            self.assertIsInstance(order, np.ndarray)
+            np.testing.assert_array_equal(order, np.argsort(data, kind='stable'))
+
+
+    def test_sorting_networks(self):
+        algo = SortingTestWrapper(NetworkSort(), self.n, self.seed)
+        self.assertListEqual(algo.integer_sort(), self.verification.integer_sort())
+
+        # a network sorts every input if it sorts every input of 0's and 1's (the 0-1 principle)
+        for n in range(1, 17):
+            zero_one = (np.arange(1 << n)[:, None] >> np.arange(n)) & 1
+            np.testing.assert_array_equal(NetworkSort().sort_many(zero_one), np.sort(zero_one, axis=1))
+
+        random.seed(self.seed)
+        batch = [[random.random() for _ in range(random.randrange(40))] for _ in range(200)]
+        self.assertListEqual(NetworkSort().sort_many(batch), [sorted(arr) for arr in batch])
+        NetworkSort().sort_many(batch, in_place=True)
+        self.assertListEqual(batch, [sorted(arr) for arr in batch])
+
+
+    def test_instrumented_sort(self):
+        random.seed(self.seed)
+        data = random.sample(range(300), 300)
+        algos = [BubbleSort(), CountingSort(), DualPivotQuickSort(), HeapSort(), InsertionSort(), NetworkSort(),
+                 RadixSort()] + [MergeSort(mode) for mode in MergeSort.MODES] + \
+                [QuickSort(mode) for mode in QuickSort.MODES]
+        for algo in algos:
+            result, counters = algo.instrumented_sort(data)
+            self.assertListEqual(result, sorted(data))
+            self.assertGreater(counters.max_depth, 0)
+            self.assertGreater(counters.peak_memory, 0)
+            if algo.COMPARISON_SORT:
+                self.assertGreater(counters.comparisons, 0)
+            else:
+                self.assertIsNone(counters.comparisons)
+
+        # the operations are counted the same without tracing the recursion and memory
+        _, counters = HeapSort().instrumented_sort(data)
+        _, untraced = HeapSort().instrumented_sort(data, trace=False)
+        self.assertEqual((untraced.comparisons, untraced.writes), (counters.comparisons, counters.writes))
+        self.assertIsNone(untraced.peak_memory)
+
+        # insertion sort makes n-1 comparisons and no writes on sorted input, and n(n-1)/2 comparisons on reversed input
+        _, counters = InsertionSort().instrumented_sort(sorted(data))
+        self.assertEqual((counters.comparisons, counters.writes), (len(data)-1, 0))
+        _, counters = InsertionSort().instrumented_sort(sorted(data, reverse=True))
+        self.assertEqual(counters.comparisons, len(data)*(len(data)-1)//2)
+
+        # the depth is the recursion depth of top-down merge sort and the stack size of introsort, which is bounded by
+        # log2(n) as the smaller side is sorted first
+        _, counters = MergeSort().instrumented_sort(data)
+        self.assertEqual(counters.max_depth, math.ceil(math.log2(len(data))) + 1)
+        _, counters = QuickSort('introsort').instrumented_sort(data)
+        self.assertLessEqual(counters.max_depth, math.log2(len(data)))
+
+        # every pass of bottom-up merge sort writes all elements to the auxiliary buffer or back to the array
+        passes = math.ceil(math.log2(len(data) / MergeSort.RUN_LENGTH))
+        _, counters = MergeSort('bottom_up').instrumented_sort(data)
+        self.assertGreaterEqual(counters.writes, passes * len(data))
+        self.assertGreater(counters.allocations, 0)
+
+        # keys are compared instead of the elements, and equal keys keep their order in descending order
+        records = [(x % 10, i) for i, x in enumerate(data)]
+        key = lambda record: record[0]
+        result, counters = MergeSort().instrumented_sort(records, key=key, reverse=True)
+        self.assertListEqual(result, sorted(records, key=key, reverse=True))
+        self.assertLessEqual(counters.comparisons, len(data) * 10)
+
+
+    def test_multi_key_sort(self):
+        # rows of (tenant_id, day, score, name) sorted by tenant_id, descending day, score and name
+        random.seed(self.seed)
+        tenant_ids = [random.randrange(10) for _ in range(self.n)]
+        days = [random.randrange(-2**40, 2**40, 2**36) for _ in range(self.n)]
+        scores = [random.randrange(4) / 2 for _ in range(self.n)]
+        names = [random.choice(['a', 'b', 'c']) for _ in range(self.n)]
+        rows = sorted(range(self.n), key=lambda i: (tenant_ids[i], -days[i], scores[i], names[i]))
+
+        order = MultiKeySort().lexsort([tenant_ids, days, scores, names], [False, True, False, False])
+        self.assertIsInstance(order, array)
+        self.assertListEqual(list(order), rows)
+
+        columns = [np.array(tenant_ids), np.array(days), np.array(scores), np.array(names)]
+        order = MultiKeySort(BaseSort()).lexsort(columns, [False, True, False, False])
+        self.assertIsInstance(order, np.ndarray)
+        self.assertListEqual(order.tolist(), rows)
+
+        # columns without rows
+        for columns in ([np.array([], dtype=np.int64)], [np.array([]), np.array([], dtype=str)], [[], []]):
+            self.assertListEqual(list(MultiKeySort().lexsort(columns, True)), [])
+
+
+    def test_selection(self):
+        random.seed(self.seed)
+        data = [random.randrange(self.n // 10) for _ in range(self.n)]
+        sorted_data = sorted(data)
+        for k in (0, 1, self.n // 2, self.n - 1):
+            self.assertEqual(select(data, k), sorted_data[k])
+            arr = nth_element(data, k)
+            self.assertEqual(arr[k], sorted_data[k])
+            self.assertTrue(max(arr[:k+1]) <= arr[k] <= min(arr[k:]))
+            self.assertListEqual(partial_sort(data, k)[:k], sorted_data[:k])
+
+        # the top-k elements are found from a stream and keep the order of equal keys
+        records = [(x, i) for i, x in enumerate(data)]
+        key = lambda record: record[0]
+        self.assertListEqual(nsmallest(iter(records), 100, key), sorted(records, key=key)[:100])
+        self.assertListEqual(nlargest(iter(records), 100, key), sorted(records, key=key, reverse=True)[:100])
+
+
+    def test_sort_iter(self):
+        random.seed(self.seed)
+        data = random.sample(range(self.n), self.n)
+        self.assertListEqual(list(sort_iter(data)), sorted(data))
+        self.assertListEqual(list(sort_iter(iter(data), reverse=True)), sorted(data, reverse=True))
+
+        # the first elements are yielded without sorting the rest, and equal keys keep their order
+        first = sort_iter(enumerate(data), key=lambda pair: pair[1] % 10)
+        self.assertListEqual([next(first) for _ in range(10)], sorted(enumerate(data), key=lambda pair: pair[1] % 10)[:10])
+
+
+    def test_merge_sorted(self):
+        # shards of interleaved records, which are merged by key in the order of their shards
+        random.seed(self.seed)
+        records = [(random.randrange(self.n // 10), i) for i in range(self.n)]
+        key = lambda record: record[0]
+        for k in (1, 3, 16, 100):
+            shards = [sorted(records[i::k], key=key) for i in range(k)]
+            merged = sorted(chain.from_iterable(shards), key=key)
+            self.assertListEqual(list(merge_sorted(shards, key)), merged)
+            self.assertListEqual(list(merge_sorted((iter(shard) for shard in shards), key)), merged)
+
+        # partitions of consecutive ranges are merged in bulk, including empty partitions
+        partitions = [list(range(i*100, (i+1)*100)) for i in range(50)] + [[]]
+        random.shuffle(partitions)
+        self.assertListEqual(list(merge_sorted(partitions)), list(range(5000)))
+        self.assertListEqual(list(merge_sorted([])), [])
+
+
     def test_bucket_sort(self):
         algo = SortingTestWrapper(BucketSort(), self.n, self.seed)
         self.assertListEqual(algo.float_sort(), self.verification.float_sort())
 
 
+    def test_bucket_sort_numpy(self):
+        algo = SortingTestWrapper(BucketSort('numpy'), self.n, self.seed)
+        self.assertListEqual(algo.float_sort(), self.verification.float_sort())
+
+        np.random.seed(self.seed)
+        float_data = np.random.rand(self.n)
+        np.testing.assert_array_equal(BucketSort('numpy').sort(float_data), np.sort(float_data))
+
+        # clustered values fill a few large buckets among many small ones, and an empty array is copied as well
+        clustered = np.concatenate([float_data, np.full(self.n, 0.5) + float_data * 1e-6, float_data.round(1)])
+        np.testing.assert_array_equal(BucketSort('numpy').sort(clustered), np.sort(clustered))
+        empty = np.empty(0)
+        self.assertIsNot(BucketSort('numpy').sort(empty), empty)
+
+
+class TestExternalSort(unittest.TestCase):
+    def setUp(self):
+        self.n = 5000
+        self.seed = 42
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmp_dir.name, 'input')
+        self.output_path = os.path.join(self.tmp_dir.name, 'output')
+        random.seed(self.seed)
+
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+
+    def test_line_records(self):
+        lines = [str(random.random()).encode() + b'\n' for _ in range(self.n)]
+        with open(self.input_path, 'wb') as f:
+            f.writelines(lines)
+
+        # small memory limit and fan-in force several runs and merge passes
+        ExternalSort(memory_limit=4096, fan_in=4).sort_file(self.input_path, self.output_path)
+        with open(self.output_path, 'rb') as f:
+            self.assertListEqual(f.readlines(), sorted(lines))
+
+
+    def test_fixed_width_records(self):
+        records = [random.getrandbits(64).to_bytes(8, 'big') + os.urandom(24) for _ in range(self.n)]
+        with open(self.input_path, 'wb') as f:
+            f.writelines(records)
+
+        ExternalSort(memory_limit=4096, fan_in=4, record_size=32).sort_file(self.input_path, self.output_path)
+        with open(self.output_path, 'rb') as f:
+            self.assertEqual(f.read(), b''.join(sorted(records)))
+
+
+class TestRecordSort(unittest.TestCase):
+    def setUp(self):
+        self.n = 5000
+        self.seed = 42
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'records')
+        random.seed(self.seed)
+
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+
+    def test_unsigned_key_file(self):
+        record = struct.Struct('<Q24s')
+        records = [(random.getrandbits(64), os.urandom(24)) for _ in range(self.n)]
+        with open(self.path, 'wb') as f:
+            f.write(b''.join(record.pack(*r) for r in records))
+
+        RecordSort('<Q24s').sort_file(self.path)
+        with open(self.path, 'rb') as f:
+            self.assertListEqual(list(record.iter_unpack(f.read())), sorted(records))
+
+
+    def test_signed_key_field(self):
+        # the key is the second field, preceded by a field that needs alignment padding
+        record = struct.Struct('@bq')
+        keys = [random.randrange(-2**40, 2**40) for _ in range(self.n)] + [0, -1, 2**63-1, -2**63]
+        buf = bytearray(b''.join(record.pack(1, key) for key in keys))
+
+        RecordSort('@bq', key_field=1).sort_buffer(buf)
+        self.assertListEqual([r[1] for r in record.iter_unpack(buf)], sorted(keys))
+
+
+class TestStress(unittest.TestCase):
+    # number of seeds every algorithm is checked against the reference sort with
+    SEEDS = 10
+
+    # input sizes the growth exponents of the operation counts are fitted across, with smaller sizes for the
+    # quadratic algorithms
+    SIZES = [512, 1024, 2048]
+    QUADRATIC_SIZES = [256, 512, 1024]
+
+    # expected number of operations of every complexity class, and the largest excess growth exponent accepted for
+    # it. Algorithms leaving their class grow at least a log factor faster, while lower order terms such as the
+    # n log(n/64) merges of sawtooth input stay below the limits at these sizes
+    BOUNDS = {
+        'n': lambda n: n,
+        'n log n': lambda n: n * math.log2(n),
+        'n log^2 n': lambda n: n * math.log2(n)**2,
+        'n^2': lambda n: n * n,
+    }
+    GROWTH_LIMITS = {'n': 0.1, 'n log n': 0.35, 'n log^2 n': 0.35, 'n^2': 0.35}
+
+    # input sizes and largest growth exponents of the optional timing test, leaving room for timing noise
+    TIMING_SIZES = [500, 1000, 2000, 4000]
+    TIMING_QUADRATIC_SIZES = [250, 500, 1000]
+    TIMING_GROWTH_LIMITS = {'n': 1.4, 'n log n': 1.5, 'n log^2 n': 1.6, 'n^2': 2.6}
+
+    # worst-case complexity class of the algorithms that are not O(n log n)
+    COMPLEXITY = {
+        'BubbleSort': 'n^2',
+        'InsertionSort': 'n^2',
+        'NetworkSort': 'n log^2 n',
+        'CountingSort[python]': 'n',
+        'CountingSort[numpy]': 'n',
+        'RadixSort[python]': 'n',
+        'RadixSort[numpy]': 'n',
+    }
+
+    # the last element pivot is quadratic on presorted input, and its recursion gets too deep, so it is only given
+    # random input
+    RANDOM_ONLY = {'QuickSort[lomuto]'}
+
+
+    def setUp(self):
+        self.seed = 42
+        self.algorithms = {name: algo for name, algo in discover_algorithms().items()
+                           if not name.startswith(('BucketSort', 'StringRadixSort'))}
+
+
+    def cases(self):
+        # every algorithm with the distributions of the data it sorts
+        for name, algo in self.algorithms.items():
+            if name in self.RANDOM_ONLY:
+                yield name, algo, {'random': DISTRIBUTIONS['random']}
+            else:
+                yield name, algo, ADVERSARIAL_DISTRIBUTIONS
+        yield 'BucketSort[python]', BucketSort(), UNIT_FLOAT_DISTRIBUTIONS
+        yield 'BucketSort[numpy]', BucketSort('numpy'), UNIT_FLOAT_DISTRIBUTIONS
+        yield 'StringRadixSort', StringRadixSort(), STRING_DISTRIBUTIONS
+
+
+    def test_differential(self):
+        for name, algo, distributions in self.cases():
+            for distribution, generator in distributions.items():
+                for seed in range(self.SEEDS):
+                    n = random.Random(seed).randrange(300) if seed > 2 else seed
+                    data = generator(n, seed)
+                    with self.subTest(algorithm=name, distribution=distribution, seed=seed, n=n):
+                        self.assertListEqual(algo.sort(data), sorted(data))
+
+
+    def test_growth(self):
+        # the operation counts are deterministic, so only the algorithms that can be instrumented are checked
+        failures = []
+        for name, algo, distributions in self.cases():
+            if not isinstance(algo, BaseSort):
+                continue
+            complexity = self.COMPLEXITY.get(name, 'n log n')
+            sizes = self.QUADRATIC_SIZES if complexity == 'n^2' else self.SIZES
+            for distribution, generator in distributions.items():
+                exponent = excess_growth_exponent(algo, generator, sizes, self.seed, self.BOUNDS[complexity])
+                if exponent > self.GROWTH_LIMITS[complexity]:
+                    failures.append('{} on {} input grows as {} * n^{:.2f}'.format(name, distribution, complexity,
+                                                                                    exponent))
+        if failures:
+            self.fail('\n'.join(failures))
+
+
+    @unittest.skipUnless(os.environ.get('SORTING_TIMING_TESTS'), 'set SORTING_TIMING_TESTS=1 to check running times')
+    def test_growth_timing(self):
+        # running times depend on the load of the machine, so the timing test is opt-in
+        failures = []
+        for name, algo, distributions in self.cases():
+            complexity = self.COMPLEXITY.get(name, 'n log n')
+            sizes = self.TIMING_QUADRATIC_SIZES if complexity == 'n^2' else self.TIMING_SIZES
+            for distribution, generator in distributions.items():
+                exponent = growth_exponent(algo, generator, sizes, self.seed)
+                if exponent > self.TIMING_GROWTH_LIMITS[complexity]:
+                    failures.append('{} on {} input grows as n^{:.2f}, expected {}'.format(name, distribution,
+                                                                                             exponent, complexity))
+        if failures:
+            self.fail('\n'.join(failures))
+
+
+    def test_counting_sort_huge_range(self):
+        for backend in CountingSort.BACKENDS:
+            data = [10**6, -10**6, 0, 5, 5]
+            self.assertListEqual(CountingSort(backend).sort(data), sorted(data))
+
+
+    def test_bucket_sort_near_one(self):
+        data = near_one_data(1000, self.seed) + [0.0, 1.0]
+        for backend in BucketSort.BACKENDS:
+            self.assertListEqual(BucketSort(backend).sort(data), sorted(data))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file